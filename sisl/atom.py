@@ -1216,30 +1216,11 @@ class Atoms(object):
             # Convert to a list of unique elements
             # We can not use set because that is unordered
             # And we want the same order, always...
-            uatom = []
-            specie = [0] * len(atom)
             if isinstance(atom[0], Atom):
-                for i, a in enumerate(atom):
-                    try:
-                        s = uatom.index(a)
-                    except:
-                        s = -1
-                    if s < 0:
-                        s = len(uatom)
-                        uatom.append(a)
-                    specie[i] = s
+                uatom, specie = self._unique_atom(atom)
 
             elif isinstance(atom[0], (_str, Integral)):
-                for i, a in enumerate(atom):
-                    a = Atom(a)
-                    try:
-                        s = uatom.index(a)
-                    except:
-                        s = -1
-                    if s < 0:
-                        s = len(uatom)
-                        uatom.append(a)
-                    specie[i] = s
+                uatom, specie = self._unique_specie(atom)
 
             else:
                 raise ValueError('atom keyword was wrong input')
@@ -1273,6 +1254,55 @@ class Atoms(object):
 
         self._update_orbitals()
 
+    @staticmethod
+    def _unique_atom(atom):
+        """ Unique list of atoms (retaining order) and the specie index for each atom in `atom`
+
+        Identical objects are only compared once, hence lists with many references to
+        the same `Atom` objects are fast.
+        """
+        uatom = []
+        specie = _a.emptyi(len(atom))
+        # Look-up of already processed objects
+        seen = {}
+        for i, a in enumerate(atom):
+            s = seen.get(id(a), -1)
+            if s < 0:
+                try:
+                    s = uatom.index(a)
+                except ValueError:
+                    s = len(uatom)
+                    uatom.append(a)
+                seen[id(a)] = s
+            specie[i] = s
+        return uatom, specie
+
+    @staticmethod
+    def _unique_specie(atom):
+        """ Unique list of atoms (retaining order) and the specie index for each label/Z in `atom`
+
+        Only one `Atom` is created per unique label/Z.
+        """
+        if isinstance(atom, np.ndarray):
+            label = atom.ravel()
+        elif isinstance(atom[0], _str) and all(isinstance(a, _str) for a in atom):
+            label = np.array(atom)
+        elif isinstance(atom[0], Integral) and all(isinstance(a, Integral) for a in atom):
+            label = _a.arrayi(atom)
+        else:
+            # mixed input, let each element be converted individually
+            return Atoms._unique_atom([Atom(a) for a in atom])
+
+        # Sort the unique labels by first occurrence to retain the order
+        label, idx, inv = np.unique(label, return_index=True, return_inverse=True)
+        order = np.argsort(idx)
+        rank = _a.emptyi(len(order))
+        rank[order] = _a.arangei(len(order))
+
+        # Different labels may be the same atom (e.g. 'C' and 6)
+        uatom, uspecie = Atoms._unique_atom([Atom(a) for a in label[order].tolist()])
+        return uatom, _a.arrayi(uspecie)[rank][inv]
+
     def _update_orbitals(self):
         """ Internal routine for updating the `firsto` attribute """
         # Get number of orbitals per specie
@@ -29,6 +29,7 @@ Basic IO classes
    SileCDF - a base class for NetCDF files
    SileBin - a base class for binary files
    SileError - sisl specific error
+   Trajectory - lazy and random access to frames in trajectory files
 
 
 .. _toc-io-supported:
@@ -240,6 +241,7 @@ from .scaleup import *
 from .siesta import *
 from .tbtrans import *
 from .table import *
+from .trajectory import *
 from .vasp import *
 from .wannier90 import *
 from .xsf import *
@@ -0,0 +1,213 @@
+""" Reading of Fortran unformatted (sequential access) files using NumPy
+
+The records of a Fortran unformatted file are surrounded by 4-byte
+record markers containing the number of bytes in the record.
+The file is memory-mapped and the records are returned as views
+of the mapped file whenever possible.
+"""
+from __future__ import print_function, division
+
+import numpy as np
+
+import sisl._array as _a
+from sisl.utils.ranges import array_arange
+from .sile import SileError
+
+
+__all__ = ['FortranRecords']
+
+
+class FortranRecords(object):
+    """ Sequential access to the records of a Fortran unformatted file
+
+    The file is memory-mapped, hence only the accessed records are read from
+    the disk. All records are assumed to have 4-byte record markers (default for
+    most compilers), and the byte-order is assumed to be native.
+
+    Parameters
+    ----------
+    fname : str
+       the file name
+
+    Attributes
+    ----------
+    chunk : int
+       number of elements gathered at a time in `read_rows`
+    """
+    chunk = 2 ** 22
+
+    def __init__(self, fname):
+        self._fname = fname
+        self._mm = np.memmap(fname, dtype=np.uint8, mode='r')
+        self._pos = 0
+
+    def _marker(self, pos):
+        """ Record marker at byte position `pos` """
+        return int(np.frombuffer(self._mm, dtype=np.int32, count=1, offset=pos)[0])
+
+    def _record(self):
+        """ Return the bytes of the current record and step to the next record """
+        pos = self._pos
+        size = self._mm.size
+        if pos + 4 > size:
+            raise SileError(self.__class__.__name__ + ' tried to read past the end of file: ' + self._fname)
+        n = self._marker(pos)
+        if n >= 0:
+            if pos + n + 8 > size or self._marker(pos + 4 + n) != n:
+                raise SileError(self.__class__.__name__ + ' found an inconsistent record marker in: ' + self._fname)
+            self._pos = pos + n + 8
+            return self._mm[pos+4:pos+4+n]
+
+        # Records larger than 2 GB are split in sub-records, a negative
+        # (leading) marker signals that another sub-record follows
+        buf = []
+        while n < 0:
+            buf.append(self._mm[pos+4:pos+4-n])
+            pos += 8 - n
+            n = self._marker(pos)
+        buf.append(self._mm[pos+4:pos+4+n])
+        self._pos = pos + n + 8
+        return np.concatenate(buf)
+
+    def skip(self, n=1):
+        """ Skip `n` records """
+        for _ in range(n):
+            self._record()
+
+    def skip_rows(self, dtype, n):
+        """ Skip ``len(n)`` consecutive records with ``n[i]`` elements in record ``i`` (see `read_rows`) """
+        n = _a.asarrayl(n).ravel()
+        self._pos += (n * np.dtype(dtype).itemsize + 8).sum()
+        if self._pos > self._mm.size:
+            raise SileError(self.__class__.__name__ + ' tried to read past the end of file: ' + self._fname)
+
+    def read(self, *dtypes):
+        """ Read the current record
+
+        Parameters
+        ----------
+        *dtypes : numpy.dtype or tuple of (numpy.dtype, int)
+           if a single data-type is passed the entire record is returned as an array,
+           else the record is split into the data-types with the specified number
+           of elements each (a count of 1 returns a scalar)
+
+        Returns
+        -------
+        numpy.ndarray or list
+           the record contents (views of the mapped file)
+        """
+        buf = self._record()
+        if len(dtypes) == 1 and not isinstance(dtypes[0], tuple):
+            return np.frombuffer(buf, dtype=dtypes[0])
+        out = []
+        offset = 0
+        for dtype, count in dtypes:
+            dtype = np.dtype(dtype)
+            v = np.frombuffer(buf, dtype=dtype, count=count, offset=offset)
+            offset += dtype.itemsize * count
+            if count == 1:
+                v = v[0]
+            out.append(v)
+        return out
+
+    def read_rows(self, dtype, n, out=None):
+        """ Read ``len(n)`` consecutive records with ``n[i]`` elements in record ``i``
+
+        This is the typical layout of sparse matrices where each row is
+        stored in a separate record.
+        The elements are gathered in chunks to limit the size of temporary
+        index arrays.
+
+        Parameters
+        ----------
+        dtype : numpy.dtype
+           data-type of the elements
+        n : array_like of int
+           number of elements in each record
+        out : numpy.ndarray, optional
+           the elements are stored in this array (may be a non-contiguous view),
+           it must have ``sum(n)`` elements
+
+        Returns
+        -------
+        numpy.ndarray
+           all elements of the records, concatenated (`out` if passed)
+        """
+        dtype = np.dtype(dtype)
+        isize = dtype.itemsize
+        n = _a.asarrayl(n).ravel()
+        if out is None:
+            out = np.empty([n.sum()], dtype=dtype)
+        if len(n) == 0:
+            return out
+        if isize not in (4, 8):
+            # Record markers are only 4-byte aligned for 4 and 8 byte elements
+            # Fall-back to reading each record individually
+            out[:] = np.concatenate([self.read(dtype) for _ in n])
+            return out
+
+        pos = self._pos
+        nbytes = n * isize + 8
+        end = pos + nbytes.sum()
+        if end > self._mm.size:
+            raise SileError(self.__class__.__name__ + ' tried to read past the end of file: ' + self._fname)
+
+        # Byte position of the records (relative to the current position)
+        rec = _a.emptyl(len(n))
+        rec[0] = 0
+        np.cumsum(nbytes[:-1], out=rec[1:])
+
+        # Check all record markers at once
+        markers = np.frombuffer(self._mm, dtype=np.int32, count=(end - pos) // 4, offset=pos)
+        if not (np.all(markers[rec // 4] == n * isize) and
+                np.all(markers[(rec + nbytes) // 4 - 1] == n * isize)):
+            raise SileError(self.__class__.__name__ + ' found an inconsistent record marker in: ' + self._fname)
+        del markers
+
+        # A record is 8 bytes larger than the data, hence the data
+        # of all records are aligned to the element size
+        # when starting from the first data element.
+        data = np.frombuffer(self._mm, dtype=dtype, count=(end - pos - 4) // isize, offset=pos + 4)
+        rec //= isize
+
+        # Gather the elements in chunks of rows
+        ptr = _a.zerosl(len(n) + 1)
+        np.cumsum(n, out=ptr[1:])
+        rows = np.searchsorted(ptr, _a.arangel(0, ptr[-1], self.chunk), side='right') - 1
+        rows = np.unique(np.append(rows, len(n)))
+        for r1, r2 in zip(rows[:-1], rows[1:]):
+            out[ptr[r1]:ptr[r2]] = data[array_arange(rec[r1:r2], n=n[r1:r2])]
+
+        self._pos = end
+        return out
+
+    def read_equal(self, dtype, nrec):
+        """ Read `nrec` consecutive records of equal length (without copying)
+
+        Parameters
+        ----------
+        dtype : numpy.dtype
+           data-type of the elements, the item size must be 4 bytes
+        nrec : int
+           number of records
+
+        Returns
+        -------
+        numpy.ndarray
+           a view of the mapped file with shape ``(nrec, n)`` with ``n`` being the number
+           of elements in each record
+        """
+        dtype = np.dtype(dtype)
+        if dtype.itemsize != 4:
+            raise ValueError(self.__class__.__name__ + '.read_equal requires a data-type with 4 bytes')
+        pos = self._pos
+        n = self._marker(pos) // 4
+        end = pos + nrec * (n + 2) * 4
+        if end > self._mm.size:
+            raise SileError(self.__class__.__name__ + ' tried to read past the end of file: ' + self._fname)
+        markers = np.frombuffer(self._mm, dtype=np.int32, count=nrec * (n + 2), offset=pos).reshape(nrec, n + 2)
+        if not (np.all(markers[:, 0] == n * 4) and np.all(markers[:, -1] == n * 4)):
+            raise SileError(self.__class__.__name__ + ' found an inconsistent record marker in: ' + self._fname)
+        self._pos = end
+        # The record markers are masked out
+        return np.frombuffer(self._mm, dtype=dtype, count=nrec * (n + 2), offset=pos).reshape(nrec, n + 2)[:, 1:-1]
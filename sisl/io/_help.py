@@ -1,6 +1,11 @@
 from __future__ import print_function, division
 
-__all__ = ['starts_with_list']
+import numpy as np
+
+__all__ = ['starts_with_list', 'read_columns', 'columns_float']
+
+# Token marking the end of a line in read_columns (never part of the data)
+_EOL = '\x01'
 
 
 def starts_with_list(l, comments):
@@ -8,3 +13,89 @@ def starts_with_list(l, comments):
         if l.startswith(comment):
             return True
     return False
+
+
+def read_columns(sile, n=None, end=None, ncol=None):
+    """ Read a block of lines from `sile` and return the white-space separated columns
+
+    This is a bulk reading method for tabular data (such as coordinates) which
+    is much faster than splitting and converting line by line.
+    The block is split in a single call, only if the lines have different number
+    of columns they are split line by line.
+
+    Parameters
+    ----------
+    sile : Sile
+       the sile to read from, the lines are read using ``sile.readline()``
+    n : int, optional
+       number of lines to read
+    end : callable, optional
+       if `n` is not specified lines are read until ``end(line)`` is true
+       or the end of the file is reached (the last read line is discarded)
+    ncol : int, optional
+       only return the first `ncol` columns, default to the number of columns
+       in the first line
+
+    Returns
+    -------
+    numpy.ndarray
+       an object array of strings with shape ``(nlines, ncol)``
+    """
+    readline = sile.readline
+    if n is None:
+        lines = []
+        l = readline()
+        while l != '' and not end(l):
+            lines.append(l)
+            l = readline()
+    else:
+        lines = [readline() for _ in range(n)]
+    n = len(lines)
+    if n == 0:
+        return np.empty([0, 0 if ncol is None else ncol], dtype=object)
+
+    first = len(lines[0].split())
+    if ncol is None:
+        ncol = first
+
+    if first >= ncol:
+        # Split all lines at once with a marker token ending each line, if all
+        # lines have the same number of columns the markers are the last column
+        tokens = (' ' + _EOL + ' ').join(lines).split()
+        tokens.append(_EOL)
+        if len(tokens) == n * (first + 1):
+            cols = np.array(tokens, dtype=object).reshape(n, first + 1)
+            if np.all(cols[:, first] == _EOL):
+                return cols[:, :ncol]
+
+    # Line by line for differently sized lines
+    cols = np.empty([n, ncol], dtype=object)
+    for i, l in enumerate(lines):
+        l = l.split()
+        if len(l) < ncol:
+            raise ValueError("read_columns found a line with too few columns: {}".format(' '.join(l)))
+        cols[i, :] = l[:ncol]
+    return cols
+
+
+def columns_float(cols, dtype=np.float64):
+    """ Convert an array of strings (as returned from `read_columns`) to floating point values
+
+    Parameters
+    ----------
+    cols : numpy.ndarray
+       array of strings to be converted
+    dtype : numpy.dtype, optional
+       the returned data-type
+
+    Returns
+    -------
+    numpy.ndarray
+       same shape as `cols`
+    """
+    cols = np.asarray(cols)
+    try:
+        # Converts all elements in a single call (no intermediate strings)
+        return cols.astype(dtype)
+    except ValueError:
+        raise ValueError("columns_float could not convert all values to floats")
@@ -9,6 +9,7 @@ from numpy import where
 # Import sile objects
 from .sile import SileGULP
 from ..sile import *
+from .._help import read_columns, columns_float
 
 from sisl._help import _range as range
 # Import the geometry object
@@ -122,20 +123,12 @@ class gotSileGULP(SileGULP):
                 for _ in [0] * 5:
                     self.readline()
 
-                Z = []
-                xyz = []
-                while True:
-                    l = self.readline()
-                    if l[0] == '-':
-                        break
-
-                    ls = l.split()
-                    Z.append(Atom(ls[1], orbital=[-1] * 3))
-                    xyz.append([float(x) for x in ls[3:6]])
+                cols = read_columns(self, end=lambda l: l[0] == '-', ncol=6)
 
-                # Convert to array and correct size
-                xyz = np.array(xyz, np.float64)
-                xyz.shape = (-1, 3)
+                # Only create one atom per specie
+                atoms = dict((l, Atom(l, orbital=[-1] * 3)) for l in np.unique(cols[:, 1]))
+                Z = [atoms[l] for l in cols[:, 1]]
+                xyz = columns_float(cols[:, 3:6])
 
                 if len(Z) == 0 or len(xyz) == 0:
                     raise ValueError(
@@ -4,13 +4,15 @@ import numpy as np
 
 # Import sile objects
 from .sile import *
+from ._help import columns_float
 
 # Import the geometry object
 from sisl.messages import warn
 from sisl import Geometry, Atom, SuperCell
-from sisl.sparse import ispmatrix, ispmatrixd
 from sisl.physics import Hamiltonian
 from sisl._help import _range as range
+import sisl._array as _a
+from sisl.utils.ranges import array_arange
 
 
 __all__ = ['HamiltonianSile']
@@ -25,6 +27,7 @@ class HamiltonianSile(Sile):
 
         cell = np.zeros([3, 3], np.float64)
         Z = []
+        atoms = {}
         xyz = []
 
         nsc = np.zeros([3], np.int32)
@@ -71,7 +74,9 @@ class HamiltonianSile(Sile):
                     except Exception:
                         no = 1
                     z, no = Z2no(ls[0], no)
-                    Z.append({'Z': z, 'orbs': no})
+                    if (z, no) not in atoms:
+                        atoms[(z, no)] = Atom(z, orbital=[-1.] * no)
+                    Z.append(atoms[(z, no)])
                     xyz.append([float(f) for f in ls[1:4]])
                     l = self.readline()
                 xyz = np.array(xyz, np.float64)
@@ -80,7 +85,7 @@ class HamiltonianSile(Sile):
 
         # Return the geometry
         # Create list of atoms
-        geom = Geometry(xyz, atom=Atom[Z], sc=SuperCell(cell, nsc))
+        geom = Geometry(xyz, atom=Z, sc=SuperCell(cell, nsc))
 
         return geom
 
@@ -88,7 +93,18 @@ class HamiltonianSile(Sile):
     def read_hamiltonian(self, hermitian=True, dtype=np.float64, **kwargs):
         """ Reads a Hamiltonian (including the geometry)
 
-        Reads the Hamiltonian model
+        Reads the Hamiltonian model.
+
+        Each ``matrix`` block is read and converted in bulk, and the sparse
+        matrices are constructed once all blocks have been read.
+        If an element is specified multiple times the last one is used.
+
+        Parameters
+        ----------
+        hermitian : bool, optional
+           whether the Hermitian counterparts of the elements are added
+        dtype : numpy.dtype, optional
+           data-type of the Hamiltonian and overlap matrix
         """
         # Read the geometry in this file
         geom = self.read_geometry()
@@ -96,21 +112,19 @@ class HamiltonianSile(Sile):
         # Rewind to ensure we can read the entire matrix structure
         self.fh.seek(0)
 
-        # With the geometry in place we can read in the entire matrix
-        # Create a new sparse matrix
-        from scipy.sparse import lil_matrix
-        H = lil_matrix((geom.no, geom.no_s), dtype=dtype)
-        S = lil_matrix((geom.no, geom.no_s), dtype=dtype)
+        no = geom.no
 
-        def i2o(geom, i):
-            try:
-                # pure orbital
-                return int(i)
-            except Exception:
-                # ia[o]
-                # atom ia and the orbital o
-                j = i.replace('[', ' ').replace(']', ' ').split()
-                return geom.a2o(int(j[0])) + int(j[1])
+        def i2o(i):
+            """ Convert an array of ``o`` or ``ia[o]`` strings to orbitals """
+            a, sep, o = np.char.partition(i.astype(str), '[').T
+            adv = sep == '['
+            o = np.char.rstrip(o, ']')
+            o[~adv] = '0'
+            a = a.astype(np.int32)
+            o = o.astype(np.int32)
+            return np.where(adv, geom.firsto[np.where(adv, a, 0)] + o, a)
+
+        rows, cols, Hs, Ss = [], [], [], []
 
         # Start reading in the supercell
         while True:
@@ -125,24 +139,54 @@ class HamiltonianSile(Sile):
             except Exception:
                 isc = np.array([0, 0, 0], np.int32)
 
-            off1 = geom.sc_index(isc) * geom.no
-            off2 = geom.sc_index(-isc) * geom.no
+            off1 = geom.sc_index(isc) * no
+            off2 = geom.sc_index(-isc) * no
+
+            # Lines may have 3 (h) or 4 (h s) columns
+            lines = []
             l = self.readline()
             while not l.startswith('end'):
-                ls = l.split()
-                jo = i2o(geom, ls[0])
-                io = i2o(geom, ls[1])
-                h = float(ls[2])
-                try:
-                    s = float(ls[3])
-                except Exception:
-                    s = 0.
-                H[jo, io + off1] = h
-                S[jo, io + off1] = s
-                if hermitian:
-                    S[io, jo + off2] = s
-                    H[io, jo + off2] = h
+                lines.append(l.split())
                 l = self.readline()
+            if len(lines) == 0:
+                continue
+            ls = np.array([l[:3] + (l[3:4] or ['0']) for l in lines], dtype=object)
+            del lines
+
+            jo = i2o(ls[:, 0])
+            io = i2o(ls[:, 1])
+            hs = columns_float(ls[:, 2:]).astype(dtype, copy=False)
+            del ls
+
+            if hermitian:
+                # Interleave the elements with their Hermitian counterparts
+                # to retain the element order of the file
+                rows.append(np.stack((jo, io), axis=1).ravel())
+                cols.append(np.stack((io + off1, jo + off2), axis=1).ravel())
+                hs = np.repeat(hs, 2, axis=0)
+            else:
+                rows.append(jo)
+                cols.append(io + off1)
+            Hs.append(hs[:, 0])
+            Ss.append(hs[:, 1])
+
+        from scipy.sparse import csr_matrix
+
+        def tosp(rows, cols, D):
+            if len(rows) == 0:
+                return csr_matrix((no, geom.no_s), dtype=dtype)
+            rows = np.concatenate(rows)
+            cols = np.concatenate(cols)
+            D = np.concatenate(D)
+            # Only retain the last specified element (reversed unique)
+            _, idx = np.unique((rows * geom.no_s + cols)[::-1], return_index=True)
+            idx = len(rows) - 1 - idx
+            sp = csr_matrix((D[idx], (rows[idx], cols[idx])), shape=(no, geom.no_s), dtype=dtype)
+            sp.eliminate_zeros()
+            return sp
+
+        H = tosp(rows, cols, Hs)
+        S = tosp(rows, cols, Ss)
 
         return Hamiltonian.fromsp(geom, H, S)
 
@@ -207,16 +251,13 @@ class HamiltonianSile(Sile):
         ham : `Hamiltonian` model
         hermitian : boolean=True
             whether the stored data is halved using the Hermitian property
-
+        chunk : int, optional
+            number of lines formatted and written at a time (default 50000)
         """
         ham.finalize()
 
-        # We use the upper-triangular form of the Hamiltonian
-        # and the overlap matrix
-        if hermitian:
-            from scipy.sparse import triu
-
         geom = ham.geom
+        no = geom.no
 
         # First write the geometry
         self.write_geometry(geom, **kwargs)
@@ -228,118 +269,110 @@ class HamiltonianSile(Sile):
 
         fmt = kwargs.get('fmt', 'g')
         if advanced:
-            fmt1_str = ' {{0:d}}[{{1:d}}] {{2:d}}[{{3:d}}] {{4:{0}}}\n'.format(
+            fmt1_str = ' {{0:d}}[{{1:d}}] {{2:d}}[{{3:d}}] {{4:{0}}}'.format(
                 fmt)
-            fmt2_str = ' {{0:d}}[{{1:d}}] {{2:d}}[{{3:d}}] {{4:{0}}} {{5:{0}}}\n'.format(
+            fmt2_str = ' {{0:d}}[{{1:d}}] {{2:d}}[{{3:d}}] {{4:{0}}} {{5:{0}}}'.format(
                 fmt)
         else:
-            fmt1_str = ' {{0:d}} {{1:d}} {{2:{0}}}\n'.format(fmt)
-            fmt2_str = ' {{0:d}} {{1:d}} {{2:{0}}} {{3:{0}}}\n'.format(fmt)
+            fmt1_str = ' {{0:d}} {{1:d}} {{2:{0}}}'.format(fmt)
+            fmt2_str = ' {{0:d}} {{1:d}} {{2:{0}}} {{3:{0}}}'.format(fmt)
+        chunk = kwargs.get('chunk', 50000)
+
+        # Extract all elements from the sparse matrix (H and S share
+        # the same sparsity pattern)
+        csr = ham._csr
+        ncol = csr.ncol
+        idx = array_arange(csr.ptr[:-1], n=ncol)
+        row = np.repeat(_a.arangei(no), ncol)
+        col = csr.col[idx]
+        H = csr._D[idx, 0]
+        if ham.orthogonal:
+            S = np.where(row == col, 1., 0.)
+        else:
+            S = csr._D[idx, ham.S_idx]
+        del idx, ncol
 
-        # We currently force the model to be finalized
-        # before we can write it
-        # This should be easily circumvented
-        H = ham.tocsr(0)
-        if not ham.orthogonal:
-            S = ham.tocsr(ham.S_idx)
+        # Supercell index and orbital in the supercell
+        isc = col // no
+        col = col % no
+        sc_off = geom.sc.sc_off
 
         # If the model is Hermitian we can
         # do with writing out half the entries
         if hermitian:
             herm_acc = kwargs.get('herm_acc', 1e-6)
+            # Find the ^\dagger element of each element
+            n_s = geom.n_s
+            key = (row * n_s + isc) * no + col
+            key_dag = (col * n_s + geom.sc_index(-sc_off[isc])) * no + row
+            srt = np.argsort(key)
+            i = np.searchsorted(key, key_dag, sorter=srt)
+            i[i == len(key)] = 0
+            i = srt[i]
+            found = key[i] == key_dag
+            H_dag = np.where(found, H[i].conjugate(), 0.)
             # We check whether it is Hermitian (not S)
-            for i, isc in enumerate(geom.sc.sc_off):
-                oi = i * geom.no
-                oj = geom.sc_index(-isc) * geom.no
-                # get the difference between the ^\dagger elements
-                diff = H[:, oi:oi + geom.no] - \
-                    H[:, oj:oj + geom.no].transpose()
-                diff.eliminate_zeros()
-                if np.any(np.abs(diff.data) > herm_acc):
-                    amax = np.amax(np.abs(diff.data))
-                    warn(SileWarning('The model could not be asserted to be Hermitian '
-                                     'within the accuracy required ({0}).'.format(amax)))
-                    hermitian = False
-                del diff
+            diff = np.abs(H - H_dag)
+            if np.any(diff > herm_acc):
+                amax = np.amax(diff)
+                warn(SileWarning('The model could not be asserted to be Hermitian '
+                                 'within the accuracy required ({0}).'.format(amax)))
+                hermitian = False
+            del key, key_dag, srt, i, found, H_dag, diff
 
         if hermitian:
-            # Remove all double stuff
-            for i, isc in enumerate(geom.sc.sc_off):
-                if np.any(isc < 0):
-                    # We have ^\dagger element, remove it
-                    o = i * geom.no
-                    # Ensure that we remove all nullified quantities
-                    # (setting elements to zero will add them internally
-                    #  :(, hence this actually constructs the full matrix
-                    # Therefore we do it on a row basis, to limit memory
-                    # requirements
-                    for j in range(geom.no):
-                        H[j, o:o + geom.no] = 0.
-                        H.eliminate_zeros()
-                        if not ham.orthogonal:
-                            S[j, o:o + geom.no] = 0.
-                            S.eliminate_zeros()
-            o = geom.sc_index(np.zeros([3], np.int32))
-            # Get upper-triangular matrix of the unit-cell H and S
-            ut = triu(H[:, o:o + geom.no], k=0).tocsr()
-            for j in range(geom.no):
-                H[j, o:o + geom.no] = 0.
-                H[j, o:o + geom.no] = ut[j, :]
-                H.eliminate_zeros()
-            if not ham.orthogonal:
-                ut = triu(S[:, o:o + geom.no], k=0).tocsr()
-                for j in range(geom.no):
-                    S[j, o:o + geom.no] = 0.
-                    S[j, o:o + geom.no] = ut[j, :]
-                    S.eliminate_zeros()
-
-                # Ensure that S and H have the same sparsity pattern
-                for jo, io in ispmatrix(S):
-                    H[jo, io] = H[jo, io]
-
-            del ut
+            # Only retain one of the element and its ^\dagger element.
+            # Supercells are retained if the first non-zero offset is positive,
+            # and in the primary unit-cell we retain the upper triangular part.
+            sgn = np.sign(sc_off)
+            first = np.argmax(sgn != 0, axis=1)
+            sgn = sgn[_a.arangei(len(sgn)), first]
+            keep = sgn[isc] > 0
+            keep |= (sgn[isc] == 0) & (col >= row)
+            row = row[keep]
+            col = col[keep]
+            isc = isc[keep]
+            H = H[keep]
+            S = S[keep]
+            del keep
+
+        # Sort elements in supercell, row, column order
+        srt = np.lexsort((col, row, isc))
+        row = row[srt]
+        col = col[srt]
+        isc = isc[srt]
+        H = H[srt]
+        S = S[srt]
+        del srt
+
+        if advanced:
+            ia = geom.o2a(row)
+            ja = geom.o2a(col)
+            lines = [ia, row - geom.firsto[ia], ja, col - geom.firsto[ja]]
+        else:
+            lines = [row, col]
+
+        def write_chunk(start, stop):
+            sl = slice(start, stop)
+            out = []
+            for line in zip(*([l[sl].tolist() for l in lines] + [H[sl].tolist(), S[sl].tolist()])):
+                if line[-1] == 0.:
+                    out.append(fmt1_str.format(*line[:-1]))
+                else:
+                    out.append(fmt2_str.format(*line))
+            out.append('')
+            self._write('\n'.join(out))
 
         # Start writing of the model
-        # We loop on all super-cells
-        for i, isc in enumerate(geom.sc.sc_off):
-            # Check that we have any contributions in this
-            # sub-section
-            Hsub = H[:, i * geom.no:(i + 1) * geom.no]
-            if not ham.orthogonal:
-                Ssub = S[:, i * geom.no:(i + 1) * geom.no]
-            if Hsub.getnnz() == 0:
+        # We loop on all super-cells with contributions
+        ptr = np.searchsorted(isc, _a.arangei(geom.n_s + 1))
+        for i, off in enumerate(sc_off):
+            if ptr[i] == ptr[i+1]:
                 continue
             # We have a contribution, write out the information
-            self._write('\nbegin matrix {0:d} {1:d} {2:d}\n'.format(*isc))
-            if advanced:
-                for jo, io, h in ispmatrixd(Hsub):
-                    o = np.array([jo, io], np.int32)
-                    a = geom.o2a(o)
-                    o = o - geom.a2o(a)
-                    if not ham.orthogonal:
-                        s = Ssub[jo, io]
-                    elif jo == io:
-                        s = 1.
-                    else:
-                        s = 0.
-                    if s == 0.:
-                        self._write(fmt1_str.format(a[0], o[0], a[1], o[1], h))
-                    else:
-                        self._write(
-                            fmt2_str.format(
-                                a[0], o[0], a[1], o[1], h, s))
-            else:
-                for jo, io, h in ispmatrixd(Hsub):
-                    if not ham.orthogonal:
-                        s = Ssub[jo, io]
-                    elif jo == io:
-                        s = 1.
-                    else:
-                        s = 0.
-                    if s == 0.:
-                        self._write(fmt1_str.format(jo, io, h))
-                    else:
-                        self._write(fmt2_str.format(jo, io, h, s))
-            self._write('end matrix {0:d} {1:d} {2:d}\n'.format(*isc))
+            self._write('\nbegin matrix {0:d} {1:d} {2:d}\n'.format(*off))
+            for start in range(ptr[i], ptr[i+1], chunk):
+                write_chunk(start, min(start + chunk, ptr[i+1]))
+            self._write('end matrix {0:d} {1:d} {2:d}\n'.format(*off))
 
 add_sile('ham', HamiltonianSile, case=False, gzip=True)
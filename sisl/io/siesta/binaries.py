@@ -11,7 +11,8 @@ except Exception as e:
 
 # Import sile objects
 from sisl.messages import SislError
-from ..sile import add_sile
+from ..sile import add_sile, SileError
+from .._fortran import FortranRecords
 from .sile import SileBinSiesta
 
 # Import the geometry object
@@ -32,21 +33,99 @@ __all__ += ['GridSileSiesta']
 __all__ += ['_GFSileSiesta', 'TSGFSileSiesta']
 
 
+def _require_module(obj, method):
+    """ Raise an error if the compiled Fortran module is not available """
+    if not found_module:
+        raise SileError(obj.__class__.__name__ + '.' + method + ' requires the compiled Fortran '
+                        'module (sisl.io.siesta._siesta), please re-install sisl with a Fortran compiler.')
+
+
+def _csr_attach(obj, ncol, col, D):
+    """ Attach the sparse data read from a Siesta file to the sparse matrix of `obj` """
+    csr = obj._csr
+    csr.ncol = ncol.astype(np.int32)
+    csr.ptr = _a.zerosi(len(ncol) + 1)
+    np.cumsum(ncol, out=csr.ptr[1:])
+    # Correct fortran indices
+    col -= 1
+    csr.col = col
+    csr._nnz = len(col)
+    csr._D = D
+    return obj
+
+
+def _spin_select(spin, nspin):
+    """ Return a list of the spin-components to be read
+
+    Only subsets that correspond to a spin configuration are allowed, i.e.
+    all components or a single component of a polarized calculation (which
+    is returned as an unpolarized object).
+    """
+    if spin is None:
+        return list(range(nspin))
+    spin = _a.asarrayi(spin).ravel().tolist()
+    if len(spin) == 0 or min(spin) < 0 or max(spin) >= nspin:
+        raise ValueError("Requested spin-components {} are not in the range [0, {}[".format(spin, nspin))
+    if spin == list(range(nspin)) or (nspin == 2 and len(spin) == 1):
+        return spin
+    raise ValueError("Requested spin-components {} does not correspond to a spin configuration, "
+                     "only a single component of a polarized calculation (or all components) "
+                     "may be requested".format(spin))
+
+
+def _read_spin(fr, dtype, ncol, nspin, spin, D):
+    """ Read `nspin` sparse matrices, store the components in `spin` in the columns of `D` and skip the rest """
+    for i in range(nspin):
+        js = [j for j, s in enumerate(spin) if s == i]
+        if len(js) == 0:
+            fr.skip_rows(dtype, ncol)
+            continue
+        fr.read_rows(dtype, ncol, out=D[:, js[0]])
+        for j in js[1:]:
+            D[:, j] = D[:, js[0]]
+
+
 class TSHSSileSiesta(SileBinSiesta):
-    """ TranSiesta TSHS file object """
+    """ TranSiesta TSHS file object
+
+    The file is read using NumPy (memory-mapped), no compiled modules are required
+    for reading.
+    """
+
+    def _r_header(self):
+        """ Read the header of the TSHS file, returns the open records and a dictionary with the header """
+        fr = FortranRecords(self.file)
+        version = fr.read(np.int32)
+        if len(version) != 1 or version[0] != 1:
+            raise SileError(self.__class__.__name__ + ' can only read TSHS files of version 1.')
+        head = {}
+        head['na_u'], head['no_u'], no_s, head['nspin'], head['nnz'] = fr.read(np.int32).tolist()
+        head['n_s'] = no_s // head['no_u']
+        head['nsc'] = fr.read(np.int32).astype(np.int32)
+        cell_xa = fr.read(np.float64) * Bohr2Ang
+        head['cell'] = cell_xa[:9].reshape(3, 3)
+        head['xyz'] = cell_xa[9:].reshape(-1, 3)
+        head['Gamma'] = fr.read(np.int32)[0] != 0
+        fr.skip() # kscell, kdispl
+        head['Ef'] = fr.read(np.float64)[0]
+        fr.skip() # istep, ia1
+        head['lasto'] = fr.read(np.int32).astype(np.int32)
+        head['ncol'] = fr.read(np.int32)
+        return fr, head
 
     def read_supercell(self):
         """ Returns a SuperCell object from a siesta.TSHS file """
-        n_s = _siesta.read_tshs_sizes(self.file)[3]
-        arr = _siesta.read_tshs_cell(self.file, n_s)
-        nsc = np.array(arr[0].T, np.int32)
-        cell = np.array(arr[1].T, np.float64)
-        cell.shape = (3, 3)
-        isc = np.array(arr[2].T, np.int32)
-        isc.shape = (-1, 3)
-
-        SC = SuperCell(cell, nsc=nsc)
-        SC.sc_off = isc
+        fr, head = self._r_header()
+        SC = SuperCell(head['cell'], nsc=head['nsc'])
+        if not head['Gamma']:
+            ncol = head['ncol']
+            # Skip the sparse matrices (column indices, S and H)
+            fr.skip_rows(np.int32, ncol)
+            for _ in range(head['nspin'] + 1):
+                fr.skip_rows(np.float64, ncol)
+            isc = fr.read(np.int32).astype(np.int32)
+            isc.shape = (-1, 3)
+            SC.sc_off = isc
         return SC
 
     def read_geometry(self):
@@ -55,11 +134,9 @@ class TSHSSileSiesta(SileBinSiesta):
         # Read supercell
         sc = self.read_supercell()
 
-        na = _siesta.read_tshs_sizes(self.file)[1]
-        arr = _siesta.read_tshs_geom(self.file, na)
-        xyz = np.array(arr[0].T, np.float64)
-        xyz.shape = (-1, 3)
-        lasto = np.array(arr[1], np.int32)
+        _, head = self._r_header()
+        xyz = head['xyz']
+        lasto = head['lasto']
 
         # Create all different atoms...
         # The TSHS file does not contain the
@@ -68,54 +145,54 @@ class TSHSSileSiesta(SileBinSiesta):
         orbs = np.diff(lasto)
 
         # Get unique orbitals
-        uorb = np.unique(orbs)
+        uorb, idx = np.unique(orbs, return_inverse=True)
         # Create atoms
-        atoms = []
-        for Z, orb in enumerate(uorb):
-            atoms.append(Atom(Z+1, [-1] * orb))
-
-        def get_atom(atoms, orbs):
-            for atom in atoms:
-                if atom.no == orbs:
-                    return atom
-
-        atom = []
-        for _, orb in enumerate(orbs):
-            atom.append(get_atom(atoms, orb))
+        atoms = [Atom(Z+1, [-1] * orb) for Z, orb in enumerate(uorb)]
+        atom = [atoms[i] for i in idx]
 
         # Create and return geometry object
         geom = Geometry(xyz, atom, sc=sc)
 
         return geom
 
-    def read_hamiltonian(self, **kwargs):
-        """ Returns the electronic structure from the siesta.TSHS file """
+    def read_hamiltonian(self, spin=None, **kwargs):
+        """ Returns the electronic structure from the siesta.TSHS file
+
+        The sparse data is read directly into the data array of the returned
+        Hamiltonian (no intermediate copies).
+
+        Parameters
+        ----------
+        spin : int or array_like, optional
+           only read these spin-components (the overlap matrix is always read),
+           default to read all spin-components. Only a single component of a
+           polarized calculation may be selected, which is returned as an unpolarized
+           Hamiltonian. This may be used to reduce memory usage.
+        """
 
         # First read the geometry
         geom = self.read_geometry()
 
-        # Now read the sizes used...
-        sizes = _siesta.read_tshs_sizes(self.file)
-        spin = sizes[0]
-        no = sizes[2]
-        nnz = sizes[4]
-        ncol, col, dH, dS = _siesta.read_tshs_hs(self.file, spin, no, nnz)
+        fr, head = self._r_header()
+        nspin = head['nspin']
+        spin = _spin_select(spin, nspin)
+        ncol = head['ncol']
+        col = fr.read_rows(np.int32, ncol)
+
+        # The data is read directly into the sparse matrix data
+        D = np.empty([head['nnz'], len(spin)+1], np.float64)
+        S = fr.read_rows(np.float64, ncol, out=D[:, -1])
+        _read_spin(fr, np.float64, ncol, nspin, spin, D)
+        # Shift the Fermi level to 0 (only for the diagonal spin components)
+        Ef = head['Ef']
+        for i, s in enumerate(spin):
+            if s < 2:
+                D[:, i] -= Ef * S
+        D[:, :-1] *= Ry2eV
 
         # Create the Hamiltonian container
-        H = Hamiltonian(geom, spin, nnzpr=1, orthogonal=False)
-
-        # Create the new sparse matrix
-        H._csr.ncol = ncol.astype(np.int32, copy=False)
-        H._csr.ptr = np.insert(np.cumsum(ncol, dtype=np.int32), 0, 0)
-        # Correct fortran indices
-        H._csr.col = col.astype(np.int32, copy=False) - 1
-        H._csr._nnz = len(col)
-
-        H._csr._D = np.empty([nnz, spin+1], np.float64)
-        H._csr._D[:, :spin] = dH[:, :]
-        H._csr._D[:, spin] = dS[:]
-
-        return H
+        H = Hamiltonian(geom, len(spin), nnzpr=1, orthogonal=False)
+        return _csr_attach(H, ncol, col, D)
 
     def read_overlap(self, **kwargs):
         """ Returns the overlap matrix from the siesta.TSHS file """
@@ -123,29 +200,20 @@ class TSHSSileSiesta(SileBinSiesta):
         # First read the geometry
         geom = self.read_geometry()
 
-        # Now read the sizes used...
-        sizes = _siesta.read_tshs_sizes(self.file)
-        no = sizes[2]
-        nnz = sizes[4]
-        ncol, col, dS = _siesta.read_tshs_s(self.file, no, nnz)
+        fr, head = self._r_header()
+        ncol = head['ncol']
+        col = fr.read_rows(np.int32, ncol)
 
-        # Create the Hamiltonian container
-        S = SparseOrbitalBZ(geom, nnzpr=1)
-
-        # Create the new sparse matrix
-        S._csr.ncol = ncol.astype(np.int32, copy=False)
-        S._csr.ptr = np.insert(np.cumsum(ncol, dtype=np.int32), 0, 0)
-        # Correct fortran indices
-        S._csr.col = col.astype(np.int32, copy=False) - 1
-        S._csr._nnz = len(col)
+        D = np.empty([head['nnz'], 1], np.float64)
+        fr.read_rows(np.float64, ncol, out=D[:, 0])
 
-        S._csr._D = np.empty([nnz, 1], np.float64)
-        S._csr._D[:, 0] = dS[:]
-
-        return S
+        # Create the overlap container
+        S = SparseOrbitalBZ(geom, nnzpr=1)
+        return _csr_attach(S, ncol, col, D)
 
     def write_hamiltonian(self, H, **kwargs):
         """ Writes the Hamiltonian to a siesta.TSHS file """
+        _require_module(self, 'write_hamiltonian')
         # Ensure the Hamiltonian is finalized
         H.finalize()
 
@@ -188,47 +256,67 @@ class TSHSSileSiesta(SileBinSiesta):
                               nspin=len(H.spin), na_u=H.geom.na, no_u=H.geom.no, nnz=H.nnz)
 
 
-class DMSileSiesta(SileBinSiesta):
-    """ Siesta DM file object """
+def _geom_boxed(kwargs, no, name):
+    """ Return the geometry passed in `kwargs`, or a simple boxed geometry with `no` orbitals """
+    geom = kwargs.get('geom', kwargs.get('geometry', None))
+    if geom is None:
+        # We truly, have no clue,
+        # Just generate a boxed system
+        xyz = [[x, 0, 0] for x in range(no)]
+        geom = Geometry(xyz, Atom(1), sc=[no, 1, 1])
 
-    def read_density_matrix(self, **kwargs):
-        """ Returns the density matrix from the siesta.DM file """
+    if geom.no != no:
+        raise ValueError("Reading " + name + " files requires the input geometry to have the "
+                         "correct number of orbitals.")
+    return geom
 
-        # Now read the sizes used...
-        spin, no, nnz = _siesta.read_dm_sizes(self.file)
-        ncol, col, dDM = _siesta.read_dm(self.file, spin, no, nnz)
 
-        # Try and immediately attach a geometry
-        geom = kwargs.get('geom', kwargs.get('geometry', None))
-        if geom is None:
-            # We truly, have no clue,
-            # Just generate a boxed system
-            xyz = [[x, 0, 0] for x in range(no)]
-            geom = Geometry(xyz, Atom(1), sc=[no, 1, 1])
+class DMSileSiesta(SileBinSiesta):
+    """ Siesta DM file object
 
-        if geom.no != no:
-            raise ValueError("Reading DM files requires the input geometry to have the "
-                             "correct number of orbitals.")
+    The file is read using NumPy (memory-mapped), no compiled modules are required
+    for reading.
+    """
 
-        # Create the density matrix container
-        DM = DensityMatrix(geom, spin, nnzpr=1, dtype=np.float64, orthogonal=False)
+    def _r_header(self):
+        """ Read the header of the DM file, returns the open records, the number of spin-components, columns and the column indices """
+        fr = FortranRecords(self.file)
+        no, spin = fr.read(np.int32).tolist()
+        ncol = fr.read(np.int32)
+        if len(ncol) != no:
+            raise SileError(self.__class__.__name__ + ' found an inconsistent number of orbitals.')
+        col = fr.read_rows(np.int32, ncol)
+        return fr, spin, ncol, col
 
-        # Create the new sparse matrix
-        DM._csr.ncol = ncol.astype(np.int32, copy=False)
-        DM._csr.ptr = np.insert(np.cumsum(ncol, dtype=np.int32), 0, 0)
-        # Correct fortran indices
-        DM._csr.col = col.astype(np.int32, copy=False) - 1
-        DM._csr._nnz = len(col)
+    def read_density_matrix(self, spin=None, **kwargs):
+        """ Returns the density matrix from the siesta.DM file
 
-        DM._csr._D = np.empty([nnz, spin+1], np.float64)
-        DM._csr._D[:, :] = dDM[:, :]
+        Parameters
+        ----------
+        spin : int or array_like, optional
+           only read these spin-components, default to read all spin-components.
+           Only a single component of a polarized calculation may be selected, which is
+           returned as an unpolarized density matrix.
+        geom : Geometry, optional
+           the geometry associated with the density matrix
+        """
+
+        fr, nspin, ncol, col = self._r_header()
+        spin = _spin_select(spin, nspin)
+        geom = _geom_boxed(kwargs, len(ncol), 'DM')
+
+        D = np.empty([len(col), len(spin)+1], np.float64)
+        _read_spin(fr, np.float64, ncol, nspin, spin, D)
         # DM file does not contain overlap matrix... so neglect it for now.
-        DM._csr._D[:, spin] = 0.
+        D[:, -1] = 0.
 
-        return DM
+        # Create the density matrix container
+        DM = DensityMatrix(geom, len(spin), nnzpr=1, dtype=np.float64, orthogonal=False)
+        return _csr_attach(DM, ncol, col, D)
 
     def write_density_matrix(self, DM, **kwargs):
         """ Writes the density matrix to a siesta.DM file """
+        _require_module(self, 'write_density_matrix')
         # Ensure the density matrix is finalized
         DM.finalize()
 
@@ -252,64 +340,85 @@ class DMSileSiesta(SileBinSiesta):
 
 
 class TSDESileSiesta(DMSileSiesta):
-    """ TranSiesta TSDE file object """
+    """ TranSiesta TSDE file object
 
-    def read_energy_density_matrix(self, **kwargs):
-        """ Returns the energy density matrix from the siesta.DM file """
+    The file is read using NumPy (memory-mapped), no compiled modules are required
+    for reading.
+    """
 
-        # Now read the sizes used...
-        spin, no, nnz = _siesta.read_tsde_sizes(self.file)
-        ncol, col, dEDM = _siesta.read_tsde_edm(self.file, spin, no, nnz)
-
-        # Try and immediately attach a geometry
-        geom = kwargs.get('geom', kwargs.get('geometry', None))
-        if geom is None:
-            # We truly, have no clue,
-            # Just generate a boxed system
-            xyz = [[x, 0, 0] for x in range(no)]
-            geom = Geometry(xyz, Atom(1), sc=[no, 1, 1])
+    def read_energy_density_matrix(self, spin=None, **kwargs):
+        """ Returns the energy density matrix from the siesta.DM file
 
-        if geom.no != no:
-            raise ValueError("Reading EDM files requires the input geometry to have the "
-                             "correct number of orbitals.")
+        Parameters
+        ----------
+        spin : int or array_like, optional
+           only read these spin-components, default to read all spin-components.
+           Only a single component of a polarized calculation may be selected, which is
+           returned as an unpolarized energy density matrix.
+        geom : Geometry, optional
+           the geometry associated with the energy density matrix
+        """
 
-        # Create the energy density matrix container
-        EDM = EnergyDensityMatrix(geom, spin, nnzpr=1, dtype=np.float32, orthogonal=False)
+        fr, nspin, ncol, col = self._r_header()
+        spin = _spin_select(spin, nspin)
+        geom = _geom_boxed(kwargs, len(ncol), 'EDM')
 
-        # Create the new sparse matrix
-        EDM._csr.ncol = ncol.astype(np.int32, copy=False)
-        EDM._csr.ptr = np.insert(np.cumsum(ncol, dtype=np.int32), 0, 0)
-        # Correct fortran indices
-        EDM._csr.col = col.astype(np.int32, copy=False) - 1
-        EDM._csr._nnz = len(col)
+        # Skip the density matrix
+        for _ in range(nspin):
+            fr.skip_rows(np.float64, ncol)
 
-        EDM._csr._D = np.empty([nnz, spin+1], np.float32)
-        EDM._csr._D[:, :spin] = dEDM[:, :]
+        D = np.empty([len(col), len(spin)+1], np.float32)
+        _read_spin(fr, np.float64, ncol, nspin, spin, D)
+        D[:, :-1] *= Ry2eV
         # EDM file does not contain overlap matrix... so neglect it for now.
-        EDM._csr._D[:, spin] = 0.
+        D[:, -1] = 0.
 
-        return EDM
+        # Create the energy density matrix container
+        EDM = EnergyDensityMatrix(geom, len(spin), nnzpr=1, dtype=np.float32, orthogonal=False)
+        return _csr_attach(EDM, ncol, col, D)
 
 
 class HSXSileSiesta(SileBinSiesta):
-    """ Siesta HSX file object """
+    """ Siesta HSX file object
+
+    The file is read using NumPy (memory-mapped), no compiled modules are required
+    for reading.
+    """
+
+    def read_hamiltonian(self, spin=None, **kwargs):
+        """ Returns the electronic structure from the siesta.HSX file
 
-    def read_hamiltonian(self, **kwargs):
-        """ Returns the electronic structure from the siesta.TSHS file """
+        Parameters
+        ----------
+        spin : int or array_like, optional
+           only read these spin-components (the overlap matrix is always read),
+           default to read all spin-components. Only a single component of a
+           polarized calculation may be selected, which is returned as an unpolarized
+           Hamiltonian.
+        geom : Geometry, optional
+           the geometry associated with the Hamiltonian
+        """
+
+        fr = FortranRecords(self.file)
+        no, no_s, nspin, nnz = fr.read(np.int32).tolist()
+        spin = _spin_select(spin, nspin)
+        Gamma = fr.read(np.int32)[0] != 0
+        if not Gamma:
+            fr.skip() # indxuo
+        ncol = fr.read(np.int32)
+        col = fr.read_rows(np.int32, ncol)
 
-        # Now read the sizes used...
-        Gamma, sizes = _siesta.read_hsx_sizes(self.file)
-        no = sizes[0]
-        n_s = sizes[1] / no
-        spin = sizes[2]
-        nnz = sizes[3]
-        ncol, col, dH, dS, dxij = _siesta.read_hsx(self.file, Gamma, no, no * n_s, spin, nnz)
+        D = np.empty([nnz, len(spin)+1], np.float32)
+        _read_spin(fr, np.float32, ncol, nspin, spin, D)
+        D[:, :-1] *= Ry2eV
+        fr.read_rows(np.float32, ncol, out=D[:, -1])
 
         # Try and immediately attach a geometry
         geom = kwargs.get('geom', kwargs.get('geometry', None))
         if geom is None:
+            fr.skip() # Qtot, temp
             # We have *no* clue about the
-            if np.allclose(xij, 0.):
+            if Gamma or np.allclose(fr.read_rows(np.float32, ncol * 3), 0.):
                 # We truly, have no clue,
                 # Just generate a boxed system
                 xyz = [[x, 0, 0] for x in range(no)]
@@ -323,29 +432,20 @@ class HSXSileSiesta(SileBinSiesta):
                              "correct number of orbitals.")
 
         # Create the Hamiltonian container
-        H = Hamiltonian(geom, spin, nnzpr=1, dtype=np.float32, orthogonal=False)
-
-        # Create the new sparse matrix
-        H._csr.ncol = ncol.astype(np.int32, copy=False)
-        H._csr.ptr = np.insert(np.cumsum(ncol, dtype=np.int32), 0, 0)
-        # Correct fortran indices
-        H._csr.col = col.astype(np.int32, copy=False) - 1
-        H._csr._nnz = len(col)
-
-        H._csr._D = np.empty([nnz, spin+1], np.float32)
-        H._csr._D[:, :spin] = dH[:, :]
-        H._csr._D[:, spin] = dS[:]
-
-        return H
+        H = Hamiltonian(geom, len(spin), nnzpr=1, dtype=np.float32, orthogonal=False)
+        return _csr_attach(H, ncol, col, D)
 
 
 class GridSileSiesta(SileBinSiesta):
-    """ Siesta grid binary file """
+    """ Siesta grid binary file
+
+    The file is read using NumPy (memory-mapped), no compiled modules are required
+    for reading.
+    """
 
     def read_supercell(self, *args, **kwargs):
 
-        cell = _siesta.read_grid_cell(self.file)
-        cell = np.array(cell.T, np.float64)
+        cell = FortranRecords(self.file).read(np.float64) * Bohr2Ang
         cell.shape = (3, 3)
 
         return SuperCell(cell)
@@ -361,28 +461,30 @@ class GridSileSiesta(SileBinSiesta):
            ``[0.5, 0.5]`` will return sum of half the first two components.
            Default to the first component.
         """
+        fr = FortranRecords(self.file)
+        cell = fr.read(np.float64) * Bohr2Ang
+        cell.shape = (3, 3)
         # Read the sizes
-        nspin, mesh = _siesta.read_grid_sizes(self.file)
-        # Read the cell and grid
-        cell = _siesta.read_grid_cell(self.file)
-        grid = _siesta.read_grid(self.file, nspin, mesh[0], mesh[1], mesh[2])
+        mesh = fr.read(np.int32)
+        nspin = mesh[3]
+        mesh = mesh[:3].tolist()
 
+        # Each record is a line along the first lattice vector, the grid
+        # is a view of the mapped file (the record markers are masked).
+        grid = fr.read_equal(np.float32, nspin * mesh[1] * mesh[2])
+        grid = grid.reshape(nspin, mesh[2], mesh[1], mesh[0])
+
+        g = Grid(mesh, sc=SuperCell(cell), dtype=np.float32)
+        # The first lattice vector is the fastest index in the file
         if isinstance(spin, Integral):
-            grid = grid[:, :, :, spin]
+            np.multiply(grid[spin].T, self.grid_unit, out=g.grid)
         else:
             if len(spin) > grid.shape[0]:
                 raise ValueError(self.__class__.__name__ + '.read_grid requires spin to be an integer or '
                                  'an array of length equal to the number of spin components.')
-            g = grid[:, :, :, 0] * spin[0]
+            np.multiply(grid[0].T, spin[0] * self.grid_unit, out=g.grid)
             for i, scale in enumerate(spin[1:]):
-                g += grid[:, :, :, 1+i] * scale
-            grid = g
-
-        cell = np.array(cell.T, np.float64)
-        cell.shape = (3, 3)
-
-        g = Grid(mesh, sc=SuperCell(cell), dtype=np.float32)
-        g.grid = np.array(grid.swapaxes(0, 2), np.float32) * self.grid_unit
+                g.grid += grid[1+i].T * (scale * self.grid_unit)
         return g
 
 
@@ -495,6 +597,116 @@ class _GFSileSiesta(SileBinSiesta):
         # Step energy counter
         self._ie += 1
 
+    def write_self_energies(self, SE, E, bz, mu=0., threads=None, chunk=16):
+        r""" Calculate and write the self-energies for all energies and k-points
+
+        This writes the header, the Hamiltonian and overlap matrices and the bulk
+        self-energies (:math:`E\mathbf S - \mathbf H - \boldsymbol\Sigma`) in the order required by
+        TranSiesta/TBtrans.
+        The self-energies are calculated by a pool of threads while the records are
+        written (in order) as soon as they are available.
+        Each task calculates the self-energies for a chunk of energies at a single k-point
+        using `RecursiveSI.self_energies`, such that the k-dependent matrices are re-used.
+
+        Parameters
+        ----------
+        SE : SemiInfinite
+           the self-energy object (a Bloch-expansion writes the self-energies of the repeated electrode)
+        E : array_like of float or complex
+           the energy points, if real the imaginary part is ``SE.eta``
+        bz : BrillouinZone
+           contains the k-points and their weights
+        mu : float, optional
+           chemical potential of the electrode
+        threads : int, optional
+           number of threads calculating the self-energies (LAPACK releases the GIL), defaults
+           to the number of available cores.
+        chunk : int, optional
+           maximum number of energies calculated in each task, decreased if there are less
+           tasks than threads. At most ``2 * threads`` chunks are kept in memory.
+
+        Examples
+        --------
+        >>> SE = RecursiveSI(H, '-A') # doctest: +SKIP
+        >>> bz = MonkhorstPack(H, [1, 4, 1]) # doctest: +SKIP
+        >>> TSGFSileSiesta('left.TSGF').write_self_energies(SE, np.linspace(-2, 2, 100), bz) # doctest: +SKIP
+        """
+        _require_module(self, 'write_self_energies')
+        from threading import Semaphore
+
+        # The electrode principal cell (the Hamiltonian and overlap are calculated from this)
+        obj = SE.spgeom0
+        for ax, nb in enumerate(SE.bloch):
+            if nb > 1:
+                obj = obj.tile(nb, ax)
+
+        E = np.asarray(E)
+        if E.dtype.kind != 'c':
+            E = E + 1j * SE.eta
+        E = np.ravel(E)
+        k = bz.k
+        nE = len(E)
+
+        if threads is None:
+            from multiprocessing import cpu_count
+            threads = cpu_count()
+        threads = max(min(threads, len(k) * nE), 1)
+        # Ensure all threads have a task
+        chunk = max(1, min(chunk, -(-len(k) * nE // threads)))
+
+        def calc(ik_iE):
+            ik, iE = ik_iE
+            Ec = E[iE:iE+chunk]
+            if hasattr(SE, 'self_energies'):
+                # Re-use the k-dependent matrices for all energies in the chunk
+                return SE.self_energies(Ec.real, k[ik], eta=Ec.imag, bulk=True)
+            return [SE.self_energy(e.real, k[ik], eta=e.imag, bulk=True) for e in Ec]
+
+        # Limit the number of calculated (but not written) chunks of self-energies
+        ahead = Semaphore(threads * 2)
+        abort = []
+
+        def tasks():
+            for ik in range(len(k)):
+                for iE in range(0, nE, chunk):
+                    ahead.acquire()
+                    if abort:
+                        return
+                    yield ik, iE
+
+        self.write_header(E, bz, obj, mu=mu)
+        if threads == 1:
+            pool = None
+            SEs = (calc(task) for task in tasks())
+        else:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(threads)
+            SEs = pool.imap(calc, tasks(), chunksize=1)
+
+        try:
+            # The self-energies are returned in the order of the tasks
+            nchunk = -(-nE // chunk)
+            for i, ses in enumerate(SEs):
+                ik, ic = divmod(i, nchunk)
+                if ic == 0:
+                    self.write_hamiltonian(obj.Pk(k[ik], format='array'), obj.Sk(k[ik], format='array'))
+                for se in ses:
+                    self.write_self_energy(se)
+                del ses, se
+                ahead.release()
+        except:
+            # Stop the task generator before terminating the pool
+            abort.append(True)
+            ahead.release()
+            if pool is not None:
+                pool.terminate()
+            raise
+        finally:
+            self._close_gf()
+        if pool is not None:
+            pool.close()
+            pool.join()
+
     def __iter__(self):
         """ Iterate through the energies and k-points that this GF file is associated with
 
@@ -518,18 +730,20 @@ def _type(name, obj, dic=None):
 # Faster than class ... \ pass
 TSGFSileSiesta = _type("TSGFSileSiesta", _GFSileSiesta)
 
+add_sile('TSHS', TSHSSileSiesta)
+add_sile('TSDE', TSDESileSiesta)
+add_sile('DM', DMSileSiesta)
+add_sile('HSX', HSXSileSiesta)
+# These have unit-conversions
+BohrC2AngC = Bohr2Ang ** 3
+add_sile('RHO', _type("RhoSileSiesta", GridSileSiesta, {'grid_unit': 1./BohrC2AngC}))
+add_sile('RHOINIT', _type("RhoInitSileSiesta", GridSileSiesta, {'grid_unit': 1./BohrC2AngC}))
+add_sile('DRHO', _type("dRhoSileSiesta", GridSileSiesta, {'grid_unit': 1./BohrC2AngC}))
+add_sile('IOCH', _type("IoRhoSileSiesta", GridSileSiesta, {'grid_unit': 1./BohrC2AngC}))
+add_sile('TOCH', _type("TotalRhoSileSiesta", GridSileSiesta, {'grid_unit': 1./BohrC2AngC}))
+add_sile('VH', _type("HartreeSileSiesta", GridSileSiesta, {'grid_unit': Ry2eV}))
+add_sile('VNA', _type("NeutralAtomHartreeSileSiesta", GridSileSiesta, {'grid_unit': Ry2eV}))
+add_sile('VT', _type("TotalHartreeSileSiesta", GridSileSiesta, {'grid_unit': Ry2eV}))
 if found_module:
-    add_sile('TSHS', TSHSSileSiesta)
-    add_sile('TSDE', TSDESileSiesta)
-    add_sile('DM', DMSileSiesta)
-    # These have unit-conversions
-    BohrC2AngC = Bohr2Ang ** 3
-    add_sile('RHO', _type("RhoSileSiesta", GridSileSiesta, {'grid_unit': 1./BohrC2AngC}))
-    add_sile('RHOINIT', _type("RhoInitSileSiesta", GridSileSiesta, {'grid_unit': 1./BohrC2AngC}))
-    add_sile('DRHO', _type("dRhoSileSiesta", GridSileSiesta, {'grid_unit': 1./BohrC2AngC}))
-    add_sile('IOCH', _type("IoRhoSileSiesta", GridSileSiesta, {'grid_unit': 1./BohrC2AngC}))
-    add_sile('TOCH', _type("TotalRhoSileSiesta", GridSileSiesta, {'grid_unit': 1./BohrC2AngC}))
-    add_sile('VH', _type("HartreeSileSiesta", GridSileSiesta, {'grid_unit': Ry2eV}))
-    add_sile('VNA', _type("NeutralAtomHartreeSileSiesta", GridSileSiesta, {'grid_unit': Ry2eV}))
-    add_sile('VT', _type("TotalHartreeSileSiesta", GridSileSiesta, {'grid_unit': Ry2eV}))
+    # Only writing is implemented (requires the Fortran module)
     add_sile('TSGF', TSGFSileSiesta)
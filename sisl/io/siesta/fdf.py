@@ -1,5 +1,6 @@
 from __future__ import print_function, division
 
+import os
 import os.path as osp
 import numpy as np
 import warnings
@@ -37,6 +38,17 @@ _LOGICAL = _LOGICAL_FALSE + _LOGICAL_TRUE
 Bohr2Ang = unit_convert('Bohr', 'Ang')
 
 
+def _tolabel(label):
+    """ Normalized fdf-label (case-insensitive and without ``_``, ``-`` and ``.``) """
+    return label.lower().replace('_', '').replace('-', '').replace('.', '')
+
+
+def _fdf_stat(f):
+    """ Modification time and size of a file, used to track changes to the fdf files """
+    st = os.stat(f)
+    return st.st_mtime, st.st_size
+
+
 class fdfSileSiesta(SileSiesta):
     """ Initialize an FDF file from the filename
 
@@ -58,6 +70,10 @@ class fdfSileSiesta(SileSiesta):
     >>> fdf = fdfSileSiesta('tmp/RUN.fdf', base='.') # reads output files in './' folder
     """
 
+    # The read methods may read other (output) files, hence
+    # caching may only be enabled explicitly for each object.
+    cache = False
+
     def __init__(self, filename, mode='r', base=None):
         super(fdfSileSiesta, self).__init__(filename, mode=mode)
         if base is None:
@@ -86,6 +102,10 @@ class fdfSileSiesta(SileSiesta):
         self._parent_fh = []
         self._directory = '.'
 
+        # Label index of the fdf file (and all included files)
+        self._index = None
+        self._index_stat = dict()
+
     def _tofile(self, f):
         """ Make `f` refer to the file with the appropriate base directory """
         return osp.join(self._directory, f)
@@ -143,99 +163,120 @@ class fdfSileSiesta(SileSiesta):
 
         return includes
 
-    @Sile_fh_open
-    def _read_label(self, label):
-        """ Try and read the first occurence of a key
+    def _index_outdated(self):
+        """ Whether any of the files used to create the label index has changed since it was created """
+        if self._index is None:
+            return True
+        for f, st in self._index_stat.items():
+            try:
+                if _fdf_stat(f) != st:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _build_index(self):
+        """ Read the fdf file (and all included files) once and create a label -> value table """
+        self._index_stat = dict()
+        self._index = self._index_file(self.file, dict())
+
+    def _index_file(self, f, index):
+        """ Add all labels and blocks found in `f` to `index`
 
-        This will take care of blocks, labels and piped in labels
+        Only the first occurrence of a label is stored. Included files (``%include``)
+        are processed at the point of inclusion and labels/blocks piped from other files
+        (``<``) are read accordingly.
 
         Parameters
         ----------
-        label : str
-           label to find in the fdf file
+        f : str
+           file to read the labels from
+        index : dict
+           the table to add the normalized labels to
         """
-        self._seek()
-        def tolabel(label):
-            return label.lower().replace('_', '').replace('-', '').replace('.', '')
-        labell = tolabel(label)
-
-        def valid_line(line):
-            ls = line.strip()
-            if len(ls) == 0:
-                return False
-            return not (ls[0] in self._comment)
-
-        def process_line(line):
-            # Split line by spaces
-            ls = line.split()
+        self._index_stat[f] = _fdf_stat(f)
+        with open(f, 'r') as fh:
+            lines = fh.readlines()
+
+        comment = tuple(self._comment)
+        it = iter(lines)
+        for line in it:
+            if line.startswith(comment):
+                continue
+            ls = line.split('#')[0].split()
             if len(ls) == 0:
-                return None
+                continue
 
-            # Make a lower equivalent of ls
-            lsl = list(map(tolabel, ls))
+            # Make a normalized equivalent of ls
+            lsl = list(map(_tolabel, ls))
 
             # Check if there is a pipe in the line
             if '<' in lsl:
                 idx = lsl.index('<')
-                # Now there are two cases
+                pipe = self._tofile(ls[idx+1])
 
                 # 1. It is a block, in which case
                 #    the full block is piped into the label
                 #    %block Label < file
-                if lsl[0] == '%block' and lsl[1] == labell:
-                    # Correct line found
-                    # Read the file content, removing any empty and/or comment lines
-                    lines = open(self._tofile(ls[3]), 'r').readlines()
-                    return [l.strip() for l in lines if valid_line(l)]
+                if lsl[0] == '%block':
+                    if lsl[1] not in index:
+                        self._index_stat[pipe] = _fdf_stat(pipe)
+                        with open(pipe, 'r') as fh:
+                            block = [l.strip() for l in fh.readlines()]
+                        # Remove any empty and/or comment lines
+                        index[lsl[1]] = [l for l in block if len(l) > 0 and not l[0] in comment]
 
                 # 2. There are labels that should be read from a subsequent file
                 #    Label1 Label2 < other.fdf
-                if labell in lsl[:idx]:
-                    # Valid line, read key from other.fdf
-                    return fdfSileSiesta(self._tofile(ls[idx+1]), base=self._directory)._read_label(label)
-
-                # It is not in this line, either key is
-                # on the RHS of <, or the key could be "block". Say.
-                return None
-
-            # The last case is if the label is the first word on the line
-            # In that case we have found what we are looking for
-            if lsl[0] == labell:
-                return (' '.join(ls[1:])).strip()
+                else:
+                    pipe = self._index_file(pipe, dict())
+                    for label in lsl[:idx]:
+                        if label in pipe:
+                            index.setdefault(label, pipe[label])
 
             elif lsl[0] == '%block':
-                if lsl[1] == labell:
-                    # Read in the block content
-                    lines = []
-
-                    # Now read lines
-                    l = self.readline().strip()
-                    while not tolabel(l).startswith('%endblock'):
-                        if len(l) > 0:
-                            lines.append(l)
-                        l = self.readline().strip()
-                    return lines
+                # Read in the block content
+                block = []
+                for l in it:
+                    if l.startswith(comment):
+                        continue
+                    l = l.strip()
+                    if _tolabel(l).startswith('%endblock'):
+                        break
+                    if len(l) > 0:
+                        block.append(l)
+                if len(lsl) > 1:
+                    index.setdefault(lsl[1], block)
 
             elif lsl[0] == '%include':
+                # Continue reading in the included file
+                self._index_file(self._tofile(ls[1]), index)
 
-                # We have to open a new file
-                self._pushfile(ls[1])
+            else:
+                index.setdefault(lsl[0], ' '.join(ls[1:]))
 
-            return None
+        return index
 
-        # Perform actual reading of line
-        l = self.readline().split('#')[0]
-        if len(l) == 0:
-            return None
-        l = process_line(l)
-        while l is None:
-            l = self.readline().split('#')[0]
-            if len(l) == 0:
-                if not self._popfile():
-                    return None
-            l = process_line(l)
+    def _read_label(self, label):
+        """ Try and read the first occurence of a key
+
+        This will take care of blocks, labels and piped in labels.
+
+        The fdf file (and all included files) are only read once and stored in
+        a label index. The index is re-created if any of the files changes.
 
-        return l
+        Parameters
+        ----------
+        label : str
+           label to find in the fdf file
+        """
+        if self._index_outdated():
+            self._build_index()
+        value = self._index.get(_tolabel(label), None)
+        if isinstance(value, list):
+            # Ensure the index is not changed by the caller
+            return list(value)
+        return value
 
     @classmethod
     def _type(cls, value):
@@ -284,7 +325,6 @@ class fdfSileSiesta(SileSiesta):
 
         return 'n'
 
-    @Sile_fh_open
     def type(self, label):
         """ Return the type of the fdf-keyword
 
@@ -293,10 +333,8 @@ class fdfSileSiesta(SileSiesta):
         label : str
             the label to look-up
         """
-        self._seek()
         return self._type(self._read_label(label))
 
-    @Sile_fh_open
     def get(self, label, unit=None, default=None, with_unit=False):
         """ Retrieve fdf-keyword from the file
 
@@ -399,6 +437,9 @@ class fdfSileSiesta(SileSiesta):
         # already present, if so, we will add the new key, just above
         # the already present key.
 
+        # The label index has to be re-created
+        self._index = None
+
         # 1. find the old value, and thus the file in which it is found
         with self:
             #old_value = self.get(key)
@@ -433,7 +474,7 @@ class fdfSileSiesta(SileSiesta):
         do_write = True
         with open(top_file, 'w') as fh:
             for line in lines:
-                if self.line_has_key(line, key, case=False) and do_write:
+                if self.line_has_key(line, key.lower(), case=False) and do_write:
                     write(fh, value)
                     if keep:
                         fh.write('# Old value\n')
@@ -441,6 +482,9 @@ class fdfSileSiesta(SileSiesta):
                     do_write = False
                 else:
                     fh.write(line)
+            if do_write:
+                # The key was not present, add it
+                write(fh, value)
 
     @staticmethod
     def print(key, value):
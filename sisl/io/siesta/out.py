@@ -6,6 +6,7 @@ import numpy as np
 from .sile import SileSiesta
 from ..sile import *
 from sisl.io._help import *
+from ..trajectory import Trajectory
 
 # Import the geometry object
 from sisl import Geometry, Atom, SuperCell
@@ -33,6 +34,11 @@ class outSileSiesta(SileSiesta):
     This enables reading the output quantities from the Siesta output.
     """
 
+    def _setup(self, *args, **kwargs):
+        """ Setup the `outSileSiesta` after initialization """
+        # Species used when reading trajectories
+        self._trajectory_species = None
+
     @Sile_fh_open
     def read_species(self):
         """ Reads the species from the top of the output file.
@@ -85,7 +91,7 @@ class outSileSiesta(SileSiesta):
 
         return SuperCell(cell)
 
-    def _read_geometry_outcoor(self, line, last, all, species=None):
+    def _read_geometry_outcoor(self, line, species=None):
         """ Wrapper for reading the geometry as in the outcoor output """
         species = _ensure_species(species)
 
@@ -95,23 +101,15 @@ class outSileSiesta(SileSiesta):
         Ang = 'Ang' in line
 
         # Read in data
-        xyz = []
-        spec = []
-        atom = []
-        line = self.readline()
-        while len(line.strip()) > 0:
-            line = line.split()
-            xyz.append([float(x) for x in line[:3]])
-            spec.append(line[3])
-            try:
-                atom.append(line[5])
-            except Exception:
-                # Allowed pass due to pythonic reading
-                pass
-            line = self.readline()
+        cols = read_columns(self, end=lambda l: len(l.strip()) == 0)
+        xyz = columns_float(cols[:, :3])
+        spec = cols[:, 3]
+        if cols.shape[1] > 5:
+            atom = cols[:, 5]
+        else:
+            atom = []
 
         cell = self._read_supercell_outcell()
-        xyz = np.array(xyz, np.float64)
 
         # Now create the geometry
         if scaled:
@@ -129,13 +127,7 @@ class outSileSiesta(SileSiesta):
         try:
             geom = Geometry(xyz, atom, sc=cell)
         except:
-            geom = Geometry(xyz, [species[int(i)-1] for i in spec], sc=cell)
-
-        if all:
-            tmp = self._read_geometry_outcoor(last, all, species)
-            if tmp is None:
-                return [geom]
-            return tmp.extend([geom])
+            geom = Geometry(xyz, [species[i] for i in spec.astype(np.int32) - 1], sc=cell)
 
         return geom
 
@@ -147,19 +139,12 @@ class outSileSiesta(SileSiesta):
         Ang = 'Ang' in line
 
         # Read in data
-        xyz = []
-        atom = []
-        line = self.readline()
-        while len(line.strip()) > 0:
-            line = line.split()
-            xyz.append([float(x) for x in line[1:4]])
-            atom.append(species[int(line[4])-1])
-            line = self.readline()
+        cols = read_columns(self, end=lambda l: len(l.strip()) == 0, ncol=5)
+        xyz = columns_float(cols[:, 1:4])
+        atom = [species[i] for i in cols[:, 4].astype(np.int32) - 1]
 
         # Retrieve the unit-cell
         cell = self._read_supercell_outcell()
-        # Convert xyz
-        xyz = np.array(xyz, np.float64)
         if not Ang:
             xyz *= Bohr2Ang
 
@@ -178,7 +163,16 @@ class outSileSiesta(SileSiesta):
         all: bool, False
            return a list of all geometries (like an MD)
            If `True` `last` is ignored
+
+        See Also
+        --------
+        read_trajectory : lazy and random access to all MD/relaxation steps
         """
+        if all:
+            geom = list(self.read_trajectory())
+            if len(geom) == 0:
+                return None
+            return geom
 
         # The first thing we do is reading the species.
         # Sadly, if this routine is called AFTER some other
@@ -205,13 +199,45 @@ class outSileSiesta(SileSiesta):
         coord = type_coord(line)
 
         if coord == 1:
-            return self._read_geometry_outcoor(line, last, all, species)
+            return self._read_geometry_outcoor(line, species)
         elif coord == 2:
             return self._read_geometry_atomic(line, species)
 
         # Signal not found
         return None
 
+    def read_trajectory(self, cache=None):
+        """ Returns a `Trajectory` object for lazy and random access to all MD/relaxation steps
+
+        Each step is the geometry of an ``outcoor`` block (with the following unit-cell).
+
+        Parameters
+        ----------
+        cache : bool, optional
+           whether the frame offsets are cached next to the file, default to `Sile.cache`
+        """
+        return Trajectory(self, cache)
+
+    @staticmethod
+    def _r_trajectory_offsets(fh):
+        """ Byte-offsets of all ``outcoor`` blocks in the binary file handle `fh` """
+        offsets = []
+        offset = 0
+        for line in iter(fh.readline, b''):
+            if b'outcoor' in line:
+                offsets.append(offset)
+            offset += len(line)
+        return offsets
+
+    def _r_trajectory_frame(self):
+        """ Read the geometry of the ``outcoor`` block at the current position in the file """
+        if self._trajectory_species is None:
+            pos = self.fh.tell()
+            self.fh.seek(0)
+            self._trajectory_species = _ensure_species(self.read_species())
+            self.fh.seek(pos)
+        return self._read_geometry_outcoor(self.readline(), self._trajectory_species)
+
     @Sile_fh_open
     def read_force(self, last=True, all=False):
         """ Reads the forces from the Siesta output file
@@ -1,16 +1,18 @@
 from __future__ import print_function
 
+import gzip
 import numpy as np
 
 try:
-    from defusedxml import ElementTree
+    from defusedxml.ElementTree import iterparse
 except ImportError:
-    from xml.etree.ElementTree import ElementTree
+    from xml.etree.ElementTree import iterparse
 
 # Import sile objects
-from ..sile import add_sile
+from ..sile import add_sile, sile_cache
 from .sile import SileSiesta
-from sisl._array import arrayd, emptyd
+import sisl._array as _a
+from sisl._array import arrayd
 from sisl.atom import PeriodicTable, Atom, Atoms
 from sisl.geometry import Geometry
 from sisl.orbital import AtomicOrbital
@@ -28,9 +30,21 @@ class pdosSileSiesta(SileSiesta):
     Data file containing the PDOS as calculated by Siesta.
     """
 
-    def read_data(self, as_dataarray=False):
+    def _open_xml(self):
+        """ Open the file for binary reading (possibly gzipped) """
+        if self.file.endswith('gz'):
+            return gzip.open(self.file)
+        return open(self.file, 'rb')
+
+    @sile_cache
+    def read_data(self, as_dataarray=False, atom=None, orbital=None, l=None, ret_index=False):
         """ Returns data associated with the PDOS file
 
+        The file is parsed in a streaming fashion, i.e. only a single orbital is
+        kept in memory while parsing, and the PDOS of each orbital is written directly
+        into the returned array. Selecting a subset of the orbitals (`atom`, `orbital`
+        or `l`) ensures that the PDOS of the remaining orbitals are never stored.
+
         Parameters
         ----------
         as_dataarray: bool, optional
@@ -38,59 +52,151 @@ class pdosSileSiesta(SileSiesta):
            and orbital information as coordinates in the data.
            The geometry, unit and Fermi level are stored as attributes in the
            DataArray.
+        atom : array_like of int, optional
+           only read the PDOS of orbitals on these atoms (0-based)
+        orbital : array_like of int, optional
+           only read the PDOS of these orbitals (0-based orbital indices in the file)
+        l : array_like of int, optional
+           only read the PDOS of orbitals with these angular momenta
+        ret_index : bool, optional
+           also return the atom and orbital indices (in the file) of the returned atoms
+           and orbitals
 
         Returns
         -------
         geom : Geometry instance with positions, atoms and orbitals. The
                orbitals of these atoms are `AtomicOrbital` instances.
+               Only atoms and orbitals that are read are present in the geometry.
         E : the energies at which the PDOS has been evaluated at (if the Fermi-level is present the energies
             are shifted to E - Ef = 0, this will *only* be done from Siesta 4.0.2 and later).
-        PDOS : an array of DOS, for non-polarized calculations it has dimension ``(atom.no, len(E))``,
-               else it has dimension ``(nspin, atom.no, len(E))``.
+        PDOS : an array of DOS, for non-polarized calculations it has dimension ``(geom.no, len(E))``,
+               else it has dimension ``(nspin, geom.no, len(E))``.
+        atom_index : the atomic indices (0-based, in the file) of the atoms in `geom`, only
+               returned if `ret_index` is True.
+        orbital_index : the orbital indices (0-based, in the file) of the orbitals in `geom` (and
+               the rows of `PDOS`), only returned if `ret_index` is True.
         DataArray : if `as_dataarray` is True, only this data array is returned, in this case
                all data can be post-processed using the `xarray` selection routines.
+               The atom and orbital indices are stored as the ``atom_index`` and
+               ``orbital_index`` attributes.
         """
-        # Get the element-tree
-        ET = ElementTree('pdos', self.file)
-        root = ET.getroot()
-
-        # Get number of orbitals
-        nspin = int(root.find('nspin').text)
-        # Try and find the fermi-level
-        Ef = root.find('fermi_energy')
-        if Ef is None:
-            E = arrayd(map(float, root.find('energy_values').text.split()))
-        else:
-            Ef = float(Ef.text)
-            E = arrayd(map(float, root.find('energy_values').text.split())) - Ef
-        ne = len(E)
-
-        # All coordinate, atoms and species data
-        xyz = []
+        def conv(values):
+            if values is None:
+                return None
+            return set(_a.asarrayi(values).ravel().tolist())
+        atom = conv(atom)
+        orbital = conv(orbital)
+        l = conv(l)
+
+        def keep(ia, io, il):
+            if not atom is None and not ia in atom:
+                return False
+            if not orbital is None and not io in orbital:
+                return False
+            if not l is None and not il in l:
+                return False
+            return True
+
+        # For atom and l selections the number of read orbitals is counted
+        # in a quick pass to only allocate the selected orbitals
+        count = None
+        if not (atom is None and l is None):
+            fh = self._open_xml()
+            try:
+                count = _pdos_count(fh, keep)
+            finally:
+                fh.close()
+
+        fh = self._open_xml()
+
+        nspin = 1
+        norbitals = None
+        Ef = None
+        E = None
+        # PDOS of the read orbitals (nspin, no, nE)
+        PDOS = None
+        # Atomic information for all read orbitals
+        orbs = []
+        xyz = dict()
+        Z = dict()
+
+        try:
+            context = iterparse(fh, events=('start', 'end'))
+            _, root = next(context)
+            for event, elem in context:
+                if event == 'start':
+                    continue
+
+                tag = elem.tag
+                if tag == 'nspin':
+                    nspin = int(elem.text)
+
+                elif tag == 'norbitals':
+                    norbitals = int(elem.text)
+
+                elif tag == 'fermi_energy':
+                    Ef = float(elem.text)
+
+                elif tag == 'energy_values':
+                    E = _fromstring(elem.text)
+
+                elif tag == 'orbital':
+                    ia = int(elem.get('atom_index')) - 1
+                    io = int(elem.get('index')) - 1
+                    il = int(elem.get('l'))
+
+                    if keep(ia, io, il):
+                        if PDOS is None:
+                            if count is None:
+                                count = _pdos_size(norbitals, orbital)
+                            PDOS = _a.emptyd([nspin, count, len(E)])
+                        if not ia in Z:
+                            Z[ia] = _orbital_Z(elem)
+                            xyz[ia] = _fromstring(elem.get('position'))
+
+                        # Construct the atomic orbital
+                        O = AtomicOrbital(n=int(elem.get('n')), l=il, m=int(elem.get('m')),
+                                          Z=int(elem.get('z')), P=elem.get('P') == 'true')
+
+                        # it is formed like : spin-1, spin-2 (however already in eV)
+                        DOS = _fromstring(elem.find('data').text).reshape(-1, nspin)
+                        _process(PDOS[:, len(orbs), :], DOS.T)
+                        orbs.append((ia, io, O))
+
+                    # Remove the processed data
+                    elem.clear()
+                    root.clear()
+        finally:
+            fh.close()
+
+        if not Ef is None:
+            E -= Ef
+
+        if len(orbs) == 0:
+            raise ValueError(self.__class__.__name__ + '.read_data could not find any orbitals '
+                             'in {} (or none selected)'.format(self.file))
+
+        # Sort the orbitals according to atom and orbital index (Siesta writes them sorted)
+        idx = np.lexsort(([o[1] for o in orbs], [o[0] for o in orbs]))
+        if np.any(idx != _a.arangei(len(idx))):
+            PDOS = PDOS[:, idx, :]
+            orbs = [orbs[i] for i in idx]
+        elif len(orbs) < PDOS.shape[1]:
+            # Only retain the read orbitals
+            PDOS = PDOS[:, :len(orbs), :].copy()
+        orbital_index = _a.arrayi([o[1] for o in orbs])
+
+        # Create the atoms for the read orbitals
         atoms = []
-        atom_species = []
-        def ensure_size(ia):
-            while len(atom_species) <= ia:
-                atom_species.append(None)
-                xyz.append(None)
-        def ensure_size_orb(ia, i):
-            while len(atoms) <= ia:
+        ias = []
+        for ia, _, O in orbs:
+            if len(ias) == 0 or ias[-1] != ia:
+                ias.append(ia)
                 atoms.append([])
-            while len(atoms[ia]) <= i:
-                atoms[ia].append(None)
-
-        if nspin == 4:
-            def process(D):
-                tmp = np.empty(D.shape[0], D.dtype)
-                tmp[:] = D[:, 3]
-                D[:, 3] = D[:, 0] - D[:, 1]
-                D[:, 0] = D[:, 0] + D[:, 1]
-                D[:, 1] = D[:, 2]
-                D[:, 2] = tmp[:]
-                return D
-        else:
-            def process(D):
-                return D
+            atoms[-1].append(O)
+        atoms = Atoms([Atom(Z[ia], os) for ia, os in zip(ias, atoms)])
+        geom = Geometry(arrayd([xyz[ia] for ia in ias]) * Bohr2Ang, atoms)
+        atom_index = _a.arrayi(ias)
 
         if as_dataarray:
             import xarray as xr
@@ -99,84 +205,28 @@ class pdosSileSiesta(SileSiesta):
             elif nspin == 2:
                 spin = ['up', 'down']
             elif nspin == 4:
-                spin = ['sum', 'x', 'y' 'z']
+                spin = ['sum', 'x', 'y', 'z']
 
             # Dimensions of the PDOS data-array
             dims = ['E', 'spin', 'n', 'l', 'm', 'zeta', 'polarization']
 
-            shape = (ne, nspin, 1, 1, 1, 1, 1)
-            def to(o, DOS):
+            shape = (len(E), nspin, 1, 1, 1, 1, 1)
+            D = None
+            for i, (_, _, o) in enumerate(orbs):
                 # Coordinates for this dataarray
                 coords = [E, spin,
                           [o.n], [o.l], [o.m], [o.Z], [o.P]]
-
-                return xr.DataArray(data=process(DOS).reshape(shape),
-                                    dims=dims, coords=coords, name='PDOS')
-
-        else:
-            def to(o, DOS):
-                return process(DOS)
-
-        D = []
-        for orb in root.findall('orbital'):
-
-            # Short-hand function to retrieve integers for the attributes
-            def oi(name):
-                return int(orb.get(name))
-
-            # Get indices
-            ia = oi('atom_index') - 1
-            i = oi('index') - 1
-
-            species = orb.get('species')
-
-            # Create the atomic orbital
-            try:
-                Z = oi('Z')
-            except:
-                try:
-                    Z = PeriodicTable().Z(species)
-                except:
-                    # Unknown
-                    Z = -1
-
-            try:
-                P = orb.get('P') == 'true'
-            except:
-                P = False
-
-            ensure_size(ia)
-            xyz[ia] = list(map(float, orb.get('position').split()))
-            atom_species[ia] = Z
-
-            # Construct the atomic orbital
-            O = AtomicOrbital(n=oi('n'), l=oi('l'), m=oi('m'), Z=oi('z'), P=P)
-
-            # We know that the index is far too high. However,
-            # this ensures a consecutive orbital
-            ensure_size_orb(ia, i)
-            atoms[ia][i] = O
-
-            # it is formed like : spin-1, spin-2 (however already in eV)
-            DOS = arrayd(map(float, orb.find('data').text.split())).reshape(-1, nspin)
-
-            if as_dataarray:
-                if len(D) == 0:
-                    D = to(O, DOS)
+                DA = xr.DataArray(data=PDOS[:, i, :].T.reshape(shape),
+                                  dims=dims, coords=coords, name='PDOS')
+                if D is None:
+                    D = DA
                 else:
-                    D = D.combine_first(to(O, DOS))
-            else:
-                D.append(process(DOS))
+                    D = D.combine_first(DA)
 
-        # Now we need to parse the data
-        # First reduce the atom
-        atoms = [[o for o in a if o] for a in atoms]
-        atoms = Atoms([Atom(Z, os) for Z, os in zip(atom_species, atoms)])
-        geom = Geometry(arrayd(xyz) * Bohr2Ang, atoms)
-
-        if as_dataarray:
             # Add attributes
             D.attrs['geometry'] = geom
+            D.attrs['atom_index'] = atom_index
+            D.attrs['orbital_index'] = orbital_index
             D.attrs['units'] = '1/eV'
             if Ef is None:
                 D.attrs['Ef'] = 'Unknown'
@@ -185,7 +235,62 @@ class pdosSileSiesta(SileSiesta):
 
             return D
 
-        return geom, E, np.stack(D, axis=0)
+        if nspin == 1:
+            PDOS = PDOS[0]
+        if ret_index:
+            return geom, E, PDOS, atom_index, orbital_index
+        return geom, E, PDOS
+
+
+def _fromstring(text):
+    """ Convert a white-space separated string of floats to an array """
+    return np.fromstring(text, dtype=np.float64, sep=' ')
+
+
+def _pdos_size(norbitals, orbital):
+    """ Number of orbitals to allocate for when no atom or l selection is made """
+    if norbitals is None:
+        raise ValueError('pdosSileSiesta.read_data could not find <norbitals> before the orbitals')
+    if orbital is not None:
+        norbitals = min(norbitals, len([io for io in orbital if 0 <= io < norbitals]))
+    return norbitals
+
+
+def _pdos_count(fh, keep):
+    """ Count the orbitals for which ``keep(ia, io, l)`` is true (only the orbital attributes are used) """
+    context = iterparse(fh, events=('start', ))
+    _, root = next(context)
+    n = 0
+    for _, elem in context:
+        if elem.tag == 'orbital':
+            if keep(int(elem.get('atom_index')) - 1, int(elem.get('index')) - 1, int(elem.get('l'))):
+                n += 1
+            # Previous orbitals (and their data) are not needed
+            root.clear()
+    return n
+
+
+def _orbital_Z(orb):
+    """ Atomic number for the atom of an orbital element """
+    try:
+        return int(orb.get('Z'))
+    except:
+        try:
+            return PeriodicTable().Z(orb.get('species'))
+        except:
+            # Unknown
+            return -1
+
+
+def _process(PDOS, DOS):
+    """ Store `DOS` (nspin, nE) in `PDOS` converting to the sum and spin components for non-colinear spin """
+    if DOS.shape[0] == 4:
+        PDOS[0, :] = DOS[0, :] + DOS[1, :]
+        PDOS[1, :] = DOS[2, :]
+        PDOS[2, :] = DOS[3, :]
+        PDOS[3, :] = DOS[0, :] - DOS[1, :]
+    else:
+        PDOS[:, :] = DOS
 
 
 # PDOS files are:
@@ -439,17 +439,16 @@ class ncSileSiesta(SileCDFSiesta):
         v = self._crt_var(sp, 'n_col', 'i4', ('no_u',))
         v.info = "Number of non-zero elements per row"
         v[:] = H._csr.ncol[:]
-        v = self._crt_var(sp, 'list_col', 'i4', ('nnzs',),
-                          chunksizes=(len(H._csr.col),), **self._cmp_args)
+        v = self._crt_var(sp, 'list_col', 'i4', ('nnzs',), **self._cmp_args)
         v.info = "Supercell column indices in the sparse format"
-        v[:] = H._csr.col[:] + 1  # correct for fortran indices
+        # correct for fortran indices
+        self._write_chunked(v, H._csr.col, offset=1)
         v = self._crt_var(sp, 'isc_off', 'i4', ('n_s', 'xyz'))
         v.info = "Index of supercell coordinates"
         v[:] = H.geom.sc.sc_off[:, :]
 
         # Save tight-binding parameters
-        v = self._crt_var(sp, 'S', 'f8', ('nnzs',),
-                          chunksizes=(len(H._csr.col),), **self._cmp_args)
+        v = self._crt_var(sp, 'S', 'f8', ('nnzs',), **self._cmp_args)
         v.info = "Overlap matrix"
         if H.orthogonal:
             # We need to create the orthogonal pattern
@@ -465,16 +464,15 @@ class ncSileSiesta(SileCDFSiesta):
                                  'not all on-site terms defined. Please correct. '
                                  'I.e. add explicitly *all* on-site terms.')
 
-            v[:] = tmp._D[:, 0]
+            self._write_chunked(v, tmp._D[:, 0])
             del tmp
         else:
-            v[:] = H._csr._D[:, H.S_idx]
-        v = self._crt_var(sp, 'H', 'f8', ('spin', 'nnzs'),
-                          chunksizes=(1, len(H._csr.col)), **self._cmp_args)
+            self._write_chunked(v, H._csr._D[:, H.S_idx])
+        v = self._crt_var(sp, 'H', 'f8', ('spin', 'nnzs'), **self._cmp_args)
         v.info = "Hamiltonian"
         v.unit = "Ry"
         for i in range(len(H.spin)):
-            v[i, :] = H._csr._D[:, i] / Ry2eV
+            self._write_chunked(v, H._csr._D[:, i], key=(i, ), scale=1. / Ry2eV)
 
         # Create the settings
         st = self._crt_grp(self, 'SETTINGS')
@@ -529,17 +527,16 @@ class ncSileSiesta(SileCDFSiesta):
         v = self._crt_var(sp, 'n_col', 'i4', ('no_u',))
         v.info = "Number of non-zero elements per row"
         v[:] = DM._csr.ncol[:]
-        v = self._crt_var(sp, 'list_col', 'i4', ('nnzs',),
-                          chunksizes=(len(DM._csr.col),), **self._cmp_args)
+        v = self._crt_var(sp, 'list_col', 'i4', ('nnzs',), **self._cmp_args)
         v.info = "Supercell column indices in the sparse format"
-        v[:] = DM._csr.col[:] + 1  # correct for fortran indices
+        # correct for fortran indices
+        self._write_chunked(v, DM._csr.col, offset=1)
         v = self._crt_var(sp, 'isc_off', 'i4', ('n_s', 'xyz'))
         v.info = "Index of supercell coordinates"
         v[:] = DM.geom.sc.sc_off[:, :]
 
         # Save tight-binding parameters
-        v = self._crt_var(sp, 'S', 'f8', ('nnzs',),
-                          chunksizes=(len(DM._csr.col),), **self._cmp_args)
+        v = self._crt_var(sp, 'S', 'f8', ('nnzs',), **self._cmp_args)
         v.info = "Overlap matrix"
         if DM.orthogonal:
             # We need to create the orthogonal pattern
@@ -555,15 +552,14 @@ class ncSileSiesta(SileCDFSiesta):
                                  'not all on-site terms defined. Please correct. '
                                  'I.e. add explicitly *all* on-site terms.')
 
-            v[:] = tmp._D[:, 0]
+            self._write_chunked(v, tmp._D[:, 0])
             del tmp
         else:
-            v[:] = DM._csr._D[:, DM.S_idx]
-        v = self._crt_var(sp, 'DM', 'f8', ('spin', 'nnzs'),
-                          chunksizes=(1, len(DM._csr.col)), **self._cmp_args)
+            self._write_chunked(v, DM._csr._D[:, DM.S_idx])
+        v = self._crt_var(sp, 'DM', 'f8', ('spin', 'nnzs'), **self._cmp_args)
         v.info = "Density matrix"
         for i in range(len(DM.spin)):
-            v[i, :] = DM._csr._D[:, i]
+            self._write_chunked(v, DM._csr._D[:, i], key=(i, ))
 
         # Create the settings
         st = self._crt_grp(self, 'SETTINGS')
@@ -618,17 +614,16 @@ class ncSileSiesta(SileCDFSiesta):
         v = self._crt_var(sp, 'n_col', 'i4', ('no_u',))
         v.info = "Number of non-zero elements per row"
         v[:] = EDM._csr.ncol[:]
-        v = self._crt_var(sp, 'list_col', 'i4', ('nnzs',),
-                          chunksizes=(len(EDM._csr.col),), **self._cmp_args)
+        v = self._crt_var(sp, 'list_col', 'i4', ('nnzs',), **self._cmp_args)
         v.info = "Supercell column indices in the sparse format"
-        v[:] = EDM._csr.col[:] + 1  # correct for fortran indices
+        # correct for fortran indices
+        self._write_chunked(v, EDM._csr.col, offset=1)
         v = self._crt_var(sp, 'isc_off', 'i4', ('n_s', 'xyz'))
         v.info = "Index of supercell coordinates"
         v[:] = EDM.geom.sc.sc_off[:, :]
 
         # Save tight-binding parameters
-        v = self._crt_var(sp, 'S', 'f8', ('nnzs',),
-                          chunksizes=(len(EDM._csr.col),), **self._cmp_args)
+        v = self._crt_var(sp, 'S', 'f8', ('nnzs',), **self._cmp_args)
         v.info = "Overlap matrix"
         if EDM.orthogonal:
             # We need to create the orthogonal pattern
@@ -644,16 +639,15 @@ class ncSileSiesta(SileCDFSiesta):
                                  'not all on-site terms defined. Please correct. '
                                  'I.e. add explicitly *all* on-site terms.')
 
-            v[:] = tmp._D[:, 0]
+            self._write_chunked(v, tmp._D[:, 0])
             del tmp
         else:
-            v[:] = EDM._csr._D[:, EDM.S_idx]
-        v = self._crt_var(sp, 'EDM', 'f8', ('spin', 'nnzs'),
-                          chunksizes=(1, len(EDM._csr.col)), **self._cmp_args)
+            self._write_chunked(v, EDM._csr._D[:, EDM.S_idx])
+        v = self._crt_var(sp, 'EDM', 'f8', ('spin', 'nnzs'), **self._cmp_args)
         v.info = "Energy density matrix"
         v.unit = "Ry"
         for i in range(len(EDM.spin)):
-            v[i, :] = EDM._csr._D[:, i] / Ry2eV
+            self._write_chunked(v, EDM._csr._D[:, i], key=(i, ), scale=1. / Ry2eV)
 
         # Create the settings
         st = self._crt_grp(self, 'SETTINGS')
@@ -705,17 +699,16 @@ class ncSileSiesta(SileCDFSiesta):
         v = self._crt_var(sp, 'n_col', 'i4', ('no_u',))
         v.info = "Number of non-zero elements per row"
         v[:] = H._csr.ncol[:]
-        v = self._crt_var(sp, 'list_col', 'i4', ('nnzs',),
-                          chunksizes=(len(H._csr.col),), **self._cmp_args)
+        v = self._crt_var(sp, 'list_col', 'i4', ('nnzs',), **self._cmp_args)
         v.info = "Supercell column indices in the sparse format"
-        v[:] = H._csr.col[:] + 1  # correct for fortran indices
+        # correct for fortran indices
+        self._write_chunked(v, H._csr.col, offset=1)
         v = self._crt_var(sp, 'isc_off', 'i4', ('n_s', 'xyz'))
         v.info = "Index of supercell coordinates"
         v[:] = H.geom.sc.sc_off[:, :]
 
         # Save tight-binding parameters
-        v = self._crt_var(sp, 'S', 'f8', ('nnzs',),
-                          chunksizes=(len(H._csr.col),), **self._cmp_args)
+        v = self._crt_var(sp, 'S', 'f8', ('nnzs',), **self._cmp_args)
         v.info = "Overlap matrix"
         if H.orthogonal:
             # We need to create the orthogonal pattern
@@ -731,15 +724,14 @@ class ncSileSiesta(SileCDFSiesta):
                                  'not all on-site terms defined. Please correct. '
                                  'I.e. add explicitly *all* on-site terms.')
 
-            v[:] = tmp._D[:, 0]
+            self._write_chunked(v, tmp._D[:, 0])
             del tmp
         else:
-            v[:] = H._csr._D[:, H.S_idx]
-        v = self._crt_var(sp, 'H', 'f8', ('spin', 'nnzs'),
-                          chunksizes=(1, len(H._csr.col)), **self._cmp_args)
+            self._write_chunked(v, H._csr._D[:, H.S_idx])
+        v = self._crt_var(sp, 'H', 'f8', ('spin', 'nnzs'), **self._cmp_args)
         v.info = "Hessian"
         v.unit = "Ry**2"
-        v[0, :] = H._csr._D[:, 0] / Ry2eV ** 2
+        self._write_chunked(v, H._csr._D[:, 0], key=(0, ), scale=1. / Ry2eV ** 2)
 
         # Create the settings
         st = self._crt_grp(self, 'SETTINGS')
@@ -135,16 +135,16 @@ class gridncSileSiesta(SileCDFSiesta):
         self._crt_dim(self, 'n2', grid.shape[1])
         self._crt_dim(self, 'n3', grid.shape[2])
 
+        # The grid is chunked (and written) in slabs along the 3rd lattice vector
         if nspin is None:
-            v = self._crt_var(self, 'gridfunc', 'f4', ('n3', 'n2', 'n1'))
+            v = self._crt_var(self, 'gridfunc', 'f4', ('n3', 'n2', 'n1'), **self._cmp_args)
+            key = ()
         else:
-            v = self._crt_var(self, 'gridfunc', 'f4', ('spin', 'n3', 'n2', 'n1'))
+            v = self._crt_var(self, 'gridfunc', 'f4', ('spin', 'n3', 'n2', 'n1'), **self._cmp_args)
+            key = (spin, )
         v.info = 'Grid function'
 
-        if nspin is None:
-            v[:, :, :] = np.swapaxes(grid.grid, 0, 2)
-        else:
-            v[spin, :, :, :] = np.swapaxes(grid.grid, 0, 2)
+        self._write_chunked(v, np.swapaxes(grid.grid, 0, 2), key=key)
 
 
 add_sile('grid.nc', gridncSileSiesta)
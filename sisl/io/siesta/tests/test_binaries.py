@@ -0,0 +1,221 @@
+from __future__ import print_function, division
+
+import pytest
+
+from sisl import Hamiltonian, DensityMatrix, Geometry, Atom
+from sisl.io import get_sile, SileError
+from sisl.io.siesta import *
+from sisl.io.siesta.binaries import found_module
+from sisl.io._fortran import FortranRecords
+from sisl.unit.siesta import unit_convert
+
+import os.path as osp
+import numpy as np
+
+from sisl.io.tests import common as tc
+
+_C = type('Temporary', (object, ), {})
+
+pytestmark = [pytest.mark.io, pytest.mark.siesta]
+
+
+def setup_module(module):
+    tc.setup(module._C)
+
+
+def teardown_module(module):
+    tc.teardown(module._C)
+
+
+def write_records(f, records):
+    """ Write a Fortran unformatted file (4-byte record markers) """
+    with open(f, 'wb') as fh:
+        for r in records:
+            r = np.asarray(r)
+            m = np.array([r.nbytes], np.int32)
+            m.tofile(fh)
+            r.tofile(fh)
+            m.tofile(fh)
+
+
+def test_fortran_records():
+    f = osp.join(_C.d, 'records.bin')
+    n = [2, 0, 3, 1]
+    write_records(f, [np.array([1, 2], np.int32),
+                      np.array([1.5, 2.5, 3.5], np.float64)] +
+                  [np.arange(i, dtype=np.float64) + i for i in n] +
+                  [np.arange(i, dtype=np.int32) for i in n])
+    fr = FortranRecords(f)
+    assert fr.read(np.int32).tolist() == [1, 2]
+    i, d = fr.read((np.float64, 1), (np.float64, 2))
+    assert i == 1.5
+    assert np.allclose(d, [2.5, 3.5])
+    assert np.allclose(fr.read_rows(np.float64, n), np.concatenate([np.arange(i) + i for i in n]))
+    assert np.all(fr.read_rows(np.int32, n) == np.concatenate([np.arange(i) for i in n]))
+
+
+@pytest.mark.parametrize("dtype", [np.int8, np.int16, np.complex128])
+def test_fortran_records_itemsize(dtype):
+    # Record markers are not aligned for these element sizes
+    f = osp.join(_C.d, 'records.bin')
+    n = [3, 1, 0, 2]
+    write_records(f, [np.arange(i, dtype=dtype) + i for i in n])
+    fr = FortranRecords(f)
+    assert np.all(fr.read_rows(dtype, n) == np.concatenate([np.arange(i) + i for i in n]))
+
+
+def test_fortran_records_chunk():
+    f = osp.join(_C.d, 'records.bin')
+    n = np.random.randint(0, 10, 100)
+    write_records(f, [np.arange(i, dtype=np.float64) + i for i in n])
+    fr = FortranRecords(f)
+    fr.chunk = 7
+    out = np.zeros([n.sum(), 2])
+    fr.read_rows(np.float64, n, out=out[:, 1])
+    assert np.allclose(out[:, 0], 0.)
+    assert np.allclose(out[:, 1], np.concatenate([np.arange(i) + i for i in n]))
+
+
+def test_fortran_records_marker():
+    f = osp.join(_C.d, 'records.bin')
+    write_records(f, [np.arange(3, dtype=np.int32)])
+    with pytest.raises(SileError):
+        FortranRecords(f).read_rows(np.int32, [2])
+
+
+@pytest.mark.skipif(not found_module, reason="writing requires the Fortran module")
+def test_tshs_rw():
+    f = osp.join(_C.d, 'gr.TSHS')
+    tb = Hamiltonian(_C.gtb, orthogonal=False)
+    tb.construct([_C.R, _C.tS])
+    tb.write(TSHSSileSiesta(f))
+
+    ntb = TSHSSileSiesta(f).read_hamiltonian()
+    assert np.allclose(tb.cell, ntb.cell)
+    assert np.allclose(tb.xyz, ntb.xyz)
+    assert np.all(tb.geom.sc.sc_off == ntb.geom.sc.sc_off)
+    assert tb.spsame(ntb)
+    assert np.allclose(tb.tocsr(0).toarray(), ntb.tocsr(0).toarray())
+    assert np.allclose(tb.tocsr(1).toarray(), ntb.tocsr(1).toarray())
+    S = TSHSSileSiesta(f).read_overlap()
+    assert np.allclose(tb.tocsr(1).toarray(), S.tocsr(0).toarray())
+
+
+@pytest.mark.skipif(not found_module, reason="writing requires the Fortran module")
+def test_tshs_spin():
+    f = osp.join(_C.d, 'gr_pol.TSHS')
+    tb = Hamiltonian(_C.gtb, 2, orthogonal=False)
+    tb.construct([_C.R, [(0.1, -0.1, 1.), (-2.7, -2.6, 0.1)]])
+    tb.write(TSHSSileSiesta(f))
+
+    ntb = TSHSSileSiesta(f).read_hamiltonian(spin=1)
+    assert len(ntb.spin) == 1
+    assert np.allclose(tb.tocsr(1).toarray(), ntb.tocsr(0).toarray())
+    assert np.allclose(tb.tocsr(2).toarray(), ntb.tocsr(1).toarray())
+    with pytest.raises(ValueError):
+        TSHSSileSiesta(f).read_hamiltonian(spin=2)
+    # Subsets which are not a spin configuration
+    with pytest.raises(ValueError):
+        TSHSSileSiesta(f).read_hamiltonian(spin=[1, 0])
+    with pytest.raises(ValueError):
+        TSHSSileSiesta(f).read_hamiltonian(spin=[1, 1])
+
+
+@pytest.mark.skipif(not found_module, reason="writing requires the Fortran module")
+def test_dm_rw():
+    f = osp.join(_C.d, 'gr.DM')
+    DM = DensityMatrix(_C.gtb)
+    DM.construct([_C.R, [1., 0.1]])
+    DM.write(DMSileSiesta(f))
+
+    nDM = DMSileSiesta(f).read_density_matrix(geom=_C.gtb)
+    assert DM.spsame(nDM)
+    assert np.allclose(DM.tocsr(0).toarray(), nDM.tocsr(0).toarray())
+
+
+@pytest.mark.skipif(not found_module, reason="writing requires the Fortran module")
+def test_hsx_rw():
+    from sisl.io.siesta import _siesta
+    f = osp.join(_C.d, 'gr.HSX')
+    tb = Hamiltonian(_C.gtb, 2, orthogonal=False)
+    tb.construct([_C.R, [(0.1, -0.1, 1.), (-2.7, -2.6, 0.1)]])
+    tb.finalize()
+    csr = tb._csr
+    Ry2eV = unit_convert('Ry', 'eV')
+    _siesta.write_hsx(f, False, tb.no_s, csr.ncol, csr.ptr[:-1], csr.col + 1,
+                      csr._D[:, :2] / Ry2eV, csr._D[:, 2], np.zeros([3, tb.nnz]), 0., 0.)
+
+    ntb = HSXSileSiesta(f).read_hamiltonian(geom=tb.geom)
+    assert len(ntb.spin) == 2
+    assert tb.spsame(ntb)
+    for i in range(3):
+        assert np.allclose(tb.tocsr(i).toarray(), ntb.tocsr(i).toarray(), atol=1e-6)
+    ntb = HSXSileSiesta(f).read_hamiltonian(geom=tb.geom, spin=1)
+    assert len(ntb.spin) == 1
+    assert np.allclose(tb.tocsr(1).toarray(), ntb.tocsr(0).toarray(), atol=1e-6)
+    assert np.allclose(tb.tocsr(2).toarray(), ntb.tocsr(1).toarray())
+
+
+def test_tsde_read():
+    f = osp.join(_C.d, 'gr.TSDE')
+    ncol = np.array([2, 1], np.int32)
+    col = [np.array([1, 2], np.int32), np.array([4], np.int32)]
+    DM = [np.array([1., 0.5]), np.array([2.])]
+    EDM = [np.array([-1., -0.5]), np.array([-2.])]
+    write_records(f, [np.array([2, 1], np.int32), ncol] + col + DM + EDM)
+
+    geom = Geometry([[0] * 3, [1, 0, 0]], Atom(1), sc=[2, 10, 10])
+    geom.set_nsc([3, 1, 1])
+    EDM = TSDESileSiesta(f).read_energy_density_matrix(geom=geom)
+    assert np.allclose(EDM.tocsr(0).data, np.array([-1., -0.5, -2.]) * unit_convert('Ry', 'eV'))
+    DM = TSDESileSiesta(f).read_density_matrix(geom=geom)
+    assert np.allclose(DM.tocsr(0).data, [1., 0.5, 2.])
+    assert np.all(DM.tocsr(0).indices == [0, 1, 3])
+
+
+def test_grid_read():
+    f = osp.join(_C.d, 'gr.VT')
+    grid = np.random.rand(2, 3, 4).astype(np.float32)
+    cell = np.diag([1., 2., 3.])
+    write_records(f, [cell, np.array([2, 3, 4, 2], np.int32)] +
+                  [grid[:, iy, iz] for iz in range(4) for iy in range(3)] +
+                  [grid[:, iy, iz] * 2 for iz in range(4) for iy in range(3)])
+
+    sile = get_sile(f)
+    g = sile.read_grid()
+    assert g.shape == (2, 3, 4)
+    assert np.allclose(g.cell, cell * unit_convert('Bohr', 'Ang'))
+    assert np.allclose(g.grid, grid * sile.grid_unit)
+    g = sile.read_grid([0.5, 0.5])
+    assert np.allclose(g.grid, grid * 1.5 * sile.grid_unit)
+
+
+@pytest.mark.skipif(not found_module, reason="writing requires the Fortran module")
+def test_tsgf_write_self_energies():
+    from sisl import RecursiveSI, MonkhorstPack
+    H = Hamiltonian(_C.gtb, orthogonal=False)
+    H.construct([_C.R, _C.tS])
+    SE = RecursiveSI(H, '-A', eta=1e-3)
+    bz = MonkhorstPack(H, [1, 3, 1])
+    E = np.linspace(-1, 1, 4)
+
+    # Serial writing of the records
+    f = osp.join(_C.d, 'serial.TSGF')
+    gf = TSGFSileSiesta(f)
+    gf.write_header(E + 1j * SE.eta, bz, SE.spgeom0)
+    for first, k, e in gf:
+        if first:
+            gf.write_hamiltonian(SE.spgeom0.Pk(k, format='array'), SE.spgeom0.Sk(k, format='array'))
+        gf.write_self_energy(SE.self_energy(e.real, k, eta=e.imag, bulk=True))
+    with open(f, 'rb') as fh:
+        serial = fh.read()
+
+    # Chunks of energies (also partial chunks) re-use the k-point matrices
+    def fail(*args, **kwargs):
+        raise AssertionError('self_energies should be used')
+    SE.self_energy = fail
+    for threads, chunk in [(1, 16), (3, 16), (2, 3), (1, 1)]:
+        f = osp.join(_C.d, 'pipeline.TSGF')
+        TSGFSileSiesta(f).write_self_energies(SE, E, bz, threads=threads, chunk=chunk)
+        with open(f, 'rb') as fh:
+            assert serial == fh.read()
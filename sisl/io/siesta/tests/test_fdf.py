@@ -232,6 +232,32 @@ def test_include():
     assert fdf.get('Hello') == [l.replace('\n', '').strip() for l in ll]
 
 
+def test_index_update():
+    f = d('index.fdf')
+    with open(f, 'w') as fh:
+        fh.write('Flag1 date\n')
+        fh.write('%block Hello\n')
+        fh.write(' line 1\n')
+        fh.write('%endblock Hello\n')
+
+    fdf = fdfSileSiesta(f)
+    assert fdf.get('Flag1') == 'date'
+    hello = fdf.get('Hello')
+    assert hello == ['line 1']
+    # Changing the returned block may not change the file content
+    hello.append('line 2')
+    assert fdf.get('Hello') == ['line 1']
+
+    # Setting a value re-creates the index
+    fdf.set('Flag1', 'date2')
+    assert fdf.get('Flag1') == 'date2'
+
+    # Changing the file re-creates the index
+    with open(f, 'a') as fh:
+        fh.write('Flag2 date3\n')
+    assert fdf.get('Flag2') == 'date3'
+
+
 def test_xv_preference():
     g = geom.graphene()
     g.write(d('file.fdf'))
@@ -0,0 +1,112 @@
+from __future__ import print_function, division
+
+import pytest
+
+from sisl.io.siesta import *
+
+import sys
+import os.path as osp
+import numpy as np
+
+from sisl.io.tests import common as tc
+
+_C = type('Temporary', (object, ), {})
+
+pytestmark = [pytest.mark.io, pytest.mark.siesta]
+
+
+def setup_module(module):
+    tc.setup(module._C)
+
+
+def teardown_module(module):
+    tc.teardown(module._C)
+
+
+def write_pdos(f, nspin):
+    """ Write a PDOS file with 2 atoms (C: s + 2 p, H: s + p) and return the data """
+    E = np.linspace(-2, 2, 5)
+    orbs = [(1, 'C', 2, 0, 0), (1, 'C', 2, 1, -1), (1, 'C', 2, 1, 0),
+            (2, 'H', 1, 0, 0), (2, 'H', 2, 1, 1)]
+    data = np.random.rand(len(orbs), len(E), nspin)
+    with open(f, 'w') as fh:
+        fh.write('<pdos>\n<nspin>{}</nspin>\n<norbitals>{}</norbitals>\n'.format(nspin, len(orbs)))
+        fh.write('<energy_values units="eV">\n{}\n</energy_values>\n'.format('\n'.join(map(str, E))))
+        fh.write('<fermi_energy units="eV"> 0.5 </fermi_energy>\n')
+        for i, (ia, sp, n, l, m) in enumerate(orbs):
+            fh.write(('<orbital index="{}" atom_index="{}" species="{}" position="{} 0.0 0.0" '
+                      'n="{}" l="{}" m="{}" z="1" P="false">\n').format(i + 1, ia, sp, ia, n, l, m))
+            fh.write('<data>\n{}\n</data>\n</orbital>\n'.format('\n'.join([' '.join(map(repr, d)) for d in data[i]])))
+        fh.write('</pdos>\n')
+    return E - 0.5, data
+
+
+@pytest.mark.parametrize("nspin", [1, 2, 4])
+def test_pdos(nspin):
+    f = osp.join(_C.d, 'siesta{}.PDOS'.format(nspin))
+    E, data = write_pdos(f, nspin)
+
+    geom, e, PDOS = pdosSileSiesta(f).read_data()
+    assert geom.na == 2
+    assert geom.no == 5
+    assert geom.atom[0].Z == 6
+    assert geom.atom[1].no == 2
+    assert np.allclose(e, E)
+    if nspin == 1:
+        assert np.allclose(PDOS, data[:, :, 0])
+    elif nspin == 2:
+        assert np.allclose(PDOS, np.transpose(data, (2, 0, 1)))
+    else:
+        assert PDOS.shape == (4, 5, 5)
+        assert np.allclose(PDOS[0], data[:, :, 0] + data[:, :, 1])
+        assert np.allclose(PDOS[3], data[:, :, 0] - data[:, :, 1])
+
+
+def test_pdos_select():
+    f = osp.join(_C.d, 'select.PDOS')
+    E, data = write_pdos(f, 2)
+    sile = pdosSileSiesta(f)
+
+    geom, _, PDOS = sile.read_data(atom=1)
+    assert geom.na == 1
+    assert geom.atom[0].Z == 1
+    assert np.allclose(PDOS, np.transpose(data[3:], (2, 0, 1)))
+
+    geom, _, PDOS = sile.read_data(l=1)
+    assert geom.na == 2
+    assert geom.no == 3
+    assert np.allclose(PDOS, np.transpose(data[[1, 2, 4]], (2, 0, 1)))
+
+    geom, _, PDOS = sile.read_data(atom=0, orbital=[0, 2, 4])
+    assert geom.no == 2
+    assert np.allclose(PDOS, np.transpose(data[[0, 2]], (2, 0, 1)))
+
+    # Map the returned atoms and orbitals back to the file
+    geom, _, PDOS, ia, io = sile.read_data(l=1, ret_index=True)
+    assert np.all(ia == [0, 1])
+    assert np.all(io == [1, 2, 4])
+    assert PDOS.flags.c_contiguous
+    geom, _, PDOS, ia, io = sile.read_data(orbital=[4, 3, 10], ret_index=True)
+    assert np.all(ia == [1])
+    assert np.all(io == [3, 4])
+    assert np.allclose(PDOS, np.transpose(data[[3, 4]], (2, 0, 1)))
+
+
+def test_pdos_cache(monkeypatch):
+    f = osp.join(_C.d, 'cache.PDOS')
+    E, data = write_pdos(f, 2)
+    sile = pdosSileSiesta(f)
+    sile.cache = True
+    geom, e, PDOS = sile.read_data(l=1)
+
+    # Subsequent reads are served from the cache
+    def fail(*args, **kwargs):
+        raise AssertionError('file should not be parsed')
+    monkeypatch.setattr(sys.modules[pdosSileSiesta.__module__], 'iterparse', fail)
+    cgeom, ce, cPDOS = sile.read_data(l=1)
+    assert cgeom == geom
+    assert cgeom.atom[1].orbital[0] == geom.atom[1].orbital[0]
+    assert np.allclose(ce, e)
+    assert np.allclose(cPDOS, PDOS)
+    with pytest.raises(AssertionError):
+        sile.read_data(l=0)
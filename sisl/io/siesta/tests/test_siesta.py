@@ -51,3 +51,50 @@ def test_nc2():
     assert np.allclose(tb.xyz, ntb.xyz)
     assert np.allclose(tb._csr._D, ntb._csr._D)
     assert _C.g.atom.equal(ntb.atom, R=False)
+
+
+def test_nc_chunk():
+    f = osp.join(_C.d, 'grS_chunk.nc')
+    tb = Hamiltonian(_C.gtb, orthogonal=False)
+    tb.construct([_C.R, _C.tS])
+    # Very small chunks forces writing the sparse elements in blocks
+    tb.write(ncSileSiesta(f, 'w', lvl=1, chunk=64))
+
+    with ncSileSiesta(f) as sile:
+        assert sile._variable('H', tree='SPARSE').chunking() == [1, 8]
+    ntb = ncSileSiesta(f).read_hamiltonian()
+    assert tb.spsame(ntb)
+    assert np.allclose(tb._csr._D, ntb._csr._D)
+
+
+def test_grid_nc():
+    from sisl import Grid
+    f = osp.join(_C.d, 'grid.nc')
+    g = Grid([4, 5, 6], sc=_C.g.sc)
+    g.grid = np.random.rand(*g.shape)
+    g.write(gridncSileSiesta(f, 'w', chunk=64))
+
+    ng = gridncSileSiesta(f).read_grid()
+    assert np.allclose(g.grid, ng.grid, atol=1e-6)
+
+
+def test_bands_cache(monkeypatch):
+    f = osp.join(_C.d, 'cache.bands')
+    with open(f, 'w') as fh:
+        fh.write('0.5\n0. 1.\n-1. 1.\n2 1 3\n')
+        for ik in range(3):
+            fh.write('{0}. {0}. {1}.\n'.format(ik, ik + 1))
+        fh.write("2\n0. 'Gamma'\n2. 'X'\n")
+    sile = bandsSileSiesta(f)
+    sile.cache = True
+    (xlabels, labels), k, b = sile.read_data()
+    assert labels == ['Gamma', 'X']
+
+    def fail(*args, **kwargs):
+        raise AssertionError('file should not be parsed')
+    monkeypatch.setattr(bandsSileSiesta, 'readline', fail)
+    (cxlabels, clabels), ck, cb = sile.read_data()
+    assert cxlabels == xlabels
+    assert clabels == labels
+    assert np.allclose(ck, k)
+    assert np.allclose(cb, b)
@@ -61,13 +61,13 @@ class TSVncSileSiesta(SileCDFSiesta):
         vmax.info = 'Maximum value in the Poisson solution (for TranSiesta interpolation)'
         vmax.unit = 'Ry'
 
-        v = self._crt_var(self, 'V', grid.dtype, ('c', 'b', 'a'))
+        v = self._crt_var(self, 'V', grid.dtype, ('c', 'b', 'a'), **self._cmp_args)
         v.info = 'Poisson solution with custom boundary conditions'
         v.unit = 'Ry'
 
         vmin[:] = grid.grid.min() * eV2Ry
         vmax[:] = grid.grid.max() * eV2Ry
-        v[:, :, :] = np.swapaxes(grid.grid, 0, 2) * eV2Ry
+        self._write_chunked(v, np.swapaxes(grid.grid, 0, 2), scale=eV2Ry)
 
 
 add_sile('TSV.nc', TSVncSileSiesta)
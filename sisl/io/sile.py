@@ -1,11 +1,16 @@
 from __future__ import print_function, division
 
 from functools import wraps
-from os.path import split, splitext, isfile
+from numbers import Real
+from os.path import split, splitext, isfile, join
+import os
 import gzip
+import hashlib
+import json
 
 import numpy as np
 
+from sisl._help import _str
 from sisl.messages import SislWarning, SislInfo
 from sisl.utils.misc import str_spec
 from ._help import *
@@ -32,6 +37,7 @@ __all__ += [
 __all__ += [
     'isfile',
     'Sile_fh_open',
+    'sile_cache',
     'sile_raise_write',
     'sile_raise_read']
 
@@ -460,24 +466,216 @@ class BaseSile(object):
 def Sile_fh_open(func):
     """ Method decorator for objects to directly implement opening of the
     file-handle upon entry (if it isn't already).
+
+    If the sile has caching enabled (see `Sile.cache`) the returned values
+    of ``read_*`` methods are cached.
     """
     @wraps(func)
     def pre_open(self, *args, **kwargs):
         if hasattr(self, "fh"):
             return func(self, *args, **kwargs)
-        else:
+
+        def call():
             with self:
                 return func(self, *args, **kwargs)
+
+        if func.__name__.startswith('read_') and getattr(self, 'cache', False) is True:
+            return _sile_cache_call(self, func.__name__, args, kwargs, call)
+        return call()
     return pre_open
 
 
+def sile_cache(func):
+    """ Method decorator for caching the returned values of ``read_*`` methods not using `Sile_fh_open`
+
+    The values are only cached if the sile has caching enabled (see `Sile.cache`).
+    """
+    @wraps(func)
+    def cached(self, *args, **kwargs):
+        if hasattr(self, "fh") or getattr(self, 'cache', False) is not True:
+            return func(self, *args, **kwargs)
+
+        def call():
+            return func(self, *args, **kwargs)
+        return _sile_cache_call(self, func.__name__, args, kwargs, call)
+    return cached
+
+
+def _sile_cache_arg(arg):
+    """ Whether `arg` is a simple argument with a unique representation """
+    if arg is None or isinstance(arg, (bool, Real, _str)):
+        return True
+    if isinstance(arg, (tuple, list)):
+        return all(map(_sile_cache_arg, arg))
+    if isinstance(arg, dict):
+        return all(map(_sile_cache_arg, arg.keys())) and all(map(_sile_cache_arg, arg.values()))
+    return False
+
+
+def _sile_cache_call(sile, name, args, kwargs, call):
+    """ Return the cached result of ``call()``, or call and store the result in the cache
+
+    The cache file is stored next to the sile file as ``.<file>.<name>-<hash>.npz`` where
+    the hash is calculated from the sile class, the method name and arguments.
+    The cache is only used if the size and modification time of the sile file
+    is the same as when the cache was created.
+
+    The result is stored (compressed) as plain arrays and a JSON description of the
+    layout, see `_sile_cache_pack`. Results that can not be stored this way are not cached.
+    The cache is loaded without allowing pickled data, hence a tampered cache file can not
+    execute code.
+    """
+    if not (_sile_cache_arg(args) and _sile_cache_arg(kwargs)):
+        # We can not create a unique key
+        return call()
+
+    st = os.stat(sile.file)
+    key = np.array([st.st_size, st.st_mtime], np.float64)
+    d, f = split(sile.file)
+    h = hashlib.sha1(repr((sile.__class__.__name__, f, name,
+                           args, sorted(kwargs.items()))).encode('utf-8')).hexdigest()
+    cache_file = join(d, '.{}.{}-{}.npz'.format(f, name, h[:16]))
+
+    if isfile(cache_file):
+        try:
+            with np.load(cache_file, allow_pickle=False) as c:
+                if np.all(c['key'] == key):
+                    return _sile_cache_unpack(json.loads(str(c['layout'])), c)
+        except Exception:
+            # A corrupt cache file is simply re-created
+            pass
+
+    ret = call()
+
+    data = {'key': key}
+    try:
+        data['layout'] = np.array(json.dumps(_sile_cache_pack(ret, data)))
+    except (ValueError, TypeError):
+        # Values that can not be stored without pickling
+        return ret
+
+    try:
+        with open(cache_file, 'wb') as fh:
+            np.savez_compressed(fh, **data)
+    except Exception:
+        # Allowed to fail (read-only directories)
+        try:
+            os.remove(cache_file)
+        except OSError:
+            pass
+
+    return ret
+
+
+def _sile_cache_pack(value, data):
+    """ Return a JSON serializable layout of `value` while storing its arrays in `data`
+
+    Arrays (and NumPy scalars) are stored in `data` and referenced by their key,
+    tuples and lists are stored recursively and simple Python values are stored in
+    the layout. Geometries are stored as cell, coordinates and species arrays with
+    the unique atoms (and their orbitals) in the layout.
+
+    Raises
+    ------
+    ValueError : if `value` can not be stored without pickling
+    """
+    from sisl.geometry import Geometry
+
+    def array(v):
+        v = np.asarray(v)
+        if v.dtype.hasobject:
+            raise ValueError('object arrays can not be cached')
+        k = 'a{}'.format(len(data))
+        data[k] = v
+        return k
+
+    if isinstance(value, (np.ndarray, np.generic)):
+        return {'type': 'array', 'key': array(value), 'scalar': isinstance(value, np.generic)}
+    elif isinstance(value, (tuple, list)):
+        return {'type': type(value).__name__,
+                'values': [_sile_cache_pack(v, data) for v in value]}
+    elif value is None or isinstance(value, (bool, int, float, _str)):
+        return {'type': 'value', 'value': value}
+    elif isinstance(value, Geometry):
+        return {'type': 'geometry',
+                'cell': array(value.cell),
+                'nsc': value.nsc.tolist(),
+                'xyz': array(value.xyz),
+                'specie': array(value.atom.specie),
+                'atom': [_sile_cache_pack_atom(atom) for atom in value.atom.atom]}
+    raise ValueError('{} can not be cached'.format(type(value).__name__))
+
+
+def _sile_cache_pack_atom(atom):
+    """ JSON serializable layout of an `Atom` (only orbitals without radial functions) """
+    from sisl.orbital import Orbital, AtomicOrbital
+    orbs = []
+    for o in atom.orbital:
+        if type(o) is Orbital:
+            orbs.append({'R': o.R, 'q0': o.q0, 'tag': o.tag})
+        elif type(o) is AtomicOrbital and type(o.orb) is Orbital:
+            orbs.append({'R': o.R, 'q0': o.q0, 'tag': o.tag,
+                         'n': o.n, 'l': o.l, 'm': o.m, 'Z': o.Z, 'P': o.P})
+        else:
+            raise ValueError('orbitals with radial functions can not be cached')
+    return {'Z': int(atom.Z), 'mass': float(atom.mass), 'tag': atom.tag, 'orbital': orbs}
+
+
+def _sile_cache_unpack(layout, data):
+    """ Re-create the value stored with `_sile_cache_pack` """
+    t = layout['type']
+    if t == 'array':
+        v = data[layout['key']]
+        if layout['scalar']:
+            return v[()]
+        return v
+    elif t == 'tuple':
+        return tuple(_sile_cache_unpack(v, data) for v in layout['values'])
+    elif t == 'list':
+        return [_sile_cache_unpack(v, data) for v in layout['values']]
+    elif t == 'value':
+        return layout['value']
+    elif t == 'geometry':
+        from sisl.atom import Atom, Atoms
+        from sisl.orbital import Orbital, AtomicOrbital
+        from sisl.supercell import SuperCell
+        from sisl.geometry import Geometry
+
+        def orbital(o):
+            if 'n' in o:
+                return AtomicOrbital(n=o['n'], l=o['l'], m=o['m'], Z=o['Z'], P=o['P'],
+                                     q0=o['q0'], tag=o['tag'], spherical=Orbital(o['R']))
+            return Orbital(o['R'], o['q0'], o['tag'])
+        atom = [Atom(a['Z'], [orbital(o) for o in a['orbital']], mass=a['mass'], tag=a['tag'])
+                for a in layout['atom']]
+        atoms = Atoms([atom[s] for s in data[layout['specie']]])
+        return Geometry(data[layout['xyz']], atoms,
+                        sc=SuperCell(data[layout['cell']], nsc=layout['nsc']))
+    raise ValueError('unknown cached value type: {}'.format(t))
+
+
 class Sile(BaseSile):
     """ Base class for ASCII files
 
     All ASCII files that needs to be added to the global lookup table can
     with benefit inherit this class.
+
+    Attributes
+    ----------
+    cache : bool
+       whether the returned values of the ``read_*`` methods are cached in a binary
+       file next to the file (``.<file>.<method>-<hash>.npz``).
+       Subsequent reads (with the same arguments) returns the cached values as long
+       as the file has not changed. Arrays, geometries and (nested) tuples/lists of
+       these are cached (nothing is pickled), other return values are always read
+       from the file.
+       Set ``Sile.cache = True`` to enable caching for all siles, or
+       ``sile.cache = True`` for a single sile.
     """
 
+    #: Whether the returned values of ``read_*`` methods are cached
+    cache = False
+
     def __init__(self, filename, mode='r', comment='#'):
         self._file = filename
         self._mode = mode
@@ -668,19 +866,26 @@ class SileCDF(BaseSile):
     If `mode` is in read-mode (r) the compression level
     is ignored.
 
-    The final `access` parameter sets how the file should be
+    The `access` parameter sets how the file should be
     open and subsequently accessed.
 
     0) means direct file access for every variable read
     1) means stores certain variables in the object.
+
+    Large variables are stored in chunks of approximately `chunk` bytes
+    (the fastest varying dimensions are kept whole, i.e. rows of sparse
+    matrices and planes of grids), and are written chunk by chunk.
+    If `shuffle` is true, the shuffle filter is used for compressed variables.
     """
 
-    def __init__(self, filename, mode='r', lvl=0, access=1, _open=True):
+    def __init__(self, filename, mode='r', lvl=0, access=1, _open=True, shuffle=True, chunk=2 ** 22):
         self._file = filename
         # Open mode
         self._mode = mode
         # Save compression internally
         self._lvl = lvl
+        self._shuffle = shuffle
+        self._chunk = chunk
         # Initialize the _data dictionary for access == 1
         self._data = dict()
         if self.exist():
@@ -716,9 +921,13 @@ class SileCDF(BaseSile):
     def _cmp_args(self):
         """ Returns the compression arguments for the NetCDF file
 
-        >>> nc.createVariable(..., **self._cmp_args) # doctest: +SKIP
+        The returned arguments also contain the requested chunk size (bytes) which
+        is used in `_crt_var` to determine the chunk shape.
+
+        >>> self._crt_var(nc, ..., **self._cmp_args) # doctest: +SKIP
         """
-        return {'zlib': self._lvl > 0, 'complevel': self._lvl}
+        return {'zlib': self._lvl > 0, 'complevel': self._lvl,
+                'shuffle': self._shuffle, 'chunk': self._chunk}
 
     def __enter__(self):
         """ Opens the output file and returns it self """
@@ -808,18 +1017,99 @@ class SileCDF(BaseSile):
 
     @staticmethod
     def _crt_var(n, name, *args, **kwargs):
+        """ Create (or return an existing) variable
+
+        All arguments are passed to ``createVariable``, except:
+
+        Parameters
+        ----------
+        attr : dict, optional
+           attributes set on the variable
+        chunk : int, optional
+           if ``chunksizes`` is not passed, the chunk shape is determined
+           such that each chunk has approximately `chunk` bytes, see `_chunk_shape`
+        """
         if name in n.variables:
             return n.variables[name]
 
-        attr = None
-        if 'attr' in kwargs:
-            attr = kwargs.pop('attr')
+        attr = kwargs.pop('attr', None)
+        chunk = kwargs.pop('chunk', None)
+        if chunk is not None and kwargs.get('chunksizes', None) is None:
+            dtype = kwargs.get('datatype', args[0] if len(args) > 0 else None)
+            dims = kwargs.get('dimensions', args[1] if len(args) > 1 else ())
+            if len(dims) > 0:
+                kwargs['chunksizes'] = SileCDF._chunk_shape(n, dims, dtype, chunk)
         v = n.createVariable(name, *args, **kwargs)
         if attr is not None:
             for name in attr:
                 setattr(v, name, attr[name])
         return v
 
+    @staticmethod
+    def _chunk_shape(n, dims, dtype, chunk):
+        """ Chunk shape for a variable with dimensions `dims` and approximately `chunk` bytes per chunk
+
+        The dimensions are filled from the last (fastest) dimension.
+        Unlimited dimensions have a chunk size of 1.
+        """
+        def dim(name):
+            g = n
+            while g is not None:
+                if name in g.dimensions:
+                    return g.dimensions[name]
+                g = g.parent
+            raise ValueError("Dimension {} not found".format(name))
+
+        shape = [1] * len(dims)
+        size = np.dtype(dtype).itemsize
+        for i in range(len(dims) - 1, -1, -1):
+            d = dim(dims[i])
+            if d.isunlimited():
+                break
+            l = max(len(d), 1)
+            if size * l > chunk:
+                shape[i] = max(chunk // size, 1)
+                break
+            shape[i] = l
+            size *= l
+        return shape
+
+    @staticmethod
+    def _write_chunked(v, data, key=(), scale=None, offset=None):
+        """ Write `data` to ``v[key]`` in blocks matching the chunks of `v`
+
+        The blocks are taken along the first dimension of `data`, this limits the
+        memory usage to a block (in case the data has to be copied, scaled or shifted).
+
+        Parameters
+        ----------
+        v : netCDF4.Variable
+           the variable to write to
+        data : numpy.ndarray
+           the data written, the shape must match ``v[key]``
+        key : tuple of int, optional
+           the leading (fixed) indices of the variable
+        scale : float, optional
+           scale the data by this factor before writing
+        offset : float, optional
+           add this value to the (scaled) data before writing
+        """
+        key = tuple(key)
+        n = data.shape[0]
+        chunks = v.chunking()
+        if chunks == 'contiguous' or chunks is None:
+            step = n
+        else:
+            step = chunks[len(key)]
+        step = max(step, 1)
+        for i in range(0, n, step):
+            d = data[i:i+step]
+            if scale is not None:
+                d = d * scale
+            if offset is not None:
+                d = d + offset
+            v[key + (slice(i, i+len(d)), )] = d
+
     @classmethod
     def isDimension(cls, obj):
         """ Return true if ``obj`` is an instance of the NetCDF4 ``Dimension`` type
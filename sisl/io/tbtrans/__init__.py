@@ -53,6 +53,13 @@ Support files to complement TBtrans
   :math:`\delta H` and :math:`\delta\Sigma`)
 
 
+Batch processing
+----------------
+
+- `tbt_batch` extracts the same quantities from many TBtrans output files
+  (e.g. bias or gate sweeps) using a pool of processes
+
+
 PHtrans
 -------
 
@@ -71,5 +78,6 @@ from .delta import *
 from .se import *
 from .tbt import *
 from .tbtproj import *
+from .batch import *
 
 __all__ = [s for s in dir() if not s.startswith('_')]
@@ -1,6 +1,8 @@
 from __future__ import print_function, division
 
 from numbers import Integral
+from collections import OrderedDict
+import hashlib
 
 import numpy as np
 from numpy import in1d
@@ -8,6 +10,7 @@ from numpy import in1d
 # Import sile objects
 from ..sile import SileWarning, SileInfo
 from .sile import SileCDFTBtrans
+from ._index import PointIndex
 from sisl.messages import warn
 from sisl.utils import *
 import sisl._array as _a
@@ -25,6 +28,21 @@ Ry2eV = unit_convert('Ry', 'eV')
 Ry2K = unit_convert('Ry', 'K')
 eV2Ry = unit_convert('eV', 'Ry')
 
+# Cache of geometries read from TBtrans files.
+# Bias/gate sweeps typically consist of many files with the same
+# device, hence re-using the geometry saves the (costly) creation
+# of the atomic list.
+_geometry_cache = OrderedDict()
+_geometry_cache_size = 16
+
+
+def _geometry_key(sc, xyz, nos):
+    """ Unique key for a geometry stored in a TBtrans file """
+    h = hashlib.sha1()
+    for a in [sc.cell, sc.nsc, sc.sc_off, xyz, nos]:
+        h.update(np.ascontiguousarray(a).tobytes())
+    return h.hexdigest()
+
 
 class _ncSileTBtrans(SileCDFTBtrans):
     r""" Common TBtrans NetCDF file object due to a lot of the files having common entries
@@ -104,16 +122,25 @@ class _ncSileTBtrans(SileCDFTBtrans):
                 if atms[i].no != nos[i]:
                     atms[i] = Atom(atms[i].Z, [-1] *nos[i], tag=atms[i].tag)
 
-        else:
+            # Create and return geometry object
+            return Geometry(xyz, atms, sc=sc)
+
+        key = _geometry_key(sc, xyz, nos)
+        # Least recently used geometries are removed from the cache
+        geom = _geometry_cache.pop(key, None)
+        if geom is None:
             # Default to Hydrogen atom with nos[ia] orbitals
             # This may be counterintuitive but there is no storage of the
             # actual species
             atms = [Atom('H', [-1] * o) for o in nos]
 
-        # Create and return geometry object
-        geom = Geometry(xyz, atms, sc=sc)
+            if len(_geometry_cache) >= _geometry_cache_size:
+                _geometry_cache.popitem(last=False)
+            geom = Geometry(xyz, atms, sc=sc)
+        _geometry_cache[key] = geom
 
-        return geom
+        # Return a copy to not share the geometry among files
+        return geom.copy()
 
     def write_geometry(self, *args, **kwargs):
         """ This is not meant to be used """
@@ -199,8 +226,10 @@ class _ncSileTBtrans(SileCDFTBtrans):
         elif isinstance(E, _str):
             # This will always be converted to a float
             E = float(E)
-        idxE = np.abs(self.E - E).argmin()
-        ret_E = self.E[idxE]
+        if '_E_index' not in self._data:
+            self._data['_E_index'] = PointIndex(self.E)
+        idxE = self._data['_E_index'].nearest(E)
+        ret_E = self._data['_E_index'][idxE][0]
         if abs(ret_E - E) > 5e-3:
             warn(SileWarning(self.__class__.__name__ + " requesting energy " +
                              "{0:.5f} eV, found {1:.5f} eV as the closest energy!".format(E, ret_E)))
@@ -222,8 +251,10 @@ class _ncSileTBtrans(SileCDFTBtrans):
         elif isinstance(k, _str):
             # This will always be converted to an integer (single index)
             return int(k)
-        ik = np.sum(np.abs(self.k - _a.asarrayd(k)[None, :]), axis=1).argmin()
-        ret_k = self.k[ik, :]
+        if '_k_index' not in self._data:
+            self._data['_k_index'] = PointIndex(_a.asarrayd(self.k).reshape(-1, 3))
+        ik = self._data['_k_index'].nearest(k)
+        ret_k = self._data['_k_index'][ik]
         if not np.allclose(ret_k, k, atol=0.0001):
             warn(SileWarning(self.__class__.__name__ + " requesting k-point " +
                              "[{0:.3f}, {1:.3f}, {2:.3f}]".format(*k) +
@@ -0,0 +1,104 @@
+""" Look-up of energy and k-point indices in TBtrans files """
+from __future__ import print_function, division
+
+from bisect import bisect_left, insort
+import itertools
+
+import numpy as np
+
+import sisl._array as _a
+
+
+__all__ = ['PointIndex']
+
+
+class PointIndex(object):
+    r""" Index of points (energies or k-points) with tolerance aware look-ups
+
+    The points are stored in the order they are appended (the order in the file)
+    and all look-ups return the position of the point in the file.
+
+    Scalar points (energies) are kept sorted such that look-ups are :math:`O(\log n)`.
+    Vector points (k-points) are hashed on a grid with spacing `atol` such that
+    look-ups within the tolerance are :math:`O(1)`.
+
+    Parameters
+    ----------
+    points : array_like, optional
+       initial points, either a vector of scalars or a matrix with a point per row
+    atol : float, optional
+       two points are equal if all components differ by at most `atol`
+    """
+
+    def __init__(self, points=None, atol=1e-4):
+        self.atol = atol
+        self._points = []
+        # Sorted values (scalar points) and their position in the file
+        self._sorted = []
+        # Grid-hash of points -> position in the file
+        self._hash = dict()
+        if points is not None:
+            for p in points:
+                self.append(p)
+
+    def __len__(self):
+        return len(self._points)
+
+    def __getitem__(self, idx):
+        """ The point with index `idx` """
+        return self._points[idx]
+
+    def _key(self, point):
+        return tuple(np.floor(point / self.atol).astype(np.int64).tolist())
+
+    def append(self, point):
+        """ Append a point and return its index """
+        idx = len(self._points)
+        point = _a.arrayd(point).ravel()
+        self._points.append(point)
+        if len(point) == 1:
+            insort(self._sorted, (point[0], idx))
+        else:
+            self._hash.setdefault(self._key(point), []).append(idx)
+        return idx
+
+    def _nearest_scalar(self, value):
+        """ Index of the nearest scalar point """
+        i = bisect_left(self._sorted, (value, -1))
+        if i == len(self._sorted):
+            return self._sorted[-1][1]
+        if i > 0 and value - self._sorted[i-1][0] <= self._sorted[i][0] - value:
+            return self._sorted[i-1][1]
+        return self._sorted[i][1]
+
+    def index(self, point):
+        """ Index of the (closest) point within the tolerance, -1 if no such point exists """
+        if len(self._points) == 0:
+            return -1
+        point = _a.arrayd(point).ravel()
+        if len(point) == 1:
+            idx = self._nearest_scalar(point[0])
+            if abs(self._points[idx][0] - point[0]) > self.atol:
+                return -1
+            return idx
+
+        # Search the neighbouring grid-cells
+        key = self._key(point)
+        best, best_d = -1, np.inf
+        for shift in itertools.product((-1, 0, 1), repeat=len(key)):
+            for idx in self._hash.get(tuple(k + s for k, s in zip(key, shift)), ()):
+                d = np.abs(self._points[idx] - point)
+                if d.max() <= self.atol and d.sum() < best_d:
+                    best, best_d = idx, d.sum()
+        return best
+
+    def nearest(self, point):
+        """ Index of the nearest point (regardless of the tolerance) """
+        point = _a.arrayd(point).ravel()
+        if len(point) == 1:
+            return self._nearest_scalar(point[0])
+        idx = self.index(point)
+        if idx < 0:
+            # Fall-back to a linear search
+            idx = np.abs(np.array(self._points) - point.reshape(1, -1)).sum(1).argmin()
+        return idx
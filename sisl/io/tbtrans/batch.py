@@ -0,0 +1,284 @@
+from __future__ import print_function, division
+
+from glob import glob
+
+import numpy as np
+
+from sisl._help import _str
+from ..sile import get_sile, SileCDF
+from ..table import TableSile
+
+
+__all__ = ['tbt_batch']
+
+
+def _parse_query(query):
+    """ Convert a query specification into a list of ``(name, method, args, kwargs, dims)``
+
+    Each query may be one of:
+
+    - ``str``: the method name, optionally with keyword arguments
+      ``'current,elec_from=0,elec_to=1'``, the special keyword ``dims``
+      names the dimensions of the returned data (separated by ``:``)
+    - ``(name, kwargs)``: the method name and a dictionary of keyword arguments
+    - ``(name, args, kwargs)``: the method name, a list of positional arguments
+      and a dictionary of keyword arguments
+    - ``(name, args, kwargs, dims)``: as above, with the names of the dimensions
+      of the returned data
+
+    ``dims`` is None when the dimensions are not named.
+    """
+    if isinstance(query, _str) or isinstance(query, tuple):
+        query = [query]
+
+    def convert(value):
+        for cnv in [int, float]:
+            try:
+                return cnv(value)
+            except ValueError:
+                pass
+        if value.lower() in ['true', 't']:
+            return True
+        elif value.lower() in ['false', 'f']:
+            return False
+        return value
+
+    queries = []
+    for q in query:
+        if isinstance(q, _str):
+            q = q.split(',')
+            method = q[0].strip()
+            kwargs = dict()
+            dims = None
+            for kv in q[1:]:
+                key, value = kv.split('=')
+                if key.strip() == 'dims':
+                    dims = value.strip().split(':')
+                else:
+                    kwargs[key.strip()] = convert(value.strip())
+            args = ()
+            # Create a unique name for the query
+            name = '.'.join([method] + ['{}={}'.format(k, kwargs[k]) for k in sorted(kwargs)])
+        elif len(q) == 2:
+            method, kwargs = q
+            args, dims = (), None
+            name = method
+        elif len(q) == 3:
+            method, args, kwargs = q
+            dims = None
+            name = method
+        elif len(q) == 4:
+            method, args, kwargs, dims = q
+            name = method
+        else:
+            raise ValueError("tbt_batch could not parse the query: {}".format(q))
+
+        if kwargs is None:
+            kwargs = dict()
+        if isinstance(dims, _str):
+            dims = [dims]
+        if dims is not None:
+            dims = tuple(dims)
+
+        # Ensure the names are unique
+        base, i = name, 1
+        while name in [qq[0] for qq in queries]:
+            i += 1
+            name = '{}.{}'.format(base, i)
+
+        queries.append((name, method, tuple(args), kwargs, dims))
+    return queries
+
+
+def _tbt_batch_file(arg):
+    """ Extract all queries from a single file, this is the worker routine """
+    f, queries = arg
+    tbt = get_sile(f)
+    data = dict()
+    try:
+        for name, method, args, kwargs, _ in queries:
+            data[name] = np.asarray(getattr(tbt, method)(*args, **kwargs))
+        E = tbt.E
+    finally:
+        # Explicitly close the file (also for failing queries)
+        tbt.fh.close()
+    return f, E, data
+
+
+def tbt_batch(files, query='transmission', processes=None, out=None):
+    """ Extract the same quantities from many TBtrans output files using a pool of processes
+
+    A bias/gate sweep typically consists of many ``*.TBT.nc`` files which all contain the
+    same device. This routine extracts the requested quantities from each file, and aggregates
+    the data into arrays with the file index as the first dimension.
+
+    The geometries read from the files are cached per process such that files
+    with the same device only creates the geometry once.
+
+    Parameters
+    ----------
+    files : str or list of str
+       TBtrans output files, any glob pattern (``'bias_*/siesta.TBT.nc'``) is expanded
+       (and sorted)
+    query : str, tuple or list of str/tuple, optional
+       the quantities to extract, each query is the name of a method of the
+       `tbtncSileTBtrans` object (and similar), it may be supplied as:
+
+       - a string with optional keyword arguments ``'current,elec_from=0,elec_to=1'``,
+       - a tuple ``('current', {'elec_from': 0, 'elec_to': 1})``,
+       - a tuple ``('current', (0, 1), {'kavg': True})``,
+       - a tuple ``('transmission', (), {}, ('ne',))`` where the last element names
+         the dimensions of the returned quantity (``'transmission,dims=ne'`` in the string form).
+
+       The dimension names are used when writing a NetCDF file, the energy dimension is ``'ne'``.
+       Unnamed dimensions are written as ``<name>_<axis>``.
+    processes : int, optional
+       number of processes used for the extraction. Defaults to the number
+       of available processors, ``processes=1`` runs in serial.
+    out : str, optional
+       store the aggregated data in this file. If the file ends with ``.nc``
+       a NetCDF file is written with one variable per query. Otherwise a table file
+       is written with one row per file (the first column being the file index)
+       and all data flattened.
+
+    Returns
+    -------
+    files : list of str
+       the files in the order of the aggregated data
+    E : numpy.ndarray or list of numpy.ndarray
+       the energies, all files must have the same energy grid when a quantity has an energy
+       axis. If the energy grids differ (only energy independent quantities) a list with
+       the energies of each file is returned.
+    data : dict
+       for each query the data aggregated along the first dimension, if the
+       shapes of the quantities are different among the files a list is stored.
+
+    Examples
+    --------
+    >>> files, E, data = tbt_batch('V*/siesta.TBT.nc', ['transmission', 'current']) # doctest: +SKIP
+    >>> data['transmission'].shape == (len(files), len(E)) # doctest: +SKIP
+    True
+    """
+    if isinstance(files, _str):
+        files = [files]
+    # Expand glob patterns (retain non-matching files to
+    # let the sile raise a sensible error)
+    all_files = []
+    for f in files:
+        gf = sorted(glob(f))
+        if len(gf) == 0:
+            all_files.append(f)
+        else:
+            all_files.extend(gf)
+    files = all_files
+    if len(files) == 0:
+        raise ValueError("tbt_batch requires at least one file")
+
+    queries = _parse_query(query)
+    args = [(f, queries) for f in files]
+
+    if processes is None:
+        from multiprocessing import cpu_count
+        processes = cpu_count()
+    processes = min(processes, len(files))
+
+    if processes == 1:
+        results = list(map(_tbt_batch_file, args))
+    else:
+        from multiprocessing import Pool
+        pool = Pool(processes)
+        try:
+            # map retains the order of the files
+            results = pool.map(_tbt_batch_file, args, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    E = results[0][1]
+    same_E = all(len(e) == len(E) and np.allclose(e, E) for _, e, _ in results[1:])
+    if not same_E:
+        # Energy independent quantities (e.g. the current in a bias sweep)
+        # can be aggregated for different energy grids
+        for name, _, _, _, dims in queries:
+            for f, e, d in results:
+                if _has_energy_axis(d[name], e, dims):
+                    raise ValueError("tbt_batch requires all files to have the same energy grid "
+                                     "for energy resolved quantities ({}), "
+                                     "{} differs from {}".format(name, f, results[0][0]))
+        E = [e for _, e, _ in results]
+    data = dict()
+    for name, _, _, _, _ in queries:
+        d = [r[2][name] for r in results]
+        try:
+            data[name] = np.stack(d)
+        except ValueError:
+            # Different shapes
+            data[name] = d
+
+    if out is not None:
+        _tbt_batch_write(out, files, E, queries, data)
+
+    return files, E, data
+
+
+def _has_energy_axis(data, E, dims):
+    """ Whether `data` is energy resolved, i.e. has the ``'ne'`` dimension or any axis with the length of `E`
+
+    For unnamed dimensions this is conservative, a quantity is only regarded
+    energy independent if none of its axes has the length of the energy grid.
+    """
+    if dims is not None:
+        return 'ne' in dims
+    return len(E) in data.shape
+
+
+def _tbt_batch_write(out, files, E, queries, data):
+    """ Write the aggregated data from `tbt_batch` to a file """
+    for name, _, _, _, dims in queries:
+        if isinstance(data[name], list):
+            raise ValueError("tbt_batch cannot write data with different shapes "
+                             "for the files (query: {})".format(name))
+        if dims is not None and len(dims) != data[name].ndim - 1:
+            raise ValueError("tbt_batch got {} dimension names for data with {} dimensions "
+                             "(query: {})".format(len(dims), data[name].ndim - 1, name))
+
+    nf = len(files)
+    if out.endswith('.nc'):
+        with SileCDF(out, 'w') as sile:
+            sile._crt_dim(sile.fh, 'nfile', nf)
+            v = sile._crt_var(sile.fh, 'file', str, ('nfile',))
+            for i, f in enumerate(files):
+                v[i] = f
+            if not isinstance(E, list):
+                # Only a common energy grid is stored
+                sile._crt_dim(sile.fh, 'ne', len(E))
+                v = sile._crt_var(sile.fh, 'E', 'f8', ('ne',))
+                v.unit = 'eV'
+                v[:] = E
+            for name, _, _, _, dims in queries:
+                d = data[name]
+                if dims is None:
+                    dims = ['{}_{}'.format(name, i) for i in range(d.ndim - 1)]
+                for dim, n in zip(dims, d.shape[1:]):
+                    if dim not in sile.fh.dimensions:
+                        sile._crt_dim(sile.fh, dim, n)
+                    elif len(sile.fh.dimensions[dim]) != n:
+                        raise ValueError("tbt_batch dimension {} has length {} but query {} "
+                                         "has length {}".format(dim, len(sile.fh.dimensions[dim]), name, n))
+                v = sile._crt_var(sile.fh, name, d.dtype, ('nfile',) + tuple(dims))
+                v[:] = d
+        return
+
+    # Create the table
+    cols = [np.arange(nf)]
+    header = ['file']
+    for name, _, _, _, _ in queries:
+        d = data[name].reshape(nf, -1)
+        for i in range(d.shape[1]):
+            cols.append(d[:, i])
+            if d.shape[1] == 1:
+                header.append(name)
+            else:
+                header.append('{}[{}]'.format(name, i))
+    comment = ['{} {}'.format(i, f) for i, f in enumerate(files)]
+    TableSile(out, 'w').write_data(*cols, header=header, comment=comment)
@@ -5,6 +5,7 @@ import numpy as np
 # Import sile objects
 from ..sile import add_sile, sile_raise_write, SileWarning
 from .sile import SileCDFTBtrans
+from ._index import PointIndex
 from sisl.utils import *
 import sisl._array as _a
 
@@ -208,25 +209,36 @@ class deltancSileTBtrans(SileCDFTBtrans):
             return ilvl, -1, -1
 
         # Now determine the energy and k-indices
+        Eidx, kidx = self._lvl_index(ilvl, lvl)
         iE = -1
         if ilvl in [3, 4]:
-            if lvl.variables['E'].size != 0:
-                Es = _a.arrayd(lvl.variables['E'][:])
-                iE = np.argmin(np.abs(Es - E))
-                if abs(Es[iE] - E) > 0.0001:
-                    iE = -1
+            iE = Eidx.index(E)
 
         ik = -1
         if ilvl in [2, 4]:
-            if lvl.variables['kpt'].size != 0:
-                kpt = _a.arrayd(lvl.variables['kpt'][:])
-                kpt.shape = (-1, 3)
-                ik = np.argmin(np.abs(kpt - k[None, :]).sum(axis=1))
-                if not np.allclose(kpt[ik, :], k, atol=0.0001):
-                    ik = -1
+            ik = kidx.index(k)
 
         return ilvl, ik, iE
 
+    def _setup(self, *args, **kwargs):
+        """ Setup the look-up indices of the energies and k-points """
+        self._index = dict()
+
+    def _lvl_index(self, ilvl, lvl):
+        """ Return the energy and k-point look-up indices (`PointIndex`) of a level
+
+        The indices are read once from the file and must be updated when
+        energies or k-points are added to the level.
+        """
+        if ilvl not in self._index:
+            Eidx = kidx = None
+            if 'E' in lvl.variables:
+                Eidx = PointIndex(_a.arrayd(lvl.variables['E'][:]), atol=0.0001)
+            if 'kpt' in lvl.variables:
+                kidx = PointIndex(_a.arrayd(lvl.variables['kpt'][:]).reshape(-1, 3), atol=0.0001)
+            self._index[ilvl] = (Eidx, kidx)
+        return self._index[ilvl]
+
     def _get_lvl(self, ilvl):
         slvl = 'LEVEL-'+str(ilvl)
         if slvl in self.groups:
@@ -309,10 +321,10 @@ class deltancSileTBtrans(SileCDFTBtrans):
             v = self._crt_var(lvl, 'n_col', 'i4', ('no_u',))
             v.info = "Number of non-zero elements per row"
             v[:] = delta._csr.ncol[:]
-            v = self._crt_var(lvl, 'list_col', 'i4', ('nnzs',),
-                              chunksizes=(delta.nnz,), **self._cmp_args)
+            v = self._crt_var(lvl, 'list_col', 'i4', ('nnzs',), **self._cmp_args)
             v.info = "Supercell column indices in the sparse format"
-            v[:] = delta._csr.col[:] + 1  # correct for fortran indices
+            # correct for fortran indices
+            self._write_chunked(v, delta._csr.col, offset=1)
             v = self._crt_var(lvl, 'isc_off', 'i4', ('n_s', 'xyz'))
             v.info = "Index of supercell coordinates"
             v[:] = delta.geom.sc.sc_off[:, :]
@@ -321,14 +333,14 @@ class deltancSileTBtrans(SileCDFTBtrans):
         if ilvl in [3, 4]:
             if iE < 0:
                 # We need to add the new value
-                iE = lvl.variables['E'].shape[0]
+                iE = self._lvl_index(ilvl, lvl)[0].append(E * eV2Ry)
                 lvl.variables['E'][iE] = E * eV2Ry
                 warn_E = False
 
         warn_k = True
         if ilvl in [2, 4]:
             if ik < 0:
-                ik = lvl.variables['kpt'].shape[0]
+                ik = self._lvl_index(ilvl, lvl)[1].append(k)
                 lvl.variables['kpt'][ik, :] = k
                 warn_k = False
 
@@ -345,50 +357,35 @@ class deltancSileTBtrans(SileCDFTBtrans):
 
         if ilvl == 1:
             dim = ('spin', 'nnzs')
-            sl = [slice(None)] * 2
-            csize = [1] * 2
+            key = ()
         elif ilvl == 2:
             dim = ('nkpt', 'spin', 'nnzs')
-            sl = [slice(None)] * 3
-            sl[0] = ik
-            csize = [1] * 3
+            key = (ik, )
         elif ilvl == 3:
             dim = ('ne', 'spin', 'nnzs')
-            sl = [slice(None)] * 3
-            sl[0] = iE
-            csize = [1] * 3
+            key = (iE, )
         elif ilvl == 4:
             dim = ('nkpt', 'ne', 'spin', 'nnzs')
-            sl = [slice(None)] * 4
-            sl[0] = ik
-            sl[1] = iE
-            csize = [1] * 4
-
-        # Number of non-zero elements
-        csize[-1] = delta.nnz
+            key = (ik, iE)
 
+        # The variables are chunked along the non-zero elements
         if delta.dtype.kind == 'c':
             v1 = self._crt_var(lvl, 'Redelta', 'f8', dim,
-                               chunksizes=csize,
                                attr = {'info': "Real part of delta",
                                        'unit': "Ry"}, **self._cmp_args)
             v2 = self._crt_var(lvl, 'Imdelta', 'f8', dim,
-                               chunksizes=csize,
                                attr = {'info': "Imaginary part of delta",
                                        'unit': "Ry"}, **self._cmp_args)
             for i in range(len(delta.spin)):
-                sl[-2] = i
-                v1[sl] = delta._csr._D[:, i].real * eV2Ry
-                v2[sl] = delta._csr._D[:, i].imag * eV2Ry
+                self._write_chunked(v1, delta._csr._D[:, i].real, key=key + (i, ), scale=eV2Ry)
+                self._write_chunked(v2, delta._csr._D[:, i].imag, key=key + (i, ), scale=eV2Ry)
 
         else:
             v = self._crt_var(lvl, 'delta', 'f8', dim,
-                              chunksizes=csize,
                               attr = {'info': "delta",
                                       'unit': "Ry"},  **self._cmp_args)
             for i in range(len(delta.spin)):
-                sl[-2] = i
-                v[sl] = delta._csr._D[:, i] * eV2Ry
+                self._write_chunked(v, delta._csr._D[:, i], key=key + (i, ), scale=eV2Ry)
 
     def _read_class(self, cls, **kwargs):
         """ Reads a class model from a file """
@@ -520,10 +517,10 @@ class dHncSileTBtrans(deltancSileTBtrans):
             v = self._crt_var(lvl, 'n_col', 'i4', ('no_u',))
             v.info = "Number of non-zero elements per row"
             v[:] = H._csr.ncol[:]
-            v = self._crt_var(lvl, 'list_col', 'i4', ('nnzs',),
-                              chunksizes=(len(H._csr.col),), **self._cmp_args)
+            v = self._crt_var(lvl, 'list_col', 'i4', ('nnzs',), **self._cmp_args)
             v.info = "Supercell column indices in the sparse format"
-            v[:] = H._csr.col[:] + 1  # correct for fortran indices
+            # correct for fortran indices
+            self._write_chunked(v, H._csr.col, offset=1)
             v = self._crt_var(lvl, 'isc_off', 'i4', ('n_s', 'xyz'))
             v.info = "Index of supercell coordinates"
             v[:] = H.geom.sc.sc_off[:, :]
@@ -532,14 +529,14 @@ class dHncSileTBtrans(deltancSileTBtrans):
         if ilvl in [3, 4]:
             if iE < 0:
                 # We need to add the new value
-                iE = len(lvl.variables['E'])
+                iE = self._lvl_index(ilvl, lvl)[0].append(E * eV2Ry)
                 lvl.variables['E'][iE] = E * eV2Ry
                 warn_E = False
 
         warn_k = True
         if ilvl in [2, 4]:
             if ik < 0:
-                ik = len(lvl.variables['kpt'])
+                ik = self._lvl_index(ilvl, lvl)[1].append(k)
                 lvl.variables['kpt'][ik, :] = k
                 warn_k = False
 
@@ -556,53 +553,35 @@ class dHncSileTBtrans(deltancSileTBtrans):
 
         if ilvl == 1:
             dim = ('spin', 'nnzs')
-            sl = [slice(None)] * 2
-            csize = [1] * 2
+            key = ()
         elif ilvl == 2:
             dim = ('nkpt', 'spin', 'nnzs')
-            sl = [slice(None)] * 3
-            sl[0] = ik
-            csize = [1] * 3
+            key = (ik, )
         elif ilvl == 3:
             dim = ('ne', 'spin', 'nnzs')
-            sl = [slice(None)] * 3
-            sl[0] = iE
-            csize = [1] * 3
+            key = (iE, )
         elif ilvl == 4:
             dim = ('nkpt', 'ne', 'spin', 'nnzs')
-            sl = [slice(None)] * 4
-            sl[0] = ik
-            sl[1] = iE
-            csize = [1] * 4
-
-        # Number of non-zero elements
-        csize[-1] = H.nnz
+            key = (ik, iE)
 
+        # The variables are chunked along the non-zero elements
         if H.dtype.kind == 'c':
             v1 = self._crt_var(lvl, 'RedH', 'f8', dim,
-                               chunksizes=csize,
                                attr = {'info': "Real part of dH",
                                        'unit': "Ry"}, **self._cmp_args)
-            for i in range(len(H.spin)):
-                sl[-2] = i
-                v1[sl] = H._csr._D[:, i].real * eV2Ry
-
             v2 = self._crt_var(lvl, 'ImdH', 'f8', dim,
-                               chunksizes=csize,
                                attr = {'info': "Imaginary part of dH",
                                        'unit': "Ry"}, **self._cmp_args)
             for i in range(len(H.spin)):
-                sl[-2] = i
-                v2[sl] = H._csr._D[:, i].imag * eV2Ry
+                self._write_chunked(v1, H._csr._D[:, i].real, key=key + (i, ), scale=eV2Ry)
+                self._write_chunked(v2, H._csr._D[:, i].imag, key=key + (i, ), scale=eV2Ry)
 
         else:
             v = self._crt_var(lvl, 'dH', 'f8', dim,
-                              chunksizes=csize,
                               attr = {'info': "dH",
                                       'unit': "Ry"},  **self._cmp_args)
             for i in range(len(H.spin)):
-                sl[-2] = i
-                v[sl] = H._csr._D[:, i] * eV2Ry
+                self._write_chunked(v, H._csr._D[:, i], key=key + (i, ), scale=eV2Ry)
 
     def _read_class(self, cls, **kwargs):
         """ Reads a class model from a file """
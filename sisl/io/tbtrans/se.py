@@ -195,6 +195,100 @@ class tbtsencSileTBtrans(_devncSileTBtrans):
 
         return SE
 
+    @staticmethod
+    def _hyperslab(idx, n, index):
+        """ Convert `idx` into a slice (if possible) and the number of elements
+
+        Parameters
+        ----------
+        idx : None or slice or array_like
+           ``None`` for all elements, else the indices (or values converted by `index`)
+        n : int
+           length of the dimension
+        index : callable
+           converts a single (non-integer) value to an index
+        """
+        if idx is None:
+            return slice(0, n), n
+        if isinstance(idx, slice):
+            return idx, len(range(*idx.indices(n)))
+        idx = _a.arrayi([index(i) for i in idx])
+        idx = np.where(idx < 0, idx + n, idx)
+        if len(idx) == 1:
+            return slice(idx[0], idx[0] + 1), 1
+        step = idx[1] - idx[0]
+        if step > 0 and np.all(np.diff(idx) == step):
+            # Equally spaced indices are read as a single hyperslab
+            return slice(idx[0], idx[-1] + 1, step), len(idx)
+        return idx, len(idx)
+
+    def self_energies(self, elec, E=None, k=None, sort=False, out=None):
+        """ Return the self-energies from the electrode `elec` for a range of energies and k-points
+
+        The real and imaginary parts are each read in a single hyperslab (if the
+        indices are equally spaced) and stored directly in the (complex) output array.
+
+        Parameters
+        ----------
+        elec : str or int
+           the corresponding electrode to return the self-energy from
+        E : slice or array_like, optional
+           energies (or energy indices, see `Eindex`) to retrieve, defaults to all energies
+        k : slice or array_like, optional
+           k-points (or k-point indices, see `kindex`) to retrieve, defaults to all k-points
+        sort : bool, optional
+           if ``True`` the returned self-energies will be sorted (equivalent to pivoting the self-energies)
+        out : numpy.ndarray, optional
+           complex array with shape ``(nk, nE, no_e, no_e)`` where the self-energies are stored
+
+        Returns
+        -------
+        numpy.ndarray
+           the self-energies with shape ``(nk, nE, no_e, no_e)``, the k-point and energy dimensions
+           are retained for scalar arguments
+
+        Examples
+        --------
+        >>> se = tbtsencSileTBtrans(...) # doctest: +SKIP
+        >>> SE = se.self_energies('Left', E=slice(0, 100), k=[0]) # doctest: +SKIP
+        >>> SE.shape # doctest: +SKIP
+        (1, 100, 12, 12)
+        """
+        tree = self._elec(elec)
+        if E is not None and not isinstance(E, slice):
+            E = np.ravel(E).tolist()
+        if k is not None and not isinstance(k, slice):
+            k = np.asarray(k)
+            if k.dtype.kind == 'f':
+                # k-points in reduced coordinates
+                k = k.reshape(-1, 3)
+            else:
+                k = k.ravel().tolist()
+        sE, nE = self._hyperslab(E, len(self._dimension('ne')), self.Eindex)
+        sk, nk = self._hyperslab(k, len(self._dimension('nkpt')), self.kindex)
+
+        re = self._variable('ReSelfEnergy', tree=tree)
+        im = self._variable('ImSelfEnergy', tree=tree)
+        no = re.shape[-1]
+        shape = (nk, nE, no, no)
+        if out is None:
+            out = np.empty(shape, dtype=np.complex128)
+        elif out.shape != shape:
+            raise ValueError(self.__class__.__name__ + '.self_energies requires out to have shape {}'.format(shape))
+
+        if sort:
+            # Permutation to the sorted pivoting indices
+            idx = argsort(self.pivot(elec))
+
+        for o, v in [(out.real, re), (out.imag, im)]:
+            buf = np.asarray(v[sk, sE, :, :])
+            if sort:
+                np.take(buf.take(idx, axis=2), idx, axis=3, out=o)
+            else:
+                o[...] = buf
+        out *= Ry2eV
+        return out
+
     def self_energy_average(self, elec, E, sort=False):
         """ Return the k-averaged average self-energy from the electrode `elec`
 
@@ -216,7 +310,7 @@ class tbtsencSileTBtrans(_devncSileTBtrans):
         re = self._variable('ReSelfEnergyMean', tree=tree)
         im = self._variable('ImSelfEnergyMean', tree=tree)
 
-        SE = (re[ik, iE, :, :] + 1j * im[ik, iE, :, :]) * Ry2eV
+        SE = (re[iE, :, :] + 1j * im[iE, :, :]) * Ry2eV
         if sort:
             pvt = self.pivot(elec)
             idx = argsort(pvt)
@@ -808,9 +808,7 @@ class tbtncSileTBtrans(_devncSileTBtrans):
 
             # Make a shrinking logical array for selecting a subset of the
             # orbital currents...
-            all_col = _a.emptyi(len(x) * len(y) * len(z))
-            for i, (ix, iy, iz) in enumerate(itertools.product(x, y, z)):
-                all_col[i] = geom.sc_index([ix, iy, iz])
+            all_col = _a.arrayi(geom.sc_index(list(itertools.product(x, y, z))))
 
             # If the user requests a single supercell index, we will
             # return a square matrix
@@ -8,6 +8,7 @@ import os
 from tempfile import mkstemp
 from sisl.io import *
 from sisl.io.tbtrans._cdf import *
+from sisl.io.siesta.binaries import found_module
 from sisl import Geometry, Grid, Hamiltonian
 from sisl import DensityMatrix, EnergyDensityMatrix
 
@@ -32,8 +33,15 @@ gs = get_sile
 gsc = get_sile_class
 
 
+# Siles whose writers require the compiled Fortran module
+_fortran_write = (TSHSSileSiesta, DMSileSiesta)
+
+
 def _my_intersect(a, b):
-    return list(set(get_siles(a)).intersection(get_siles(b)))
+    siles = list(set(get_siles(a)).intersection(get_siles(b)))
+    skip = pytest.mark.skipif(not found_module, reason="writing requires the Fortran module")
+    return [pytest.param(sile, marks=skip) if issubclass(sile, _fortran_write) else sile
+            for sile in siles]
 
 
 def _fnames(base, variants):
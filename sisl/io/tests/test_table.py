@@ -3,8 +3,10 @@ from __future__ import print_function, division
 import pytest
 
 import os
+import json
 import numpy as np
 
+from sisl.io.sile import Sile_fh_open
 from sisl.io.table import *
 
 from . import common as tc
@@ -105,3 +107,51 @@ class TestTable(object):
         assert np.allclose(dat, DAT)
 
         os.remove(io.file)
+
+    def test_tbl_cache(self):
+        f = join(_C.d, 'cache.dat')
+        dat = np.arange(6).reshape(2, 3).astype(np.float64)
+        TableSile(f, 'w').write_data(dat)
+
+        io = TableSile(f)
+        io.cache = True
+        assert np.allclose(io.read_data(), dat)
+        caches = [c for c in os.listdir(_C.d) if c.startswith('.cache.dat.read_data-')]
+        assert len(caches) == 1
+        assert np.allclose(io.read_data(), dat)
+
+        # A changed file is re-read
+        dat = dat * 2
+        with open(f, 'w') as fh:
+            fh.write('\n'.join([' '.join(map(str, d)) for d in dat.T]) + '\n\n')
+        assert np.allclose(io.read_data(), dat)
+        # and non-cached reads are unaffected
+        assert np.allclose(TableSile(f).read_data(), dat)
+
+        # A cache file with pickled objects is never loaded
+        caches = [join(_C.d, c) for c in os.listdir(_C.d) if c.startswith('.cache.dat.read_data-')]
+        with np.load(caches[0]) as c:
+            key = c['key']
+        obj = np.empty([1], dtype=object)
+        obj[0] = 'tampered'
+        layout = json.dumps({'type': 'array', 'key': 'a2', 'scalar': False})
+        np.savez_compressed(caches[0], key=key, layout=np.array(layout), a2=obj)
+        assert np.allclose(io.read_data(), dat)
+
+    def test_tbl_cache_class(self):
+        # Different siles reading the same file do not share the cache
+        class OtherSile(TableSile):
+            @Sile_fh_open
+            def read_data(self, *args, **kwargs):
+                return super(OtherSile, self).read_data(*args, **kwargs) * 2
+
+        f = join(_C.d, 'cache_class.dat')
+        dat = np.arange(6).reshape(2, 3).astype(np.float64)
+        TableSile(f, 'w').write_data(dat)
+        io = TableSile(f)
+        io.cache = True
+        other = OtherSile(f)
+        other.cache = True
+        assert np.allclose(io.read_data(), dat)
+        assert np.allclose(other.read_data(), dat * 2)
+        assert np.allclose(io.read_data(), dat)
@@ -4,7 +4,7 @@ import pytest
 
 from tempfile import mkstemp, mkdtemp
 
-from sisl import Geometry, Atom
+from sisl import Geometry, Atom, Hamiltonian
 from sisl.io.ham import *
 
 import os.path as osp
@@ -42,3 +42,32 @@ class TestHAM(object):
         _C.ham.write(HamiltonianSile(f, 'w'))
         ham = HamiltonianSile(f).read_hamiltonian()
         assert ham.spsame(_C.ham)
+
+    def test_ham_mixed_sc(self):
+        # super-cell offsets with mixed signs, (1, -1, 0) and (-1, 1, 0)
+        f = osp.join(_C.d, 'sq.ham')
+        g = Geometry([0] * 3, Atom(1, R=1.5), sc=[1, 1, 10])
+        g.set_nsc([3, 3, 1])
+        H = Hamiltonian(g)
+        H.construct([(0.1, 1.1, 1.5), (0.5, -1., -0.3)])
+        for hermitian in [True, False]:
+            H.write(HamiltonianSile(f, 'w'), hermitian=hermitian)
+            h = HamiltonianSile(f).read_hamiltonian(hermitian=hermitian)
+            assert h.spsame(H)
+            assert np.allclose(h.tocsr(0).toarray(), H.tocsr(0).toarray())
+
+    def test_ham_orbitals(self):
+        f = osp.join(_C.d, 'orb.ham')
+        g = Geometry([[0] * 3, [1.] * 3], Atom(6, R=[1.8, 1.8]), sc=[10, 10, 10])
+        H = Hamiltonian(g, orthogonal=False)
+        H[0, 0] = (0.2, 1.)
+        H[0, 1] = (0.3, 0.)
+        H[1, 0] = (0.3, 0.)
+        H[1, 3] = (-2.7, 0.1)
+        H[3, 1] = (-2.7, 0.1)
+        H.write(HamiltonianSile(f, 'w'))
+        h = HamiltonianSile(f).read_hamiltonian()
+        assert h.geom.no == 4
+        assert h.spsame(H)
+        assert np.allclose(h.tocsr(0).toarray(), H.tocsr(0).toarray())
+        assert np.allclose(h.tocsr(h.S_idx).toarray(), H.tocsr(H.S_idx).toarray())
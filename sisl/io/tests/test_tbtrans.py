@@ -5,6 +5,7 @@ import pytest
 from sisl import Geometry, Atom, Hamiltonian
 from sisl.io.tbtrans import *
 
+import sys
 import os.path as osp
 import math as m
 import numpy as np
@@ -101,3 +102,212 @@ class TestTBtransnc(object):
             h = sile.read_delta()
         assert h.spsame(H)
         assert h.dkind == H.dkind
+
+    def test_dH_chunk(self):
+        f = osp.join(_C.d, 'gr_chunk.dH.nc')
+        H = Hamiltonian(_C.gtb)
+        H.construct([_C.R, _C.t])
+        # Very small chunks forces writing the sparse elements in blocks
+        with dHncSileTBtrans(f, 'w', chunk=64) as sile:
+            sile.write_hamiltonian(H)
+            sile.write_hamiltonian(H, E=0.1)
+            assert sile._get_lvl(1).variables['dH'].chunking() == [1, 8]
+            assert sile._get_lvl(1).variables['list_col'].chunking() == [8]
+            assert sile._get_lvl(3).variables['dH'].chunking() == [1, 1, 8]
+        with dHncSileTBtrans(f) as sile:
+            for kwargs in [{}, {'E': 0.1}]:
+                h = sile._read_class(Hamiltonian, **kwargs)
+                assert h.spsame(H)
+                assert np.allclose(h._csr._D[:, 0], H._csr._D[:, 0])
+
+    def _fake_tbt(self, f, bias):
+        # Create a minimal TBT.nc file with two electrodes
+        import netCDF4
+        g = _C.gtb
+        ne = 11
+        with netCDF4.Dataset(f, 'w') as nc:
+            nc.createDimension('xyz', 3)
+            nc.createDimension('one', 1)
+            nc.createDimension('na_u', g.na)
+            nc.createDimension('no_u', g.no)
+            nc.createDimension('na_d', g.na)
+            nc.createDimension('no_d', g.no)
+            nc.createDimension('ne', ne)
+            nc.createDimension('nkpt', 2)
+            nc.createVariable('cell', 'f8', ('xyz', 'xyz'))[:] = g.cell / 0.52917721067
+            nc.createVariable('xa', 'f8', ('na_u', 'xyz'))[:] = g.xyz / 0.52917721067
+            nc.createVariable('lasto', 'i4', ('na_u',))[:] = g.lasto + 1
+            nc.createVariable('nsc', 'i4', ('xyz',))[:] = g.nsc
+            nc.createVariable('a_dev', 'i4', ('na_d',))[:] = np.arange(g.na) + 1
+            nc.createVariable('pivot', 'i4', ('no_d',))[:] = np.arange(g.no) + 1
+            nc.createVariable('E', 'f8', ('ne',))[:] = np.linspace(-1, 1, ne) / 13.605693009
+            nc.createVariable('kpt', 'f8', ('nkpt', 'xyz'))[:] = [[0, 0, 0], [0.5, 0, 0]]
+            nc.createVariable('wkpt', 'f8', ('nkpt',))[:] = [0.5, 0.5]
+            for elec, mu, other in [('Left', bias / 2, 'Right'), ('Right', -bias / 2, 'Left')]:
+                grp = nc.createGroup(elec)
+                grp.createVariable('mu', 'f8', ('one',))[:] = mu / 13.605693009
+                grp.createVariable('kT', 'f8', ('one',))[:] = 0.025 / 13.605693009
+                grp.createVariable(other + '.T', 'f8', ('nkpt', 'ne'))[:] = 1. + bias
+        return f
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_batch(self, processes):
+        files = [self._fake_tbt(osp.join(_C.d, 'V{}_{}.TBT.nc'.format(processes, i)), 0.1 * i)
+                 for i in range(3)]
+        fs, E, data = tbt_batch(osp.join(_C.d, 'V{}_*.TBT.nc'.format(processes)),
+                                ['transmission', 'current,elec_from=1,elec_to=0'],
+                                processes=processes)
+        assert fs == files
+        assert len(E) == 11
+        assert data['transmission'].shape == (3, 11)
+        assert np.allclose(data['transmission'][:, 0], [1., 1.1, 1.2])
+        assert data['current.elec_from=1.elec_to=0'].shape == (3, )
+        for i, f in enumerate(files):
+            with tbtncSileTBtrans(f) as tbt:
+                assert np.allclose(data['transmission'][i], tbt.transmission())
+
+    def test_batch_out(self):
+        files = [self._fake_tbt(osp.join(_C.d, 'W{}.TBT.nc'.format(i)), 0.1 * i)
+                 for i in range(2)]
+        out = osp.join(_C.d, 'batch.nc')
+        _, E, data = tbt_batch(files, ['transmission,dims=ne', 'transmission'], processes=1, out=out)
+        import netCDF4
+        with netCDF4.Dataset(out) as nc:
+            assert np.allclose(nc.variables['transmission'][:], data['transmission'])
+            assert nc.variables['transmission'].dimensions == ('nfile', 'ne')
+            assert nc.variables['transmission.2'].dimensions == ('nfile', 'transmission.2_0')
+            assert np.allclose(nc.variables['E'][:], E)
+        with pytest.raises(ValueError):
+            tbt_batch(files, ('transmission', (), {}, ('ne', 'nk')), processes=1, out=out)
+        out = osp.join(_C.d, 'batch.dat')
+        tbt_batch(files, ['transmission', 'current'], processes=1, out=out)
+        d = np.loadtxt(out)
+        assert d.shape == (2, 1 + 11 + 1)
+
+    def test_batch_close(self, monkeypatch):
+        # Files are closed when a query fails
+        f = self._fake_tbt(osp.join(_C.d, 'Y.TBT.nc'), 0.)
+        batch = sys.modules[tbt_batch.__module__]
+        siles = []
+        orig = batch.get_sile
+        def get_sile(*args, **kwargs):
+            siles.append(orig(*args, **kwargs))
+            return siles[-1]
+        monkeypatch.setattr(batch, 'get_sile', get_sile)
+        with pytest.raises(AttributeError):
+            tbt_batch(f, 'unknown_quantity', processes=1)
+        assert not siles[0].fh.isopen()
+
+    def test_batch_energy_grid(self):
+        files = [self._fake_tbt(osp.join(_C.d, 'X{}.TBT.nc'.format(i)), 0.1 * i)
+                 for i in range(2)]
+        import netCDF4
+        with netCDF4.Dataset(files[1], 'a') as nc:
+            nc.variables['E'][0] = -2. / 13.605693009
+        with pytest.raises(ValueError):
+            tbt_batch(files, 'transmission', processes=1)
+        with pytest.raises(ValueError):
+            tbt_batch(files, ['current', 'transmission,dims=ne'], processes=1)
+
+        # Energy independent quantities do not require the same energy grid
+        out = osp.join(_C.d, 'batch_grid.nc')
+        _, E, data = tbt_batch(files, ['current', 'current,elec_from=1,elec_to=0'], processes=1, out=out)
+        assert isinstance(E, list)
+        assert E[0][0] != E[1][0]
+        assert data['current'].shape == (2, )
+        with netCDF4.Dataset(out) as nc:
+            assert 'E' not in nc.variables
+            assert np.allclose(nc.variables['current'][:], data['current'])
+
+    def _fake_se(self, f):
+        # Create a minimal TBT.SE.nc file with one electrode
+        import netCDF4
+        g = _C.gtb
+        ne, nk, no_e = 6, 3, 3
+        with netCDF4.Dataset(f, 'w') as nc:
+            nc.createDimension('xyz', 3)
+            nc.createDimension('one', 1)
+            nc.createDimension('na_u', g.na)
+            nc.createDimension('no_u', g.no)
+            nc.createDimension('na_d', g.na)
+            nc.createDimension('no_d', g.no)
+            nc.createDimension('ne', ne)
+            nc.createDimension('nkpt', nk)
+            nc.createVariable('cell', 'f8', ('xyz', 'xyz'))[:] = g.cell / 0.52917721067
+            nc.createVariable('xa', 'f8', ('na_u', 'xyz'))[:] = g.xyz / 0.52917721067
+            nc.createVariable('lasto', 'i4', ('na_u',))[:] = g.lasto + 1
+            nc.createVariable('nsc', 'i4', ('xyz',))[:] = g.nsc
+            nc.createVariable('a_dev', 'i4', ('na_d',))[:] = np.arange(g.na) + 1
+            nc.createVariable('pivot', 'i4', ('no_d',))[:] = np.arange(g.no) + 1
+            nc.createVariable('E', 'f8', ('ne',))[:] = np.linspace(-1, 1, ne) / 13.605693009
+            nc.createVariable('kpt', 'f8', ('nkpt', 'xyz'))[:] = [[0, 0, 0], [0.25, 0, 0], [0.5, 0, 0]]
+            nc.createVariable('wkpt', 'f8', ('nkpt',))[:] = 1. / nk
+            grp = nc.createGroup('Left')
+            grp.createDimension('no_e', no_e)
+            grp.createVariable('pivot', 'i4', ('no_e',))[:] = [3, 1, 2]
+            for name in ['ReSelfEnergy', 'ImSelfEnergy']:
+                grp.createVariable(name, 'f8', ('nkpt', 'ne', 'no_e', 'no_e'))[:] = np.random.rand(nk, ne, no_e, no_e)
+            for name in ['ReSelfEnergyMean', 'ImSelfEnergyMean']:
+                grp.createVariable(name, 'f8', ('ne', 'no_e', 'no_e'))[:] = np.random.rand(ne, no_e, no_e)
+        return f
+
+    def test_se_range(self):
+        f = self._fake_se(osp.join(_C.d, 'gr.TBT.SE.nc'))
+        se = tbtsencSileTBtrans(f)
+        SE = se.self_energies('Left')
+        assert SE.shape == (3, 6, 3, 3)
+        for ik in range(3):
+            for iE in range(6):
+                assert np.allclose(SE[ik, iE], se.self_energy('Left', iE, ik))
+
+        SE = se.self_energies(0, E=[0, 2, 4], k=[[0.5, 0, 0], [0, 0, 0]], sort=True)
+        assert SE.shape == (2, 3, 3, 3)
+        assert np.allclose(SE[0, 2], se.self_energy('Left', 4, 2, sort=True))
+        assert np.allclose(SE[1, 1], se.self_energy('Left', 2, 0, sort=True))
+
+        out = np.zeros([1, 2, 3, 3], np.complex128)
+        SE = se.self_energies('Left', E=slice(1, 3), k=[1], out=out)
+        assert SE is out
+        assert np.allclose(out[0, 1], se.self_energy('Left', 2, 1))
+        with pytest.raises(ValueError):
+            se.self_energies('Left', k=[1], out=out)
+
+        # The average self-energy
+        SE = se.self_energy_average('Left', 1)
+        assert SE.shape == (3, 3)
+
+    def test_point_index(self):
+        from sisl.io.tbtrans._index import PointIndex
+        E = PointIndex([0.5, -0.1, 0.2], atol=1e-3)
+        assert E.index(0.2) == 2
+        assert E.index(0.2005) == 2
+        assert E.index(0.21) == -1
+        assert E.nearest(0.21) == 2
+        assert E.nearest(-1.) == 1
+        assert E.nearest(10.) == 0
+        assert E.append(0.3) == 3
+        assert E.nearest(0.29) == 3
+
+        k = PointIndex(np.array([[0, 0, 0], [0.5, 0, 0], [0, 0.25, 0]]), atol=1e-4)
+        assert k.index([0.5, 0, 0]) == 1
+        assert k.index([0.50005, -0.00005, 0]) == 1
+        assert k.index([0.5, 0.25, 0]) == -1
+        assert k.nearest([0.1, 0.2, 0]) == 2
+        assert k.append([0.5, 0.25, 0]) == 3
+        assert k.index([0.5, 0.25, 0]) == 3
+
+    def test_nc_many_E(self):
+        f = osp.join(_C.d, 'gr.dH.nc')
+        H = Hamiltonian(_C.gtb)
+        H.construct([_C.R, _C.t])
+        E = np.linspace(-1, 1, 50)
+        with deltancSileTBtrans(f, 'w') as sile:
+            for e in E:
+                H[0, 0] = e
+                sile.write_delta(H, E=e)
+                sile.write_delta(H, E=e, k=[0, 0.5, 0])
+        with deltancSileTBtrans(f, 'r') as sile:
+            assert len(sile._get_lvl(3).variables['E']) == len(E)
+            for e in E[::-7]:
+                assert np.allclose(sile.read_delta(E=e)[0, 0], e)
+                assert np.allclose(sile.read_delta(E=e, k=[0, 0.5, 0])[0, 0], e)
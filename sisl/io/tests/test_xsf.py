@@ -43,3 +43,33 @@ def test_imaginary(dir_test):
     grid.grid = np.random.rand(*grid.shape) + 1j*np.random.rand(*grid.shape)
     grid.write(f)
     assert not grid.geometry is None
+
+
+def test_geometry_single(dir_test):
+    f = dir_test.file('single.xsf')
+    geom = Geometry([0.5, 0.5, 0.5], Atom(6), sc=[10, 10, 10])
+    geom.write(f)
+    g = XSFSile(f).read_geometry()
+    assert len(g) == 1
+    assert np.allclose(g.xyz, geom.xyz)
+    assert g.atom[0].Z == 6
+
+
+def test_trajectory(dir_test):
+    f = dir_test.file('anim.xsf')
+    with open(f, 'w') as fh:
+        fh.write('ANIMSTEPS 3\nCRYSTAL\nPRIMVEC\n10. 0. 0.\n0. 10. 0.\n0. 0. 10.\n')
+        for i in range(3):
+            if i == 2:
+                # variable cell
+                fh.write('PRIMVEC 3\n11. 0. 0.\n0. 10. 0.\n0. 0. 10.\n')
+            fh.write('PRIMCOORD {}\n2 1\n'.format(i + 1))
+            fh.write('6 0. 0. {0}.\n1 1. 0. {0}.\n'.format(i))
+    sile = XSFSile(f)
+    assert len(sile.read_geometry()) == 2
+    traj = sile.read_trajectory()
+    assert len(traj) == 3
+    assert np.allclose(traj.xyz()[:, :, 2], [[0, 0], [1, 1], [2, 2]])
+    assert traj[1].atom[0].Z == 6
+    assert traj[1].cell[0, 0] == pytest.approx(10)
+    assert traj[2].cell[0, 0] == pytest.approx(11)
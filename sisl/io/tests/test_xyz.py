@@ -36,3 +36,69 @@ class TestXYZ(object):
         assert np.allclose(g.cell, _C.g.cell)
         assert np.allclose(g.xyz, _C.g.xyz)
         assert _C.g.atom.equal(g.atom, R=False)
+
+    def test_xyz_columns(self):
+        # Additional columns are discarded
+        f = osp.join(_C.d, 'columns.xyz')
+        with open(f, 'w') as fh:
+            fh.write('3\n\n')
+            fh.write('C 0. 0. 0. 1. 1.\n')
+            fh.write('H 1. 0. 0. 1.\n')
+            fh.write('C 2. 0.5 0.\n')
+        g = XYZSile(f).read_geometry()
+        assert len(g) == 3
+        assert np.allclose(g.xyz, [[0, 0, 0], [1, 0, 0], [2, 0.5, 0]])
+        assert g.atom[0] == Atom('C')
+        assert g.atom[1] == Atom('H')
+        assert np.all(g.atom.specie == [0, 1, 0])
+
+    def test_xyz_columns_mixed(self):
+        # The total number of columns matches, but not per line
+        f = osp.join(_C.d, 'columns_mixed.xyz')
+        with open(f, 'w') as fh:
+            fh.write('3\n\n')
+            fh.write('C 0. 0. 0. 9.\n')
+            fh.write('H 1. 0. 0.\n')
+            fh.write('O 2. 0.5 0. 7. 8.\n')
+        g = XYZSile(f).read_geometry()
+        assert np.allclose(g.xyz, [[0, 0, 0], [1, 0, 0], [2, 0.5, 0]])
+        assert g.atom[2] == Atom('O')
+
+    def test_xyz_trajectory(self):
+        f = osp.join(_C.d, 'traj.xyz')
+        g = _C.g.copy()
+        with open(f, 'w') as fh:
+            for i in range(4):
+                g.xyz[0, 0] = i
+                g.write(XYZSile(f + '.tmp', 'w'))
+                fh.write(open(f + '.tmp').read())
+
+        sile = XYZSile(f)
+        assert np.allclose(sile.read_geometry().xyz, _C.g.xyz)
+        traj = sile.read_trajectory()
+        assert len(traj) == 4
+        assert traj[-1].xyz[0, 0] == pytest.approx(3)
+        assert [geom.xyz[0, 0] for geom in traj[1::2]] == pytest.approx([1, 3])
+        assert [geom.xyz[0, 0] for geom in traj] == pytest.approx([0, 1, 2, 3])
+        xyz = traj.xyz()
+        assert xyz.shape == (4, len(g), 3)
+        assert np.allclose(xyz[:, 1:], _C.g.xyz[1:])
+        assert np.allclose(traj.xyz(2), xyz[2])
+
+        # Multi-byte characters in the comments do not shift the frames
+        f8 = osp.join(_C.d, 'traj_utf8.xyz')
+        with open(f8, 'wb') as fh:
+            for i in range(3):
+                fh.write(u'2\r\n\u00c5ngstr\u00f6m frame\r\nC {0}. 0. 0.\r\nH 1. 0. 0.\r\n'.format(i).encode('utf-8'))
+        assert XYZSile(f8).read_trajectory().xyz()[:, 0, 0] == pytest.approx([0, 1, 2])
+
+        # Caching is opt-in
+        cache = osp.join(_C.d, '.traj.xyz.frames.npz')
+        assert not osp.isfile(cache)
+        assert np.all(XYZSile(f).read_trajectory(cache=True).offsets == traj.offsets)
+        assert osp.isfile(cache)
+        # The cached offsets are the same
+        assert np.all(XYZSile(f).read_trajectory(cache=True).offsets == traj.offsets)
+        sile = XYZSile(f)
+        sile.cache = True
+        assert np.all(sile.read_trajectory().offsets == traj.offsets)
@@ -0,0 +1,201 @@
+"""
+Lazy and random access to trajectories (multiple geometries) in text files
+"""
+from __future__ import print_function, division
+
+from numbers import Integral
+import os
+import os.path as osp
+
+import numpy as np
+
+import sisl._array as _a
+from sisl._help import is_python3
+
+
+__all__ = ['Trajectory']
+
+
+class Trajectory(object):
+    """ Random access to the frames (geometries) stored in a trajectory file
+
+    Upon creation the file is scanned once and the byte-offset of each frame
+    is stored. Optionally the offsets are cached next to the file (``.<file>.frames.npz``)
+    such that subsequent uses of the same file does not require scanning the file.
+    The cache is re-created if the file is changed.
+
+    Only the frames that are requested will be read and converted to `Geometry` objects.
+
+    This object should not be created directly, rather use the ``read_trajectory``
+    method of the siles supporting trajectories.
+
+    Parameters
+    ----------
+    sile : Sile
+       the sile containing the trajectory, it should implement ``_r_trajectory_offsets(fh)``
+       and ``_r_trajectory_frame()``
+    cache : bool, optional
+       whether the frame offsets are read from/stored in a cache file, default to
+       the ``cache`` attribute of `sile` (see `Sile.cache`)
+
+    Examples
+    --------
+    >>> traj = XYZSile('md.xyz').read_trajectory() # doctest: +SKIP
+    >>> len(traj) # number of frames # doctest: +SKIP
+    >>> traj[-1] # last geometry # doctest: +SKIP
+    >>> traj[::10] # every 10th geometry # doctest: +SKIP
+    >>> traj.xyz().shape == (len(traj), traj[0].na, 3) # doctest: +SKIP
+    True
+    """
+
+    def __init__(self, sile, cache=None):
+        if cache is None:
+            cache = getattr(sile, 'cache', False) is True
+        # Create a separate sile to not interfere with any
+        # opened files of the passed sile.
+        self._sile = sile.__class__(sile.file)
+        self._offsets = self._read_offsets(cache)
+
+    def __repr__(self):
+        return '{}{{{}, frames: {}}}'.format(self.__class__.__name__, self._sile.file, len(self))
+
+    @property
+    def file(self):
+        """ The file containing the trajectory """
+        return self._sile.file
+
+    @property
+    def offsets(self):
+        """ Byte-offsets for each frame in the file """
+        return self._offsets
+
+    def _cache_file(self):
+        """ File name of the cached frame offsets """
+        d, f = osp.split(self.file)
+        return osp.join(d, '.' + f + '.frames.npz')
+
+    def _read_offsets(self, cache):
+        """ Read the offsets from the cache, or scan the file """
+        st = os.stat(self.file)
+        key = _a.arrayd([st.st_size, st.st_mtime])
+
+        cache_file = self._cache_file()
+        if cache and osp.isfile(cache_file):
+            try:
+                with np.load(cache_file) as c:
+                    if np.all(c['key'] == key):
+                        return c['offsets']
+            except Exception:
+                # A corrupt cache file is simply re-created
+                pass
+
+        with open(self.file, 'rb') as fh:
+            offsets = _a.arrayl(self._sile._r_trajectory_offsets(fh))
+
+        if cache:
+            try:
+                with open(cache_file, 'wb') as fh:
+                    np.savez(fh, key=key, offsets=offsets)
+            except (IOError, OSError):
+                # Allowed to fail (read-only directories)
+                pass
+
+        return offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _frames(self, frames):
+        """ Generator for the geometries of the frames (opens the file once) """
+        sile = self._sile
+        # The offsets are byte-offsets which are only valid for binary file handles
+        with open(self.file, 'rb') as fh:
+            fh = _BinaryLines(fh)
+            try:
+                for i in frames:
+                    sile.fh = fh
+                    sile._line = 0
+                    fh.seek(self._offsets[i])
+                    yield sile._r_trajectory_frame()
+            finally:
+                sile.__dict__.pop('fh', None)
+
+    def _index(self, key):
+        """ Convert `key` to a list of frame indices """
+        n = len(self)
+        if isinstance(key, slice):
+            return list(range(*key.indices(n)))
+        idx = _a.asarrayl(key).ravel()
+        idx = np.where(idx < 0, idx + n, idx)
+        if np.any(idx < 0) or np.any(idx >= n):
+            raise IndexError(self.__class__.__name__ + ' frame index out of range')
+        return idx.tolist()
+
+    def __getitem__(self, key):
+        """ Return the geometry for a single frame, or a list of geometries for multiple frames """
+        if isinstance(key, Integral):
+            return list(self._frames(self._index(key)))[0]
+        return list(self._frames(self._index(key)))
+
+    def __iter__(self):
+        """ Iterate all geometries in the trajectory (read one frame at a time) """
+        return self._frames(range(len(self)))
+
+    def iter(self, frames=None):
+        """ Iterate geometries of the trajectory, one frame at a time
+
+        Parameters
+        ----------
+        frames : slice or array_like, optional
+           the frames to iterate, default to all frames
+        """
+        if frames is None:
+            return iter(self)
+        return self._frames(self._index(frames))
+
+    def xyz(self, frames=None):
+        """ Coordinates for the requested frames stacked in an array
+
+        Parameters
+        ----------
+        frames : int or slice or array_like, optional
+           the frames to return, default to all frames
+
+        Returns
+        -------
+        numpy.ndarray
+           coordinates with shape ``(nframes, na, 3)``, if `frames` is an integer
+           the first dimension is removed
+        """
+        if frames is None:
+            frames = slice(None)
+        xyz = np.stack([geom.xyz for geom in self._frames(self._index(frames))])
+        if isinstance(frames, Integral):
+            return xyz[0]
+        return xyz
+
+
+class _BinaryLines(object):
+    """ Line-based reading of a binary file handle as decoded text (positions are byte-offsets) """
+
+    def __init__(self, fh):
+        self._fh = fh
+
+    def readline(self):
+        line = self._fh.readline()
+        if is_python3:
+            return line.decode()
+        return line
+
+    def __iter__(self):
+        return iter(self.readline, '')
+
+    def tell(self):
+        return self._fh.tell()
+
+    def seek(self, offset, whence=0):
+        return self._fh.seek(offset, whence)
+
+    def close(self):
+        # The handle is owned by the trajectory
+        pass
@@ -5,6 +5,7 @@ import numpy as np
 # Import sile objects
 from .sile import SileVASP
 from ..sile import *
+from .._help import read_columns, columns_float
 
 # Import the geometry object
 from sisl.messages import warn
@@ -102,8 +103,9 @@ class CARSileVASP(SileVASP):
             warn(SileWarning(err))
 
         # Create list of atoms to be used subsequently
-        atom = [Atom[spec]
-                for spec, nsp in zip(species, species_count)
+        # (only one object per specie)
+        atom = [Atom[spec] for spec in species]
+        atom = [a for a, nsp in zip(atom, species_count)
                 for i in range(nsp)]
 
         # Read whether this is selective or direct
@@ -123,9 +125,7 @@ class CARSileVASP(SileVASP):
         # Number of atoms
         na = len(atom)
 
-        xyz = np.empty([na, 3], np.float64)
-        for ia in range(na):
-            xyz[ia, :] = list(map(float, self.readline().split()))
+        xyz = columns_float(read_columns(self, na, ncol=3))
         if cart:
             # The unit of the coordinates are cartesian
             xyz *= self._scale
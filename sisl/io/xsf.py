@@ -5,6 +5,8 @@ import numpy as np
 
 # Import sile objects
 from .sile import *
+from ._help import read_columns, columns_float
+from .trajectory import Trajectory
 
 # Import the geometry object
 from sisl import Geometry, Atom, SuperCell
@@ -19,6 +21,8 @@ class XSFSile(Sile):
     def _setup(self, *args, **kwargs):
         """ Setup the `XSFSile` after initialization """
         self._comment = ['#']
+        # Cell used for animation steps without cell vectors
+        self._trajectory_cell = None
 
     @Sile_fh_open
     def write_geometry(self, geom, fmt='.8f', data=None):
@@ -90,17 +94,35 @@ class XSFSile(Sile):
     def read_geometry(self, data=False):
         """ Returns Geometry object from the XSF file
 
+        For animation files (``ANIMSTEPS``) only the first step is returned, see
+        `read_trajectory` for reading all steps.
+
         Parameters
         ----------
         data: bool, optional
            in case the XSF file has auxiliary data, return that as well.
         """
+        geom, dat = self._r_geometry_frame()
+        if data:
+            return geom, dat
+        return geom
+
+    def _r_geometry_frame(self, cell=None):
+        """ Read the geometry and data from the current position until the first coordinate block is read
+
+        Parameters
+        ----------
+        cell : numpy.ndarray, optional
+           the default cell, if no cell vectors are found
+        """
         # Prepare containers...
-        cell = np.zeros([3, 3], np.float64)
+        if cell is None:
+            cell = np.zeros([3, 3], np.float64)
+        else:
+            cell = np.array(cell, np.float64)
         cell_set = False
         atom = []
-        xyz = []
-        na = 0
+        xyz = np.empty([0, 3], np.float64)
 
         line = ' '
         while line != '':
@@ -109,15 +131,11 @@ class XSFSile(Sile):
 
             # We prefer the
             if line.startswith('CONVVEC') and not cell_set:
-                for i in [0, 1, 2]:
-                    line = self.readline()
-                    cell[i, :] = [float(x) for x in line.split()]
+                cell[:, :] = columns_float(read_columns(self, 3, ncol=3))
 
             elif line.startswith('PRIMVEC'):
                 cell_set = True
-                for i in [0, 1, 2]:
-                    line = self.readline()
-                    cell[i, :] = [float(x) for x in line.split()]
+                cell[:, :] = columns_float(read_columns(self, 3, ncol=3))
 
             elif line.startswith('PRIMCOORD'):
                 # First read # of atoms
@@ -125,28 +143,66 @@ class XSFSile(Sile):
                 na = int(line[0])
 
                 # currently line[1] is unused!
-                for i in range(na):
-                    line = self.readline().split()
-                    atom.append(int(line[0]))
-                    xyz.append([float(x) for x in line[1:]])
+                cols = read_columns(self, na)
+                atom = cols[:, 0].astype(np.int32)
+                xyz = columns_float(cols[:, 1:])
+                break
 
-        xyz = np.array(xyz, np.float64)
-        if data:
-            dat = None
+        dat = None
         if xyz.shape[1] == 6:
             dat = xyz[:, 3:]
             xyz = xyz[:, :3]
 
         if len(atom) == 0:
             geom = Geometry(xyz, sc=SuperCell(cell))
-        elif len(atom) == 1 and atom[0].Z == -999:
+        elif len(atom) == 1 and atom[0] == -999:
             geom = None
         else:
             geom = Geometry(xyz, atom=atom, sc=SuperCell(cell))
 
-        if data:
-            return geom, dat
-        return geom
+        return geom, dat
+
+    def read_trajectory(self, cache=None):
+        """ Returns a `Trajectory` object for lazy and random access to all steps in an XSF animation file
+
+        Parameters
+        ----------
+        cache : bool, optional
+           whether the frame offsets are cached next to the file, default to `Sile.cache`
+        """
+        return Trajectory(self, cache)
+
+    @staticmethod
+    def _r_trajectory_offsets(fh):
+        """ Byte-offsets of all steps in the binary file handle `fh`
+
+        A step starts at its cell vectors (if present) or at the coordinates.
+        """
+        offsets = []
+        offset = 0
+        cell = None
+        for line in iter(fh.readline, b''):
+            if line.startswith((b'PRIMVEC', b'CONVVEC')):
+                if cell is None:
+                    cell = offset
+            elif line.startswith(b'PRIMCOORD'):
+                if cell is None:
+                    offsets.append(offset)
+                else:
+                    offsets.append(cell)
+                cell = None
+            offset += len(line)
+        return offsets
+
+    def _r_trajectory_frame(self):
+        """ Read the geometry of the step at the current position in the file """
+        if self._trajectory_cell is None:
+            # The cell may only be defined once for all steps
+            pos = self.fh.tell()
+            self.fh.seek(0)
+            self._trajectory_cell = self._r_geometry_frame()[0].cell
+            self.fh.seek(pos)
+        return self._r_geometry_frame(self._trajectory_cell)[0]
 
     @Sile_fh_open
     def write_grid(self, *args, **kwargs):
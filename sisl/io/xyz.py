@@ -7,6 +7,8 @@ import numpy as np
 
 # Import sile objects
 from .sile import *
+from ._help import read_columns, columns_float
+from .trajectory import Trajectory
 
 # Import the geometry object
 from sisl import Geometry, SuperCell
@@ -49,8 +51,41 @@ class XYZSile(Sile):
 
     @Sile_fh_open
     def read_geometry(self):
-        """ Returns Geometry object from the XYZ file """
+        """ Returns Geometry object from the XYZ file (the first frame) """
+        return self._r_trajectory_frame()
 
+    def read_trajectory(self, cache=None):
+        """ Returns a `Trajectory` object for lazy and random access to all frames in the XYZ file
+
+        Parameters
+        ----------
+        cache : bool, optional
+           whether the frame offsets are cached next to the file, default to `Sile.cache`
+        """
+        return Trajectory(self, cache)
+
+    @staticmethod
+    def _r_trajectory_offsets(fh):
+        """ Byte-offsets of all frames in the binary file handle `fh` """
+        offsets = []
+        offset = 0
+        line = fh.readline()
+        while line != b'':
+            if len(line.strip()) == 0:
+                # Skip empty lines between frames
+                offset += len(line)
+                line = fh.readline()
+                continue
+            offsets.append(offset)
+            offset += len(line)
+            # Skip comment and atoms
+            for _ in range(int(line) + 1):
+                offset += len(fh.readline())
+            line = fh.readline()
+        return offsets
+
+    def _r_trajectory_frame(self):
+        """ Read the geometry at the current position in the file """
         cell = np.asarray(np.diagflat([1] * 3), np.float64)
         nsc = [1, 1, 1]
         l = self.readline()
@@ -80,12 +115,9 @@ class XYZSile(Sile):
             finally:
                 cell.shape = (3, 3)
 
-        sp = [None] * na
-        xyz = np.empty([na, 3], np.float64)
-        for ia in range(na):
-            l = self.readline().split()
-            sp[ia] = l.pop(0)
-            xyz[ia, :] = [float(k) for k in l[:3]]
+        cols = read_columns(self, na, ncol=4)
+        sp = cols[:, 0]
+        xyz = columns_float(cols[:, 1:])
 
         # Fix the maximum size of the supercell
         # by adding 10 A vacuum
@@ -18,6 +18,7 @@ like `numpy` and `scipy`.
 
    inv
    solve
+   LUFactor
    eig
    eigh
    svd
@@ -30,6 +31,7 @@ like `numpy` and `scipy`.
 
    inv
    solve
+   LUFactor
    eig
    eigh
    svd
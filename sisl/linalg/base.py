@@ -7,6 +7,7 @@ from scipy.linalg.lapack import get_lapack_funcs, _compute_lwork
 from scipy.linalg.misc import LinAlgError, _datacopied
 from scipy._lib._util import _asarray_validated
 
+from numpy.linalg import inv as _np_inv, solve as _np_solve
 import scipy.linalg as sl
 import scipy.sparse.linalg as ssl
 
@@ -14,66 +15,96 @@ import scipy.sparse.linalg as ssl
 __all__ = []
 
 
+# Cache of the optimal LAPACK work-space sizes.
+# The work-space query only depends on the routine, data-type and
+# matrix size, so repeated calls (e.g. for many k-points) only query once.
+_lwork_cache = dict()
+
+
+def _lwork(name, a, n, **kwargs):
+    """ Optimal work-space size for the LAPACK routine `name` with matrices like `a` of size `n` """
+    func = get_lapack_funcs(name + '_lwork', (a,))
+    key = (func.typecode, name, n) + tuple(sorted(kwargs.items()))
+    lwork = _lwork_cache.get(key, None)
+    if lwork is None:
+        lwork = _compute_lwork(func, n, **kwargs)
+        _lwork_cache[key] = lwork
+    return lwork
+
+
+def _check_info(info, name):
+    if info > 0:
+        raise LinAlgError("Singular matrix")
+    if info < 0:
+        raise ValueError('illegal value in %d-th argument of internal '
+                         '%s' % (-info, name))
+
+
 def inv(a, overwrite_a=False):
     """
     Inverts a matrix
 
     Parameters
     ----------
-    a : (N, N) array_like
-       the matrix to be inverted.
+    a : (N, N) or (M, N, N) array_like
+       the matrix to be inverted, a stack of matrices are inverted individually.
     overwrite_a : bool, optional
        whether we are allowed to overwrite the matrix `a`
 
     Returns
     -------
-    x : (N, N) ndarray
+    x : (N, N) or (M, N, N) ndarray
         The inverted matrix
     """
     a1 = atleast_2d(_asarray_validated(a, check_finite=False))
+    if a1.ndim > 2:
+        # Stacked matrices are looped in C
+        return _np_inv(a1)
 
     overwrite_a = overwrite_a or _datacopied(a1, a)
 
     if a1.shape[0] != a1.shape[1]:
         raise ValueError('Input a needs to be a square matrix.')
 
-    getrf, getri, getri_lwork = get_lapack_funcs(('getrf', 'getri',
-                                                  'getri_lwork'), (a1,))
+    getrf, getri = get_lapack_funcs(('getrf', 'getri'), (a1,))
     lu, piv, info = getrf(a1, overwrite_a=overwrite_a)
     if info == 0:
-        lwork = _compute_lwork(getri_lwork, a1.shape[0])
-        lwork = int(1.01 * lwork)
+        lwork = int(1.01 * _lwork('getri', a1, a1.shape[0]))
         x, info = getri(lu, piv, lwork=lwork, overwrite_lu=True)
-    if info > 0:
-        raise LinAlgError("Singular matrix")
-    if info < 0:
-        raise ValueError('illegal value in %d-th argument of internal '
-                         'getrf|getri' % -info)
+    _check_info(info, 'getrf|getri')
     return x
 
 
-def solve(a, b, overwrite_a=False, overwrite_b=False):
+def solve(a, b, overwrite_a=False, overwrite_b=False, assume_a='gen'):
     """
     Solve a linear system ``a x = b``
 
     Parameters
     ----------
-    a : (N, N) array_like
-       left-hand-side matrix
-    b : (N, NRHS) array_like
+    a : (N, N) or (M, N, N) array_like
+       left-hand-side matrix, a stack of matrices are solved individually
+    b : (N, NRHS) or (M, N, NRHS) array_like
        right-hand-side matrix
     overwrite_a : bool, optional
        whether we are allowed to overwrite the matrix `a`
     overwrite_b : bool, optional
        whether we are allowed to overwrite the matrix `b`
+    assume_a : {'gen', 'sym', 'her', 'pos'}
+       the type of the matrix `a`, general (LU), symmetric or Hermitian (Bunch-Kaufman)
+       or Hermitian positive definite (Cholesky).
+       Only the upper triangular part of `a` is used for the latter three.
+       Stacked matrices are always assumed general.
 
     Returns
     -------
-    x : (N, NRHS) ndarray
+    x : (N, NRHS) or (M, N, NRHS) ndarray
         solution matrix
     """
     a1 = atleast_2d(_asarray_validated(a, check_finite=False))
     b1 = atleast_1d(_asarray_validated(b, check_finite=False))
+    if a1.ndim > 2:
+        # Stacked matrices are looped in C
+        return _np_solve(a1, b1)
     n = a1.shape[0]
 
     overwrite_a = overwrite_a or _datacopied(a1, a)
@@ -98,19 +129,112 @@ def solve(a, b, overwrite_a=False, overwrite_b=False):
     else:
         b_is_1D = False
 
-    gesv = get_lapack_funcs('gesv', (a1, b1))
-    _, _, x, info = gesv(a1, b1, overwrite_a=overwrite_a, overwrite_b=overwrite_b)
-    if info > 0:
-        raise LinAlgError("Singular matrix")
-    if info < 0:
-        raise ValueError('illegal value in %d-th argument of internal '
-                         'gesv' % -info)
+    if assume_a == 'gen':
+        gesv = get_lapack_funcs('gesv', (a1, b1))
+        _, _, x, info = gesv(a1, b1, overwrite_a=overwrite_a, overwrite_b=overwrite_b)
+        name = 'gesv'
+    elif assume_a in ('sym', 'her'):
+        if assume_a == 'her' and a1.dtype.kind == 'c':
+            name = 'hesv'
+        else:
+            name = 'sysv'
+        sv = get_lapack_funcs(name, (a1, b1))
+        lwork = _lwork(name, a1, n)
+        _, _, x, info = sv(a1, b1, lwork=lwork, overwrite_a=overwrite_a, overwrite_b=overwrite_b)
+    elif assume_a == 'pos':
+        posv = get_lapack_funcs('posv', (a1, b1))
+        _, x, info = posv(a1, b1, overwrite_a=overwrite_a, overwrite_b=overwrite_b)
+        name = 'posv'
+    else:
+        raise ValueError("solve: unknown matrix type assume_a='{}', use one of "
+                         "'gen', 'sym', 'her' or 'pos'".format(assume_a))
+    _check_info(info, name)
+
     if b_is_1D:
         return x.ravel()
 
     return x
 
 
+class LUFactor(object):
+    """ LU factorization of a square matrix which may be re-used for many right-hand sides
+
+    Parameters
+    ----------
+    a : (N, N) array_like
+       the matrix to be factorized
+    overwrite_a : bool, optional
+       whether we are allowed to overwrite the matrix `a` (with the factorization)
+
+    Examples
+    --------
+    >>> lu = LUFactor(a) # doctest: +SKIP
+    >>> x1 = lu.solve(b1) # doctest: +SKIP
+    >>> x2 = lu.solve(b2, trans=2) # solve a^H x2 = b2 # doctest: +SKIP
+    """
+
+    def __init__(self, a, overwrite_a=False):
+        a1 = atleast_2d(_asarray_validated(a, check_finite=False))
+        overwrite_a = overwrite_a or _datacopied(a1, a)
+        if a1.ndim != 2 or a1.shape[0] != a1.shape[1]:
+            raise ValueError('Input a needs to be a square matrix.')
+        getrf, = get_lapack_funcs(('getrf',), (a1,))
+        self._lu, self._piv, info = getrf(a1, overwrite_a=overwrite_a)
+        _check_info(info, 'getrf')
+        # Up-cast factors (created on demand)
+        self._lu_c = None
+
+    @property
+    def shape(self):
+        """ Shape of the factorized matrix """
+        return self._lu.shape
+
+    @property
+    def dtype(self):
+        """ Data-type of the factorized matrix """
+        return self._lu.dtype
+
+    def solve(self, b, trans=0, overwrite_b=False):
+        """ Solve the linear system ``a x = b`` using the factorization
+
+        Parameters
+        ----------
+        b : (N, NRHS) array_like
+           right-hand-side matrix
+        trans : {0, 1, 2}
+           solve ``a x = b`` (0), ``a^T x = b`` (1) or ``a^H x = b`` (2)
+        overwrite_b : bool, optional
+           whether we are allowed to overwrite the matrix `b`
+        """
+        b1 = atleast_1d(_asarray_validated(b, check_finite=False))
+        overwrite_b = overwrite_b or _datacopied(b1, b)
+        if b1.shape[0] != self._lu.shape[0]:
+            raise ValueError('Input b has to have same number of rows as '
+                             'the factorized matrix')
+        lu = self._lu
+        getrs, = get_lapack_funcs(('getrs',), (lu, b1))
+        if getrs.dtype != lu.dtype:
+            # A complex right-hand side requires complex factors (the factors
+            # of the real matrix are also the factors of the complex matrix)
+            if self._lu_c is None:
+                self._lu_c = lu.astype(getrs.dtype)
+            lu = self._lu_c
+        x, info = getrs(lu, self._piv, b1, trans=trans, overwrite_b=overwrite_b)
+        _check_info(info, 'getrs')
+        return x
+
+    def inv(self):
+        """ Inverse of the factorized matrix """
+        getri, = get_lapack_funcs(('getri',), (self._lu,))
+        lwork = int(1.01 * _lwork('getri', self._lu, self._lu.shape[0]))
+        x, info = getri(self._lu, self._piv, lwork=lwork, overwrite_lu=False)
+        _check_info(info, 'getri')
+        return x
+
+
+__all__ += ['LUFactor']
+
+
 def _append(name, suffix):
     return [name + s for s in suffix]
 
@@ -118,6 +242,13 @@ def _append(name, suffix):
 solve_destroy = _partial(solve, overwrite_a=True, overwrite_b=True)
 __all__ += _append('solve', ['', '_destroy'])
 
+# Solving a linear system with a Hermitian (positive definite) matrix
+solve_her = _partial(solve, assume_a='her')
+solve_her_destroy = _partial(solve, overwrite_a=True, overwrite_b=True, assume_a='her')
+solve_pos = _partial(solve, assume_a='pos')
+solve_pos_destroy = _partial(solve, overwrite_a=True, overwrite_b=True, assume_a='pos')
+__all__ += _append('solve_', ['her', 'her_destroy', 'pos', 'pos_destroy'])
+
 # Inversion of matrix
 inv_destroy = _partial(inv, overwrite_a=True)
 __all__ += _append('inv', ['', '_destroy'])
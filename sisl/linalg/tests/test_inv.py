@@ -25,3 +25,10 @@ def test_inv_d1():
     xs = sl.inv(a)
     x = inv_destroy(a)
     assert np.allclose(xs, x)
+
+
+def test_inv_batch():
+    a = np.random.rand(3, 10, 10)
+    x = inv(a)
+    for i in range(3):
+        assert np.allclose(sl.inv(a[i]), x[i])
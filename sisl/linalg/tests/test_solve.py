@@ -44,3 +44,60 @@ def test_solve4():
     x = solve_destroy(a, b)
     assert np.allclose(xs, x)
     assert x.shape == (10, )
+
+
+def test_solve_batch():
+    a = np.random.rand(4, 10, 10)
+    b = np.random.rand(4, 10, 3)
+    x = solve(a, b)
+    for i in range(4):
+        assert np.allclose(sl.solve(a[i], b[i]), x[i])
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.complex128])
+def test_solve_her_pos(dtype):
+    from sisl.linalg import solve_her, solve_pos
+    a = np.random.rand(10, 10).astype(dtype)
+    if np.iscomplexobj(a):
+        a += 1j * np.random.rand(10, 10)
+    a = a + a.conj().T
+    b = np.random.rand(10, 2).astype(dtype)
+    xs = sl.solve(a, b)
+    assert np.allclose(xs, solve_her(a, b))
+    assert np.allclose(xs, solve(a, b, assume_a='her'))
+    # positive definite
+    a += np.identity(10) * 20
+    assert np.allclose(sl.solve(a, b), solve_pos(a, b))
+
+
+def test_solve_assume_fail():
+    with pytest.raises(ValueError):
+        solve(np.identity(2), np.ones(2), assume_a='unknown')
+
+
+def test_lu_factor():
+    from sisl.linalg import LUFactor
+    a = np.random.rand(10, 10) + 1j * np.random.rand(10, 10)
+    ac = a.copy()
+    b = np.random.rand(10, 3)
+    lu = LUFactor(a)
+    assert np.allclose(a, ac)
+    assert lu.shape == (10, 10)
+    assert np.allclose(sl.solve(a, b), lu.solve(b))
+    assert np.allclose(sl.solve(a.T, b), lu.solve(b, trans=1))
+    assert np.allclose(sl.solve(a.conj().T, b), lu.solve(b, trans=2))
+    assert np.allclose(sl.inv(a), lu.inv())
+
+
+def test_lu_factor_real_complex_rhs():
+    from sisl.linalg import LUFactor
+    a = np.random.rand(10, 10)
+    b = np.random.rand(10, 3) + 1j * np.random.rand(10, 3)
+    lu = LUFactor(a)
+    assert np.allclose(a.dot(lu.solve(b)), b)
+    assert np.allclose(a.T.dot(lu.solve(b, trans=1)), b)
+    assert np.allclose(a.T.dot(lu.solve(b, trans=2)), b)
+    # Real right-hand sides are still solved
+    x = lu.solve(b.real)
+    assert x.dtype == np.float64
+    assert np.allclose(a.dot(x), b.real)
@@ -51,6 +51,7 @@ Physical quantites
    DensityMatrix
    Hamiltonian
    EigenState
+   KPM
    Hessian
    SelfEnergy
    SemiInfinite
@@ -75,6 +76,7 @@ Distribution functions
    distribution
    gaussian
    lorentzian
+   kpm_kernel
 
 """
 from .distribution_function import *
@@ -82,6 +84,7 @@ from .brillouinzone import *
 from .spin import *
 from .sparse import *
 from .state import *
+from .kpm import *
 
 
 from .energydensitymatrix import *
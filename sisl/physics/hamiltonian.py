@@ -13,6 +13,7 @@ import sisl._array as _a
 from sisl import Geometry
 from sisl.eigensystem import EigenSystem
 from .distribution_function import distribution as dist_func
+from .kpm import KPM
 from .spin import Spin
 from .sparse import SparseOrbitalBZSpin
 
@@ -267,6 +268,58 @@ class Hamiltonian(SparseOrbitalBZSpin):
         """
         return self.eigenstate(k, **kwargs).PDOS(E, distribution)
 
+    def kpm(self, k=(0, 0, 0), N=256, R=10, orbital=None, bounds=None, **kwargs):
+        r""" Calculate the Chebyshev moments for kernel polynomial method (KPM) spectra at `k`
+
+        The moments only requires sparse matrix-vector products with :math:`\mathbf H(k)`, hence this
+        is the method of choice for the DOS of large (disordered) systems where the eigenvalues can not be calculated.
+        Non-orthogonal basis sets are handled using a sparse LU factorization of :math:`\mathbf S(k)`.
+
+        Parameters
+        ----------
+        k : array_like, optional
+            k-point at which the moments are calculated
+        N : int, optional
+            number of moments, the energy resolution is roughly the spectral width divided by `N`
+        R : int, optional
+            number of random vectors used for the stochastic estimate of the DOS moments
+        orbital : array_like of int, optional
+            orbitals for which the projected DOS moments are calculated
+        bounds : (float, float), optional
+            lower and upper bounds of the spectrum, default to an estimate using Arnoldi iterations
+        **kwargs : optional
+            ``gauge``, ``dtype`` and ``spin`` are passed to `Hk`, the remaining arguments are
+            passed to `KPM`
+
+        Examples
+        --------
+        >>> kpm = H.kpm(N=1024, orbital=[0, 1]) # doctest: +SKIP
+        >>> DOS = kpm.DOS(E) # doctest: +SKIP
+        >>> broad_DOS = kpm.DOS(E, N=256) # doctest: +SKIP
+        >>> PDOS = kpm.PDOS(E, kernel='lorentz') # doctest: +SKIP
+
+        See Also
+        --------
+        KPM : the object holding the moments
+        DOS : Calculate DOS from the eigenvalues
+        PDOS : Calculate projected DOS from the eigenstates
+
+        Returns
+        -------
+        KPM
+        """
+        opt = {'gauge': kwargs.pop('gauge', 'R'),
+               'dtype': kwargs.pop('dtype', None)}
+        spin = kwargs.pop('spin', 0)
+        if self.spin.kind == Spin.POLARIZED:
+            H = self.Hk(k, spin=spin, **opt)
+        else:
+            H = self.Hk(k, **opt)
+        S = None
+        if not self.orthogonal:
+            S = self.Sk(k, **opt)
+        return KPM(H, S, N=N, R=R, orbital=orbital, bounds=bounds, **kwargs)
+
 
 class EigenState(EigenSystem):
     """ Eigenstates associated by a Hamiltonian object
@@ -0,0 +1,270 @@
+""" Kernel polynomial method (KPM) for spectral quantities of large sparse matrices
+
+The spectral quantities are expanded in Chebyshev polynomials of the (scaled)
+matrix. Only sparse matrix-vector products are required, hence the DOS of
+systems with millions of orbitals is reachable.
+"""
+from __future__ import print_function, division
+
+import numpy as np
+from numpy import pi
+from numpy.polynomial.chebyshev import chebval
+from scipy.sparse import isspmatrix
+from scipy.sparse.linalg import splu, LinearOperator, eigs
+
+import sisl._array as _a
+from sisl._help import _range as range
+
+__all__ = ['KPM', 'kpm_kernel']
+
+
+def kpm_kernel(method, N, lambda_=4.):
+    r""" Kernel coefficients :math:`g_n` used to damp the Gibbs oscillations of a truncated Chebyshev series
+
+    The Jackson kernel is calculated as:
+
+    .. math::
+        g_n = \frac{(N-n+1)\cos\frac{\pi n}{N+1} + \sin\frac{\pi n}{N+1}\cot\frac{\pi}{N+1}}{N+1}
+
+    which approximates a Gaussian broadening with :math:`\sigma\approx\pi/N` (in scaled units).
+
+    The Lorentz kernel is calculated as:
+
+    .. math::
+        g_n = \frac{\sinh[\lambda(1-n/N)]}{\sinh\lambda}
+
+    which approximates a Lorentzian broadening with :math:`\gamma=\lambda/N` (in scaled units).
+
+    Parameters
+    ----------
+    method : {'jackson', 'lorentz', 'dirichlet'}
+        the kernel, ``'dirichlet'`` is no damping (:math:`g_n = 1`)
+    N : int
+        number of moments
+    lambda_ : float, optional
+        the :math:`\lambda` parameter for the Lorentz kernel
+
+    Returns
+    -------
+    numpy.ndarray : the kernel coefficients, length `N`
+    """
+    n = _a.arangei(N)
+    method = method.lower()
+    if method == 'jackson':
+        q = pi / (N + 1)
+        return ((N - n + 1) * np.cos(q * n) + np.sin(q * n) / np.tan(q)) / (N + 1)
+    elif method in ['lorentz', 'lorentzian']:
+        return np.sinh(lambda_ * (1 - n / N)) / np.sinh(lambda_)
+    elif method == 'dirichlet':
+        return _a.onesd(N)
+    raise ValueError("kpm_kernel currently only implements 'jackson', 'lorentz' or 'dirichlet' kernels")
+
+
+class KPM(object):
+    r""" Chebyshev moments of a matrix for kernel polynomial method (KPM) spectra
+
+    The moments are the (stochastic) traces and diagonal elements
+
+    .. math::
+        \mu_n = \frac1{N_o}\mathrm{Tr}\,T_n(\tilde{\mathbf H}),\qquad
+        \mu_n^i = [T_n(\tilde{\mathbf H})]_{ii}
+
+    of the Chebyshev polynomials of the scaled matrix :math:`\tilde{\mathbf H} = (\mathbf S^{-1}\mathbf H - b)/a`
+    which has its spectrum in :math:`]-1;1[`.
+    The trace is estimated using random phase vectors.
+
+    The moments are calculated once, DOS and PDOS with different kernels and/or
+    fewer moments (broader spectra) are cheap to evaluate.
+    This object is typically created through `Hamiltonian.kpm`.
+
+    Parameters
+    ----------
+    H : scipy.sparse.spmatrix
+        the Hermitian matrix
+    S : scipy.sparse.spmatrix, optional
+        the overlap matrix (for non-orthogonal basis sets)
+    N : int, optional
+        number of moments
+    R : int, optional
+        number of random vectors used to estimate the trace (the error decreases as :math:`1/\sqrt{R N_o}`),
+        if 0 no DOS moments are calculated
+    orbital : array_like of int, optional
+        calculate the diagonal moments for these orbitals (for `PDOS`)
+    bounds : (float, float), optional
+        lower and upper bounds of the spectrum, default to an estimate using Arnoldi iterations
+    eps : float, optional
+        the spectrum is scaled to :math:`[-1+\epsilon/2;1-\epsilon/2]` to ensure stability
+    seed : int, optional
+        seed of the random vectors
+
+    Attributes
+    ----------
+    moments : numpy.ndarray
+        the DOS moments :math:`\mu_n` (normalized to :math:`\mu_0 = 1`)
+    orbital_moments : numpy.ndarray
+        the orbital moments :math:`\mu_n^i` with shape ``(len(orbital), N)``
+    """
+
+    def __init__(self, H, S=None, N=256, R=10, orbital=None, bounds=None, eps=0.02, seed=None):
+        self.no = H.shape[0]
+        self.orbital = None
+        if orbital is not None:
+            self.orbital = _a.asarrayi(orbital).ravel()
+
+        if S is None:
+            # Hermitian matrices allows the moment doubling
+            hermitian = True
+            op = H.dot
+        else:
+            hermitian = False
+            lu = splu(S.tocsc())
+            def op(v):
+                return lu.solve(H.dot(v))
+
+        if bounds is None:
+            bounds = self._bounds(H, S, op)
+        self.bounds = (float(bounds[0]), float(bounds[1]))
+        self.a = (self.bounds[1] - self.bounds[0]) / (2 - eps)
+        self.b = (self.bounds[1] + self.bounds[0]) / 2
+
+        a, b = self.a, self.b
+        def Hs(v):
+            return (op(v) - b * v) / a
+
+        self.moments = None
+        if R > 0:
+            rng = np.random.RandomState(seed)
+            phase = rng.rand(self.no, R)
+            if np.iscomplexobj(H):
+                v = np.exp(2j * pi * phase)
+            else:
+                v = np.where(phase < 0.5, -1., 1.)
+            self.moments = self._moments(Hs, v, N, hermitian).mean(0) / self.no
+
+        self.orbital_moments = None
+        if self.orbital is not None:
+            v = np.zeros([self.no, len(self.orbital)], H.dtype)
+            v[self.orbital, _a.arangei(len(self.orbital))] = 1.
+            self.orbital_moments = self._moments(Hs, v, N, hermitian)
+
+    @staticmethod
+    def _bounds(H, S, op):
+        """ Estimate the extremal eigenvalues of the problem """
+        no = H.shape[0]
+        if no < 3:
+            # Arnoldi requires more than 2 rows
+            H = H.toarray() if isspmatrix(H) else H
+            if S is None:
+                e = np.linalg.eigvals(H).real
+            else:
+                S = S.toarray() if isspmatrix(S) else S
+                e = np.linalg.eigvals(np.linalg.solve(S, H)).real
+            return e.min(), e.max()
+        A = LinearOperator(H.shape, matvec=op, dtype=H.dtype)
+        emin = eigs(A, k=1, which='SR', tol=1e-4, return_eigenvectors=False)[0].real
+        emax = eigs(A, k=1, which='LR', tol=1e-4, return_eigenvectors=False)[0].real
+        # Account for the tolerance of the eigenvalues
+        pad = (emax - emin) * 1e-3
+        return emin - pad, emax + pad
+
+    @staticmethod
+    def _moments(Hs, v, N, hermitian):
+        r""" Calculate moments :math:`\langle v|T_n(H)|v\rangle` for all columns of `v` (shape ``(ncol, N)``) """
+        def dot(x, y):
+            return (np.conj(x) * y).sum(0).real
+
+        mu = np.empty([v.shape[1], N])
+        a0 = v
+        a1 = Hs(v)
+        mu[:, 0] = dot(v, a0)
+        if N > 1:
+            mu[:, 1] = dot(v, a1)
+
+        if hermitian:
+            # Only N/2 matrix products are required using
+            #   mu[2n] = 2 <a_n|a_n> - mu[0]
+            #   mu[2n+1] = 2 <a_n+1|a_n> - mu[1]
+            n = 1
+            while 2 * n < N:
+                mu[:, 2*n] = 2 * dot(a1, a1) - mu[:, 0]
+                if 2 * n + 1 < N:
+                    a0, a1 = a1, 2 * Hs(a1) - a0
+                    mu[:, 2*n+1] = 2 * dot(a1, a0) - mu[:, 1]
+                n += 1
+        else:
+            for n in range(2, N):
+                a0, a1 = a1, 2 * Hs(a1) - a0
+                mu[:, n] = dot(v, a1)
+
+        return mu
+
+    def __len__(self):
+        """ Number of calculated moments """
+        if self.moments is None:
+            return self.orbital_moments.shape[1]
+        return len(self.moments)
+
+    def _spectrum(self, E, mu, N, kernel):
+        """ Reconstruct the spectral function from the moments `mu` (last dimension) """
+        if N is None:
+            N = mu.shape[-1]
+        elif N > mu.shape[-1]:
+            raise ValueError(self.__class__.__name__ + ' only has {} moments, {} were requested'.format(mu.shape[-1], N))
+        if isinstance(kernel, str):
+            kernel = kpm_kernel(kernel, N)
+        c = mu[..., :N] * kernel
+        c[..., 1:] *= 2
+        x = (_a.asarrayd(E) - self.b) / self.a
+        inside = np.abs(x) < 1
+        xi = x[inside]
+        out = np.zeros(c.shape[:-1] + x.shape)
+        out[..., inside] = chebval(xi, c.T) / (pi * self.a * np.sqrt(1 - xi ** 2))
+        return out
+
+    def DOS(self, E, N=None, kernel='jackson'):
+        r""" Calculate the DOS at energies `E` from the calculated moments
+
+        .. math::
+            \mathrm{DOS}(E) = \frac{N_o}{\pi a\sqrt{1-x^2}}\Big[g_0\mu_0 + 2\sum_{n=1}^{N-1} g_n\mu_nT_n(x)\Big],
+            \qquad x = (E - b) / a
+
+        The DOS integrates to the number of orbitals.
+
+        Parameters
+        ----------
+        E : array_like
+            energies to calculate the DOS at
+        N : int, optional
+            number of moments used (default to all), fewer moments yields a broader spectrum
+        kernel : str or array_like, optional
+            the kernel used to damp the Gibbs oscillations (see `kpm_kernel`) or the kernel coefficients
+
+        Returns
+        -------
+        numpy.ndarray : DOS calculated at energies, has same length as `E`
+        """
+        if self.moments is None:
+            raise ValueError(self.__class__.__name__ + '.DOS requires moments calculated with random vectors')
+        return self._spectrum(E, self.moments, N, kernel) * self.no
+
+    def PDOS(self, E, N=None, kernel='jackson'):
+        r""" Calculate the projected DOS (local DOS) on the selected orbitals at energies `E`
+
+        The projected DOS on each orbital integrates to 1.
+
+        Parameters
+        ----------
+        E : array_like
+            energies to calculate the projected DOS at
+        N : int, optional
+            number of moments used (default to all), fewer moments yields a broader spectrum
+        kernel : str or array_like, optional
+            the kernel used to damp the Gibbs oscillations (see `kpm_kernel`) or the kernel coefficients
+
+        Returns
+        -------
+        numpy.ndarray : projected DOS with shape ``(len(orbital), len(E))``
+        """
+        if self.orbital_moments is None:
+            raise ValueError(self.__class__.__name__ + '.PDOS requires orbitals to be specified')
+        return self._spectrum(E, self.orbital_moments, N, kernel)
@@ -57,7 +57,9 @@ class SemiInfinite(SelfEnergy):
         bloch : array_like, optional
            Bloch-expansion for each of the lattice vectors (`1` for no expansion)
            The resulting self-energy will have dimension
-           equal to `len(obj) * np.product(bloch)`.
+           equal to `len(obj) * np.product(bloch)`, i.e. the self-energy of
+           ``spgeom.tile(bloch[0], 0).tile(bloch[1], 1).tile(bloch[2], 2)``.
+           The Bloch-expansion along the semi-infinite direction must be 1.
         """
         self.eta = eta
         if bloch is None:
@@ -82,6 +84,9 @@ class SemiInfinite(SelfEnergy):
         elif INF.endswith('C'):
             self.semi_inf = 2
 
+        if self.bloch[self.semi_inf] != 1:
+            raise ValueError(self.__class__.__name__ + ": Bloch-expansion along the semi-infinite direction is not allowed.")
+
         # Check that the Hamiltonian does have a non-zero V along the semi-infinite direction
         if spgeom.geom.sc.nsc[self.semi_inf] == 1:
             warn('Creating a semi-infinite self-energy with no couplings along the semi-infinite direction')
@@ -101,18 +106,90 @@ class SemiInfinite(SelfEnergy):
         if k is None:
             k = _a.zerosd([3])
         else:
-            k = self._fill(k, np.float64)
+            # Copy to not change the passed k-point
+            k = _a.arrayd(self._fill(k, np.float64))
             k[self.semi_inf] = 0.
         return k
 
+    def _bloch(self, func, k):
+        r""" Bloch-expand the matrices calculated by `func` for the unit-cell
+
+        The matrix of the repeated cell at :math:`\mathbf k` is assembled from
+        the unit-cell matrices at :math:`\mathbf k_j = (\mathbf k + \mathbf j) / \mathbf B`,
+        :math:`0\le j_i<B_i`, (Bloch's theorem)
+
+        .. math::
+            \mathbf M_{mn}(\mathbf k) = \frac1{\prod_i B_i}\sum_j e^{i2\pi \mathbf k_j\cdot(\mathbf R_n - \mathbf R_m)}
+               \mathbf M(\mathbf k_j)
+
+        where :math:`\mathbf R_m` is the (integer) offset of the :math:`m`'th repeated unit-cell.
+
+        Parameters
+        ----------
+        func : callable
+           ``func(k)`` returns the unit-cell matrices (last two dimensions) at the k-point `k`
+        k : numpy.ndarray
+           k-point in units of the reciprocal lattice vectors of the repeated cell
+        """
+        B = self.bloch
+        nb = np.prod(B)
+        if nb == 1:
+            return func(k)
+
+        # Offsets of the repeated cells, the first lattice vector being the fastest index
+        R = _a.emptyi([nb, 3])
+        R[:, 0] = np.tile(_a.arangei(B[0]), B[1] * B[2])
+        R[:, 1] = np.tile(np.repeat(_a.arangei(B[1]), B[0]), B[2])
+        R[:, 2] = np.repeat(_a.arangei(B[2]), B[0] * B[1])
+
+        M = None
+        for j in R:
+            kj = (k + j) / B
+            M_k = func(kj)
+            if M is None:
+                no = M_k.shape[-1]
+                M = np.zeros(M_k.shape[:-2] + (nb, no, nb, no), dtype=M_k.dtype)
+            phase = np.exp(2j * np.pi * dot(R, kj))
+            for m in range(nb):
+                for n in range(nb):
+                    M[..., m, :, n, :] += M_k * (np.conjugate(phase[m]) * phase[n])
+        M /= nb
+        return M.reshape(M.shape[:-4] + (nb * no, nb * no))
+
 
 class RecursiveSI(SemiInfinite):
-    """ Self-energy object using the Lopez-Sancho Lopez-Sancho algorithm """
+    """ Self-energy object using the Lopez-Sancho Lopez-Sancho algorithm
+
+    Parameters
+    ----------
+    spgeom : SparseGeometry
+       any sparse geometry matrix which may return matrices
+    infinite : str
+       axis specification for the semi-infinite direction (`+A`/`-A`/`+B`/`-B`/`+C`/`-C`)
+    eta : float, optional
+       the default imaginary part of the self-energy calculation
+    bloch : array_like, optional
+       Bloch-expansion for each of the lattice vectors (`1` for no expansion)
+    method : {'sancho', 'eig'}
+       the default method used to calculate the self-energy, see `self_energy`
+    """
+
+    def __init__(self, spgeom, infinite, eta=1e-6, bloch=None, method='sancho'):
+        self.method = self._check_method(method)
+        super(RecursiveSI, self).__init__(spgeom, infinite, eta, bloch)
 
     def __getattr__(self, attr):
         """ Overload attributes from the hosting object """
         return getattr(self.spgeom0, attr)
 
+    def _check_method(self, method):
+        """ Return the lower-cased method name, or raise an error if the method does not exist """
+        m = method.lower()
+        if m not in ('sancho', 'eig'):
+            raise ValueError(self.__class__.__name__ + ": unknown self-energy method '{}', "
+                             "use one of 'sancho' or 'eig'".format(method))
+        return m
+
     def _setup(self, spgeom):
         """ Setup the Lopez-Sancho internals for easy axes """
 
@@ -147,9 +224,184 @@ class RecursiveSI(SemiInfinite):
         # Delete all values in columns, but keep them to retain the supercell information
         self.spgeom1._csr.delete_columns(cols, keep_shape=True)
 
-    def self_energy(self, E, k=None, eta=None, dtype=None, eps=1e-14, bulk=False):
+        # Orbitals coupling to the neighbouring cells (rows and columns of the coupling matrix)
+        # All other orbitals may be down-folded before solving for the self-energy
+        csr = self.spgeom1._csr
+        coupled = np.zeros([n], np.bool_)
+        coupled[(csr.ncol > 0).nonzero()[0]] = True
+        coupled[csr.col[array_arange(csr.ptr[:-1], n=csr.ncol)] % n] = True
+        self._coupled = coupled.nonzero()[0]
+        self._internal = (~coupled).nonzero()[0]
+
+    def _sancho(self, GB, alpha, beta, eps):
+        r""" Lopez-Sancho recursion, returns the self-energy :math:`\boldsymbol\Sigma`
+
+        The two linear systems in each iteration are solved using a single
+        LU-factorization of `GB` and the four matrix products are done
+        in a single (blocked) matrix product.
+        """
+        n = GB.shape[0]
+        solve = lin.solve
+
+        # Surface self-energy
+        SE = np.zeros_like(GB)
+
+        # [alpha beta] (right-hand-sides) and [alpha; beta] (left products)
+        ab_r = np.empty([n, n * 2], dtype=GB.dtype)
+        ab_c = np.empty([n * 2, n], dtype=GB.dtype)
+        ab_r[:, :n] = alpha
+        ab_r[:, n:] = beta
+        ab_c[:n, :] = alpha
+        ab_c[n:, :] = beta
+
+        while True:
+            # [tA tB] = GB^-1 [alpha beta]
+            tAB = solve(GB, ab_r, overwrite_b=True)
+            # [[alpha tA, alpha tB], [beta tA, beta tB]]
+            prod = dot(ab_c, tAB)
+
+            tmp = prod[:n, n:]
+            # Update bulk Green function
+            GB -= tmp
+            GB -= prod[n:, :n]
+            # Update surface self-energy
+            SE += tmp
+
+            # Convergence criteria, it could be stricter
+            if np.amax(np.abs(tmp)) < eps:
+                return SE
+
+            # Update forward/backward
+            ab_r[:, :n] = prod[:n, :n]
+            ab_r[:, n:] = prod[n:, n:]
+            ab_c[:n, :] = prod[:n, :n]
+            ab_c[n:, :] = prod[n:, n:]
+
+    def _eig(self, GB, alpha, beta):
+        r""" Generalized eigenvalue (transfer matrix) method, returns the self-energy :math:`\boldsymbol\Sigma`
+
+        The Bloch solutions :math:`\psi_{j+1} = \lambda\psi_j` of the semi-infinite lead
+        are found from the generalized eigenvalue problem
+
+        .. math::
+            \begin{bmatrix} \mathbf 0 & \mathbf I \\ -\boldsymbol\beta & \mathbf G_B \end{bmatrix}
+            \begin{bmatrix} \mathbf u \\ \lambda\mathbf u \end{bmatrix} = \lambda
+            \begin{bmatrix} \mathbf I & \mathbf 0 \\ \mathbf 0 & \boldsymbol\alpha \end{bmatrix}
+            \begin{bmatrix} \mathbf u \\ \lambda\mathbf u \end{bmatrix}
+
+        The :math:`n` solutions decaying into the lead (:math:`|\lambda|<1`) define the transfer matrix
+        :math:`\mathbf T = \mathbf U\boldsymbol\Lambda\mathbf U^{-1}` and
+        :math:`\boldsymbol\Sigma = \boldsymbol\alpha\mathbf T`.
+        """
+        n = GB.shape[0]
+        A = np.zeros([n * 2, n * 2], dtype=GB.dtype)
+        B = np.zeros([n * 2, n * 2], dtype=GB.dtype)
+        idx = _a.arangei(n)
+        A[idx, idx + n] = 1.
+        A[n:, :n] = -beta
+        A[n:, n:] = GB
+        B[idx, idx] = 1.
+        B[n:, n:] = alpha
+        lam, U = lin.eig_destroy(A, B)
+        del A, B
+
+        # Infinite eigenvalues (non-invertible coupling) are growing solutions
+        lam[~np.isfinite(lam)] = np.inf
+        idx = np.argsort(np.abs(lam))[:n]
+        lam = lam[idx]
+        U = U[:n, idx]
+
+        # T = U lam U^-1  =>  U^T T^T = (U lam)^T
+        UL = (U * lam.reshape(1, -1)).T
+        T = lin.LUFactor(U, overwrite_a=True).solve(UL, trans=1, overwrite_b=True).T
+        return dot(alpha, T)
+
+    def _k_matrices(self, k, dtype):
+        """ Dense matrices at the k-point `k` (independent of the energy)
+
+        Returns
+        -------
+        P0, S0 : numpy.ndarray
+           matrix and overlap of the principal cell
+        P1, S1 : numpy.ndarray
+           coupling matrix and overlap to the neighbouring cell (`S1` is ``None`` for orthogonal basis)
+        """
+        sp0 = self.spgeom0
+        sp1 = self.spgeom1
+        P0 = sp0.Pk(k, dtype=dtype, format='array')
+        S0 = sp0.Sk(k, dtype=dtype, format='array')
+        P1 = sp1.Pk(k, dtype=dtype, format='array')
+        if sp1.orthogonal:
+            S1 = None
+        else:
+            S1 = sp1.Sk(k, dtype=dtype, format='array')
+        return P0, S0, P1, S1
+
+    def _self_energy(self, Z, mats, eps, bulk, method):
+        """ Calculate the self-energy at the complex energy `Z` from the matrices returned by `_k_matrices` """
+        P0, S0, P1, S1 = mats
+
+        # As the SparseGeometry inherently works for
+        # orthogonal and non-orthogonal basis, there is no
+        # need to have two algorithms.
+        GB = S0 * Z - P0
+
+        if S1 is None:
+            alpha = P1
+            beta  = np.conjugate(np.transpose(P1))
+        else:
+            alpha = P1 - S1 * Z
+            beta  = np.conjugate(np.transpose(P1 - S1 * np.conjugate(Z)))
+
+        c = self._coupled
+        i = self._internal
+        if len(i) > 0:
+            # Down-fold the internal orbitals
+            cc = np.ix_(c, c)
+            GBc = GB[cc] - dot(GB[np.ix_(c, i)],
+                               lin.solve(GB[np.ix_(i, i)], GB[np.ix_(i, c)], overwrite_a=True, overwrite_b=True))
+            alpha = alpha[cc]
+            beta = beta[cc]
+        else:
+            GBc = np.copy(GB)
+
+        if method == 'sancho':
+            SE = self._sancho(GBc, alpha, beta, eps)
+        else:
+            SE = self._eig(GBc, alpha, beta)
+        del GBc, alpha, beta
+
+        if len(i) > 0:
+            if bulk:
+                GB[cc] -= SE
+                return GB
+            GB.fill(0.)
+            GB[cc] = SE
+            return GB
+
+        if bulk:
+            GB -= SE
+            return GB
+        return SE
+
+    def _Z(self, E, eta):
+        """ Complex energies from `E` and `eta` (the real part of `E` is used) """
+        if eta is None:
+            eta = self.eta
+        return np.real(E) + 1j * eta
+
+    def self_energy(self, E, k=None, eta=None, dtype=None, eps=1e-14, bulk=False, method=None):
         r""" Return a dense matrix with the self-energy at energy `E` and k-point `k` (default Gamma).
 
+        Orbitals that do not couple to the neighbouring cells are down-folded (exactly) before
+        the self-energy is calculated. This greatly reduces the computational cost for electrodes
+        with many orbitals along the semi-infinite direction.
+
+        If the object has a Bloch-expansion the self-energy is calculated for the unit-cell
+        at the ``np.prod(bloch)`` unfolded k-points and the self-energy of the repeated cell is assembled
+        using Bloch's theorem. This is much faster than calculating the self-energy of the
+        repeated cell directly.
+
         Parameters
         ----------
         E : float
@@ -164,73 +416,107 @@ class RecursiveSI(SemiInfinite):
         dtype : numpy.dtype
           the resulting data type
         eps : float, optional
-          convergence criteria for the recursion
+          convergence criteria for the recursion (only used for ``method='sancho'``)
         bulk : bool, optional
           if true, :math:`E\cdot \mathbf S - \mathbf H -\boldsymbol\Sigma` is returned, else
           :math:`\boldsymbol\Sigma` is returned (default).
+        method : {'sancho', 'eig'}
+          the algorithm used for calculating the self-energy, defaults to the method
+          with which the object was created.
+          ``'sancho'`` uses the Lopez-Sancho recursion while ``'eig'`` uses the generalized
+          eigenvalue (transfer matrix) method which does not iterate, i.e. its cost is
+          independent of `eta`.
+
+        See Also
+        --------
+        self_energies : calculate the self-energy for many energies at the same k-point
         """
-        if eta is None:
-            eta = self.eta
-        try:
-            Z = E.real + 1j * eta
-        except:
-            Z = E + 1j * eta
-
-        # Get k-point
-        k = self._correct_k(k)
-
+        if method is None:
+            method = self.method
+        else:
+            method = self._check_method(method)
         if dtype is None:
             dtype = np.complex128
 
-        sp0 = self.spgeom0
-        sp1 = self.spgeom1
+        Z = self._Z(E, eta)
 
-        # As the SparseGeometry inherently works for
-        # orthogonal and non-orthogonal basis, there is no
-        # need to have two algorithms.
-        GB = (sp0.Sk(k, dtype=dtype) * Z - sp0.Pk(k, dtype=dtype)).asformat('array')
+        def func(k):
+            return self._self_energy(Z, self._k_matrices(k, dtype), eps, bulk, method)
 
-        if sp1.orthogonal:
-            alpha = sp1.Pk(k, dtype=dtype, format='array')
-            beta  = np.conjugate(np.transpose(alpha))
-        else:
-            M = sp1.Pk(k, dtype=dtype)
-            S = sp1.Sk(k, dtype=dtype)
-            alpha = (M - S * Z).asformat('array')
-            beta  = (M.getH() - S.getH() * Z).asformat('array')
-            del M, S
+        return self._bloch(func, self._correct_k(k))
 
-        # Surface Green function (self-energy)
-        if bulk:
-            GS = np.copy(GB)
+    def self_energies(self, E, k=None, eta=None, dtype=None, eps=1e-14, bulk=False, method=None,
+                      threads=1):
+        r""" Return the self-energies for all energies in `E` at the k-point `k` (default Gamma).
+
+        The k-dependent matrices are only calculated once and re-used for all energies
+        which is much faster than calling `self_energy` for each energy.
+
+        Parameters
+        ----------
+        E : array_like of float
+          energies at which the calculation will take place (should *not* be complex)
+        k : array_like, optional
+          k-point at which the self-energies should be evaluated, see `self_energy`
+        eta : float or array_like, optional
+          the imaginary value to evaluate the self-energy with (may be given for each energy).
+          Defaults to the value with which the object was created
+        dtype : numpy.dtype
+          the resulting data type
+        eps : float, optional
+          convergence criteria for the recursion (only used for ``method='sancho'``)
+        bulk : bool, optional
+          if true, :math:`E\cdot \mathbf S - \mathbf H -\boldsymbol\Sigma` is returned, else
+          :math:`\boldsymbol\Sigma` is returned (default).
+        method : {'sancho', 'eig'}
+          the algorithm used for calculating the self-energy, see `self_energy`
+        threads : int, optional
+          number of threads used to calculate the energies concurrently (LAPACK and BLAS
+          routines releases the GIL). If ``None`` the number of available cores is used.
+
+        Returns
+        -------
+        numpy.ndarray
+          the self-energies with shape ``(len(E), no, no)`` (``no`` includes the Bloch-expansion)
+        """
+        if method is None:
+            method = self.method
         else:
-            GS = np.zeros_like(GB)
+            method = self._check_method(method)
+        if dtype is None:
+            dtype = np.complex128
 
-        solve = lin.solve
+        Z = self._Z(_a.asarrayd(np.real(E)).ravel(), eta)
 
-        i = 0
-        while True:
-            i += 1
+        if threads is None:
+            from multiprocessing import cpu_count
+            threads = cpu_count()
+        threads = min(threads, len(Z))
 
-            tA = solve(GB, alpha)
-            tB = solve(GB, beta)
+        def func(k):
+            return self._self_energies(Z, k, dtype, eps, bulk, method, threads)
 
-            tmp = dot(alpha, tB)
-            # Update bulk Green function
-            GB -= tmp + dot(beta, tA)
-            # Update surface self-energy
-            GS -= tmp
+        return self._bloch(func, self._correct_k(k))
 
-            # Update forward/backward
-            alpha = dot(alpha, tA)
-            beta = dot(beta, tB)
+    def _self_energies(self, Z, k, dtype, eps, bulk, method, threads):
+        """ Self-energies for all energies `Z` at the k-point `k` (see `self_energies`) """
+        mats = self._k_matrices(k, dtype)
+        no = mats[0].shape[0]
+        out = np.empty([len(Z), no, no], dtype=dtype)
 
-            # Convergence criteria, it could be stricter
-            if np.amax(np.abs(tmp)) < eps:
-                # Return the pristine Green function
-                del tA, tB, alpha, beta, GB
-                if bulk:
-                    return GS
-                return - GS
+        def calc(iE):
+            out[iE] = self._self_energy(Z[iE], mats, eps, bulk, method)
 
-        raise ValueError(self.__class__.__name__+': could not converge self-energy calculation')
+        if threads <= 1:
+            for iE in range(len(Z)):
+                calc(iE)
+        else:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(threads)
+            try:
+                pool.map(calc, range(len(Z)), chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+
+        return out
@@ -4,13 +4,14 @@ import warnings
 
 from numpy import dot
 import numpy as np
-from scipy.sparse import csr_matrix, diags, SparseEfficiencyWarning
+from scipy.sparse import csr_matrix, diags, identity, SparseEfficiencyWarning
+from scipy.sparse.linalg import splu, LinearOperator
 
 import sisl._array as _a
 import sisl.linalg as lin
 from sisl._help import _range as range
 from sisl.selector import TimeSelector
-from sisl.sparse import isspmatrix
+from sisl.sparse import isspmatrix, SparseCSR, _sp_merge
 from sisl.sparse_geometry import SparseOrbital
 from .spin import Spin
 
@@ -21,6 +22,128 @@ __all__ = ['SparseOrbitalBZ', 'SparseOrbitalBZSpin']
 warnings.filterwarnings("ignore", category=SparseEfficiencyWarning)
 
 
+def _eigh(P, S, eigvals_only, buffer, **kwargs):
+    """ Dense eigenvalue problem of the sparse matrices `P` (with overlap `S`, ``None`` if orthogonal)
+
+    The sparse matrices are expanded directly into Fortran ordered arrays which are
+    passed to LAPACK without intermediate copies. If `buffer` is a dictionary the dense
+    arrays are stored in it and re-used in subsequent calls (with same shape and data-type).
+    """
+    def dense(M, key):
+        out = None
+        if buffer is not None:
+            out = buffer.get(key, None)
+        if out is None or out.shape != M.shape or out.dtype != M.dtype:
+            out = np.empty(M.shape, dtype=M.dtype, order='F')
+            if buffer is not None:
+                buffer[key] = out
+        return M.toarray(out=out)
+
+    P = dense(P, 'P')
+    if S is None:
+        ret = lin.eigh_destroy(P, eigvals_only=eigvals_only, **kwargs)
+    else:
+        S = dense(S, 'S')
+        ret = lin.eigh_destroy(P, S, eigvals_only=eigvals_only, **kwargs)
+    if eigvals_only or buffer is None:
+        return ret
+    if np.may_share_memory(ret[1], P) or (S is not None and np.may_share_memory(ret[1], S)):
+        # Some solvers return the eigenvectors in the input array (buffer)
+        # which would be overwritten in the next call
+        return ret[0], ret[1].copy()
+    return ret
+
+
+def _shift_invert(P, S, sigma):
+    r""" Operator applying :math:`(\mathbf P - \sigma\mathbf S)^{-1}` through a sparse LU factorization """
+    A = (P - sigma * S).tocsc()
+    lu = splu(A)
+    return LinearOperator(A.shape, matvec=lu.solve, dtype=A.dtype)
+
+
+def _shift_invert_slice(P, S, e1, e2):
+    """ Shift and shift-invert operator for the spectrum slice ``[e1, e2]``
+
+    The shift is the slice midpoint. If that is an eigenvalue (exactly singular factorization)
+    the shift is moved by a small fraction of the slice width.
+    """
+    sigma = (e1 + e2) / 2
+    for i in range(10):
+        try:
+            return sigma, _shift_invert(P, S, sigma)
+        except RuntimeError:
+            # Factor is exactly singular
+            sigma += (e2 - e1) * 1e-3 * (i + 1)
+    return sigma, _shift_invert(P, S, sigma)
+
+
+def _eigsh(P, S, n, eigvals_only, sigma, window, slices, **kwargs):
+    """ Sparse eigenvalue problem of `P` (with overlap `S`, ``None`` if orthogonal)
+
+    See `SparseOrbitalBZ.eigsh` for details on the arguments.
+    """
+    if sigma is None and window is None:
+        if S is not None:
+            raise ValueError("The sparsity pattern is non-orthogonal, you cannot use the Arnoldi procedure with scipy")
+        # We always request the smallest eigenvalues...
+        kwargs.update({'which': kwargs.get('which', 'SM')})
+        return lin.eigsh(P, k=n, return_eigenvectors=not eigvals_only, **kwargs)
+
+    # In shift-invert mode the largest eigenvalues of the inverted
+    # problem are the eigenvalues closest to sigma
+    kwargs.update({'which': kwargs.get('which', 'LM')})
+    M = S
+    if S is None:
+        S = identity(P.shape[0], dtype=P.dtype, format='csr')
+
+    if window is None:
+        return lin.eigsh(P, k=n, M=M, sigma=sigma, OPinv=_shift_invert(P, S, sigma),
+                         return_eigenvectors=not eigvals_only, **kwargs)
+
+    # Spectrum slicing, each slice has its own shift (and factorization).
+    # The eigenvalues closest to the shift are calculated until an eigenvalue
+    # outside the slice is found, then all eigenvalues in the slice have been found.
+    no = P.shape[0]
+    # ARPACK cannot calculate all eigenvalues (complex matrices requires k < N - 1)
+    nmax = no - 2
+    edges = np.linspace(window[0], window[1], slices + 1)
+    eig = []
+    vec = []
+    for i in range(slices):
+        e1, e2 = edges[i], edges[i+1]
+        sigma, OPinv = _shift_invert_slice(P, S, e1, e2)
+        # All eigenvalues in the slice are found when one is further away from sigma
+        dist = max(sigma - e1, e2 - sigma)
+        nk = min(n, nmax)
+        while True:
+            if nk < 1:
+                # The slice contains (almost) the full spectrum, resort to a dense diagonalization
+                ev = lin.eigh(P.toarray(), None if M is None else M.toarray(), eigvals_only=eigvals_only)
+                e = ev if eigvals_only else ev[0]
+                break
+            ev = lin.eigsh(P, k=nk, M=M, sigma=sigma, OPinv=OPinv,
+                           return_eigenvectors=not eigvals_only, **kwargs)
+            e = ev if eigvals_only else ev[0]
+            if np.abs(e - sigma).max() > dist:
+                break
+            nk = 0 if nk == nmax else min(nk * 2, nmax)
+
+        # Slices are half-open intervals, except the last one
+        if i == slices - 1:
+            idx = np.logical_and(e1 <= e, e <= e2).nonzero()[0]
+        else:
+            idx = np.logical_and(e1 <= e, e < e2).nonzero()[0]
+        eig.append(e[idx])
+        if not eigvals_only:
+            vec.append(ev[1][:, idx])
+
+    eig = np.concatenate(eig)
+    idx = np.argsort(eig)
+    if eigvals_only:
+        return eig[idx]
+    return eig[idx], np.concatenate(vec, axis=1)[:, idx]
+
+
 class SparseOrbitalBZ(SparseOrbital):
     """ Sparse object containing the orbital connections in a Brillouin zone
 
@@ -118,55 +241,26 @@ class SparseOrbitalBZ(SparseOrbital):
     @classmethod
     def fromsp(cls, geom, P, S=None):
         """ Read and return the object with possible overlap """
-        # Calculate maximum number of connections per row
-        nc = 0
-
         # Ensure list of csr format (to get dimensions)
         if isspmatrix(P):
             P = [P]
 
         # Number of dimensions
         dim = len(P)
-        # Sort all indices for the passed sparse matrices
-        for i in range(dim):
-            P[i] = P[i].tocsr()
-            P[i].sort_indices()
-            P[i].sum_duplicates()
-
-        # Figure out the maximum connections per
-        # row to reduce number of re-allocations to 0
-        for i in range(P[0].shape[0]):
-            nc = max(nc, P[0][i, :].getnnz())
+        # Merge the sparsity patterns of all passed sparse matrices
+        if S is None:
+            D, col, ptr = _sp_merge(P)
+        else:
+            D, col, ptr = _sp_merge(list(P) + [S])
 
         # Create the sparse object
-        p = cls(geom, dim, P[0].dtype, nc, orthogonal=S is None)
+        p = cls(geom, dim, D.dtype, 1, orthogonal=S is None)
 
-        if p._size != P[0].shape[0]:
+        if p._size != len(ptr) - 1:
             raise ValueError(cls.__name__ + '.fromsp cannot create a new class, the geometry ' + \
                              'and sparse matrices does not have coinciding dimensions size != sp.shape[0]')
 
-        for i in range(dim):
-            ptr = P[i].indptr
-            col = P[i].indices
-            D = P[i].data
-
-            # loop and add elements
-            for r in range(p.shape[0]):
-                sl = slice(ptr[r], ptr[r+1], None)
-                p[r, col[sl], i] = D[sl]
-
-        if not S is None:
-            S = S.tocsr()
-            S.sort_indices()
-            S.sum_duplicates()
-            ptr = S.indptr
-            col = S.indices
-            D = S.data
-
-            # loop and add elements
-            for r in range(p.shape[0]):
-                sl = slice(ptr[r], ptr[r+1], None)
-                p.S[r, col[sl]] = D[sl]
+        p._csr = SparseCSR((D, col, ptr), shape=p._csr.shape[:2])
 
         return p
 
@@ -310,6 +404,9 @@ class SparseOrbitalBZ(SparseOrbital):
         # Now create offsets
         offsets = - _a.arangei(0, len(phases) * self.no, self.no)
         # Do not cast to dtype, that is done below, then we retain precision
+        if np.dtype(dtype).kind != 'c':
+            # Gamma-point phases are real
+            phases = phases.real
         diag = diags(phases, offsets, shape=(self.shape[1], self.shape[0])).toarray()
 
         V[:, :] = dot(self.tocsr(_dim).toarray(), diag)
@@ -384,42 +481,73 @@ class SparseOrbitalBZ(SparseOrbital):
         """
         return self._Pk(k, dtype=dtype, gauge=gauge, format=format, _dim=self.S_idx)
 
-    def eigh(self, k=(0, 0, 0), gauge='R', eigvals_only=True, **kwargs):
+    def eigh(self, k=(0, 0, 0), gauge='R', eigvals_only=True, buffer=None, **kwargs):
         """ Returns the eigenvalues of the physical quantity
 
         Setup the system and overlap matrix with respect to
         the given k-point and calculate the eigenvalues.
 
         All subsequent arguments gets passed directly to :code:`scipy.linalg.eigh`
+
+        Parameters
+        ----------
+        dtype : numpy.dtype, optional
+           data-type of the matrices, single precision data-types (`numpy.complex64`,
+           or `numpy.float32` at the Gamma-point) uses single precision LAPACK routines
+        eigvals : (int, int), optional
+           only calculate the eigenvalues (and eigenvectors) with indices ``lo <= i <= hi``
+           (in ascending order)
+        buffer : dict, optional
+           the dense matrices are stored in this dictionary and re-used in subsequent
+           calls passing the same dictionary (e.g. a loop over k-points)
+
+        Examples
+        --------
+        >>> buffer = {} # doctest: +SKIP
+        >>> eigs = [obj.eigh(k, eigvals=(0, 9), buffer=buffer) for k in bz.k] # doctest: +SKIP
         """
         dtype = kwargs.pop('dtype', None)
-        P = self.Pk(k=k, dtype=dtype, gauge=gauge, format='array')
+        P = self.Pk(k=k, dtype=dtype, gauge=gauge)
+        S = None
         if not self.orthogonal:
-            S = self.Sk(k=k, dtype=dtype, gauge=gauge, format='array')
-
-        if self.orthogonal:
-            return lin.eigh_destroy(P, eigvals_only=eigvals_only, **kwargs)
+            S = self.Sk(k=k, dtype=dtype, gauge=gauge)
 
-        return lin.eigh_destroy(P, S, eigvals_only=eigvals_only, **kwargs)
+        return _eigh(P, S, eigvals_only, buffer, **kwargs)
 
-    def eigsh(self, k=(0, 0, 0), n=10, gauge='R', eigvals_only=True, **kwargs):
-        """ Calculates a subset of eigenvalues of the physical quantity  (default 10)
+    def eigsh(self, k=(0, 0, 0), n=10, gauge='R', eigvals_only=True, sigma=None, window=None, slices=1, **kwargs):
+        r""" Calculates a subset of eigenvalues of the physical quantity  (default 10)
 
         Setup the quantity and overlap matrix with respect to
         the given k-point and calculate a subset of the eigenvalues using the sparse algorithms.
 
-        All subsequent arguments gets passed directly to :code:`scipy.linalg.eigsh`
-        """
-        # We always request the smallest eigenvalues...
-        kwargs.update({'which': kwargs.get('which', 'SM')})
+        If neither `sigma` nor `window` are specified the `n` eigenvalues with the smallest
+        magnitude are calculated (only for orthogonal basis sets).
+        For `sigma` and `window` the shifted matrix :math:`\mathbf P - \sigma\mathbf S` is
+        factorized once (sparse LU) and the eigenvalues are found using shift-invert Lanczos.
+        This also works for non-orthogonal basis sets.
+
+        All subsequent arguments gets passed directly to :code:`scipy.sparse.linalg.eigsh`
 
+        Parameters
+        ----------
+        sigma : float, optional
+           calculate the `n` eigenvalues closest to `sigma` (e.g. the Fermi level)
+        window : (float, float), optional
+           calculate *all* eigenvalues in the window ``[window[0], window[1]]``, in this
+           case `n` is the initial guess of the number of eigenvalues in each slice
+        slices : int, optional
+           the `window` is divided into `slices` equally sized slices which are calculated
+           with individual shifts. More slices reduces the number of Lanczos vectors
+           per slice at the cost of more factorizations.
+        """
         dtype = kwargs.pop('dtype', None)
 
         P = self.Pk(k=k, dtype=dtype, gauge=gauge)
+        S = None
         if not self.orthogonal:
-            raise ValueError("The sparsity pattern is non-orthogonal, you cannot use the Arnoldi procedure with scipy")
+            S = self.Sk(k=k, dtype=P.dtype, gauge=gauge)
 
-        return lin.eigsh(P, k=n, return_eigenvectors=not eigvals_only, **kwargs)
+        return _eigsh(P, S, n, eigvals_only, sigma, window, slices, **kwargs)
 
 
 class SparseOrbitalBZSpin(SparseOrbitalBZ):
@@ -1008,12 +1136,14 @@ class SparseOrbitalBZSpin(SparseOrbitalBZ):
         # It must be a sparse matrix we inquire
         return csr_matrix(S).asformat(format)
 
-    def eigh(self, k=(0, 0, 0), gauge='R', eigvals_only=True, **kwargs):
+    def eigh(self, k=(0, 0, 0), gauge='R', eigvals_only=True, buffer=None, **kwargs):
         """ Returns the eigenvalues of the physical quantity
 
         Setup the system and overlap matrix with respect to
         the given k-point and calculate the eigenvalues.
 
+        See `SparseOrbitalBZ.eigh` for details on `dtype`, `eigvals` and `buffer`.
+
         All subsequent arguments gets passed directly to :code:`scipy.linalg.eigh`
 
         Parameters
@@ -1026,24 +1156,24 @@ class SparseOrbitalBZSpin(SparseOrbitalBZ):
         dtype = kwargs.pop('dtype', None)
 
         if self.spin.kind == Spin.POLARIZED:
-            P = self.Pk(k=k, dtype=dtype, gauge=gauge, spin=spin, format='array')
+            P = self.Pk(k=k, dtype=dtype, gauge=gauge, spin=spin)
         else:
-            P = self.Pk(k=k, dtype=dtype, gauge=gauge, format='array')
+            P = self.Pk(k=k, dtype=dtype, gauge=gauge)
+        S = None
         if not self.orthogonal:
-            S = self.Sk(k=k, dtype=dtype, gauge=gauge, format='array')
-
-        if self.orthogonal:
-            return lin.eigh_destroy(P, eigvals_only=eigvals_only, **kwargs)
+            S = self.Sk(k=k, dtype=dtype, gauge=gauge)
 
-        return lin.eigh_destroy(P, S, eigvals_only=eigvals_only, **kwargs)
+        return _eigh(P, S, eigvals_only, buffer, **kwargs)
 
-    def eigsh(self, k=(0, 0, 0), n=10, gauge='R', eigvals_only=True, **kwargs):
+    def eigsh(self, k=(0, 0, 0), n=10, gauge='R', eigvals_only=True, sigma=None, window=None, slices=1, **kwargs):
         """ Calculates a subset of eigenvalues of the physical quantity  (default 10)
 
         Setup the quantity and overlap matrix with respect to
         the given k-point and calculate a subset of the eigenvalues using the sparse algorithms.
 
-        All subsequent arguments gets passed directly to :code:`scipy.linalg.eigsh`
+        See `SparseOrbitalBZ.eigsh` for details on `sigma`, `window` and `slices`.
+
+        All subsequent arguments gets passed directly to :code:`scipy.sparse.linalg.eigsh`
 
         Parameters
         ----------
@@ -1051,16 +1181,15 @@ class SparseOrbitalBZSpin(SparseOrbitalBZ):
            the spin-component to calculate the eigenvalue spectrum of, note that
            this parameter is only valid for `Spin.POLARIZED` matrices.
         """
-        # We always request the smallest eigenvalues...
         spin = kwargs.pop('spin', 0)
         dtype = kwargs.pop('dtype', None)
-        kwargs.update({'which': kwargs.get('which', 'SM')})
 
         if self.spin.kind == Spin.POLARIZED:
             P = self.Pk(k=k, dtype=dtype, spin=spin, gauge=gauge)
         else:
             P = self.Pk(k=k, dtype=dtype, gauge=gauge)
+        S = None
         if not self.orthogonal:
-            raise ValueError("The sparsity pattern is non-orthogonal, you cannot use the Arnoldi procedure with scipy")
+            S = self.Sk(k=k, dtype=P.dtype, gauge=gauge)
 
-        return lin.eigsh(P, k=n, return_eigenvectors=not eigvals_only, **kwargs)
+        return _eigsh(P, S, n, eigvals_only, sigma, window, slices, **kwargs)
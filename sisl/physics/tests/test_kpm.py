@@ -0,0 +1,91 @@
+from __future__ import print_function, division
+
+import pytest
+
+import numpy as np
+from scipy.sparse import diags
+
+from sisl import geom, Hamiltonian
+from sisl.physics import KPM, kpm_kernel
+
+pytestmark = pytest.mark.kpm
+
+
+def _H(orthogonal):
+    gr = geom.graphene().tile(4, 0).tile(3, 1)
+    H = Hamiltonian(gr, orthogonal=orthogonal)
+    if orthogonal:
+        H.construct([(0.1, 1.44), (0., -2.7)])
+    else:
+        H.construct([(0.1, 1.44), ((0., 1.), (-2.7, 0.1))])
+    return H
+
+
+def _exact_moments(kpm, e, w, N):
+    """ Moments from eigenvalues `e` with weights `w` (orbital, state) """
+    x = (e - kpm.b) / kpm.a
+    T = np.cos(np.arange(N).reshape(-1, 1) * np.arccos(x).reshape(1, -1))
+    return w.dot(T.T)
+
+
+@pytest.mark.parametrize("orthogonal", [True, False])
+@pytest.mark.parametrize("N", [31, 32])
+def test_kpm_moments(orthogonal, N):
+    H = _H(orthogonal)
+    k = [0.1, 0.2, 0]
+    es = H.eigenstate(k)
+    # Mulliken weights (reduces to |c|^2 for orthogonal basis sets)
+    Sk = H.Sk(k, format='array')
+    w = (np.conj(es.v.T) * Sk.dot(es.v.T)).real
+
+    kpm = H.kpm(k, N=N, orbital=range(H.no), R=0)
+    assert kpm.moments is None
+    assert len(kpm) == N
+    mu = _exact_moments(kpm, es.e, w, N)
+    assert np.allclose(kpm.orbital_moments, mu)
+
+    kpm = H.kpm(k, N=N, R=200, seed=42, bounds=kpm.bounds)
+    assert np.allclose(kpm.moments, mu.mean(0), atol=0.05)
+
+
+@pytest.mark.parametrize("orthogonal", [True, False])
+def test_kpm_sparse(orthogonal):
+    # Construct directly from sparse matrices
+    H = _H(orthogonal)
+    k = [0.1, 0.2, 0]
+    S = None if orthogonal else H.Sk(k)
+    kpm = KPM(H.Hk(k), S, N=32, R=0, orbital=[0, 3])
+    hkpm = H.kpm(k, N=32, R=0, orbital=[0, 3], bounds=kpm.bounds)
+    assert np.allclose(kpm.orbital_moments, hkpm.orbital_moments)
+
+    # The moments of a diagonal matrix are the Chebyshev polynomials
+    e = np.linspace(-1, 2, 10)
+    kpm = KPM(diags(e, format='csr'), N=8, R=0, orbital=range(10), bounds=(-2, 3))
+    assert np.allclose(kpm.orbital_moments, _exact_moments(kpm, e, np.eye(10), 8))
+
+
+def test_kpm_dos():
+    H = _H(True)
+    E = np.linspace(-9, 9, 1000)
+    kpm = H.kpm(N=400, R=20, orbital=[0, 1], seed=1)
+    dE = E[1] - E[0]
+    assert kpm.DOS(E).sum() * dE == pytest.approx(H.no, rel=1e-2)
+    assert np.allclose(kpm.PDOS(E).sum(1) * dE, 1, rtol=1e-2)
+    # Different broadening re-uses the moments
+    assert kpm.PDOS(E, N=100, kernel='lorentz').shape == (2, len(E))
+    assert np.allclose(kpm.DOS(E, kernel=kpm_kernel('jackson', 400)), kpm.DOS(E))
+    assert np.all(kpm.DOS([-20, 20]) == 0.)
+
+
+def test_kpm_fail():
+    H = _H(True)
+    kpm = H.kpm(N=16, R=0)
+    with pytest.raises(ValueError):
+        kpm.DOS(0.)
+    kpm = H.kpm(N=16, R=1)
+    with pytest.raises(ValueError):
+        kpm.PDOS(0.)
+    with pytest.raises(ValueError):
+        kpm.DOS(0., N=32)
+    with pytest.raises(ValueError):
+        kpm_kernel('unknown', 10)
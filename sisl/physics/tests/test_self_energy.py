@@ -51,3 +51,57 @@ class TestSelfEnergy(object):
     def test_sancho2(self, setup):
         SE = RecursiveSI(setup.HS, '+A')
         SE.self_energy(0.1)
+
+    def test_sancho_eig(self, setup):
+        for H in [setup.H, setup.HS]:
+            for D in ['+A', '-A', '+B']:
+                SE = RecursiveSI(H, D, method='eig')
+                for bulk in [False, True]:
+                    s1 = SE.self_energy(0.1, k=[0.1, 0.2, 0], bulk=bulk, eta=1e-3)
+                    s2 = SE.self_energy(0.1, k=[0.1, 0.2, 0], bulk=bulk, eta=1e-3, method='sancho')
+                    assert np.allclose(s1, s2)
+
+    def test_sancho_downfold(self, setup):
+        # Only half the orbitals couple to the neighbouring cells
+        H = setup.HS.tile(2, 0)
+        SE = RecursiveSI(H, '-A')
+        assert len(SE._internal) > 0
+        s1 = SE.self_energy(0.1, k=[0, 0.3, 0])
+        b1 = SE.self_energy(0.1, k=[0, 0.3, 0], bulk=True)
+        SE._coupled = np.arange(H.no)
+        SE._internal = np.arange(0)
+        assert np.allclose(s1, SE.self_energy(0.1, k=[0, 0.3, 0]))
+        assert np.allclose(b1, SE.self_energy(0.1, k=[0, 0.3, 0], bulk=True))
+
+    def test_sancho_method_fail(self, setup):
+        with pytest.raises(ValueError):
+            RecursiveSI(setup.H, '+A', method='unknown')
+        with pytest.raises(ValueError):
+            RecursiveSI(setup.H, '+A').self_energy(0.1, method='unknown')
+
+    def test_sancho_energies(self, setup):
+        E = np.linspace(-1, 1, 5)
+        for H in [setup.H, setup.HS]:
+            SE = RecursiveSI(H, '+B')
+            for threads in [1, 2]:
+                se = SE.self_energies(E, k=[0.2, 0, 0], bulk=True, threads=threads)
+                assert se.shape == (len(E), H.no, H.no)
+                for i, e in enumerate(E):
+                    assert np.allclose(se[i], SE.self_energy(e, k=[0.2, 0, 0], bulk=True))
+
+    def test_sancho_bloch(self, setup):
+        k = [0.2, 0.3, 0]
+        for H in [setup.H, setup.HS]:
+            for D, bloch, axis in [('+A', [1, 2, 1], 1), ('-B', [3, 1, 1], 0)]:
+                SE = RecursiveSI(H, D, bloch=bloch)
+                SEb = RecursiveSI(H.tile(bloch[axis], axis), D)
+                for bulk in [False, True]:
+                    s1 = SE.self_energy(0.1, k=k, bulk=bulk)
+                    assert s1.shape == (H.no * bloch[axis], ) * 2
+                    assert np.allclose(s1, SEb.self_energy(0.1, k=k, bulk=bulk))
+                s1 = SE.self_energies([0.1, 0.4], k=k)
+                assert np.allclose(s1[1], SEb.self_energy(0.4, k=k))
+
+    def test_sancho_bloch_fail(self, setup):
+        with pytest.raises(ValueError):
+            RecursiveSI(setup.H, '+A', bloch=[2, 1, 1])
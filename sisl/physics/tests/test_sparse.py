@@ -73,3 +73,81 @@ def test_eigsh_non_orthogonal():
     # The most simple setup.
     sp = SparseOrbitalBZ(gr, orthogonal=False)
     sp.eigsh()
+
+
+@pytest.mark.parametrize("orthogonal", [True, False])
+@pytest.mark.parametrize("k", [[0] * 3, [0.1, 0.2, 0]])
+def test_eigsh_sigma(orthogonal, k):
+    gr = _get().tile(6, 0).tile(6, 1)
+    sp = SparseOrbitalBZ(gr, orthogonal=orthogonal)
+    sp.construct([(0.1, 1.44), ((0., 1.), (-2.7, 0.1))] if not orthogonal else
+                 [(0.1, 1.44), (0., -2.7)])
+    eig = sp.eigh(k)
+    e = sp.eigsh(k, n=4, sigma=0.3)
+    assert np.allclose(np.sort(e), np.sort(eig[np.argsort(np.abs(eig - 0.3))[:4]]))
+
+
+@pytest.mark.parametrize("orthogonal", [True, False])
+def test_eigsh_window(orthogonal):
+    gr = _get().tile(6, 0).tile(6, 1)
+    sp = SparseOrbitalBZ(gr, orthogonal=orthogonal)
+    sp.construct([(0.1, 1.44), ((0., 1.), (-2.7, 0.1))] if not orthogonal else
+                 [(0.1, 1.44), (0., -2.7)])
+    k = [0.1, 0.2, 0]
+    eig = sp.eigh(k)
+    eig = eig[np.logical_and(-1 <= eig, eig <= 2)]
+    for slices in [1, 3]:
+        e, v = sp.eigsh(k, n=2, window=(-1, 2), slices=slices, eigvals_only=False)
+        assert np.allclose(e, eig)
+        assert np.allclose(sp.Pk(k, format='array').dot(v), sp.Sk(k, format='array').dot(v) * e)
+    # Windows spanning the full spectrum
+    assert np.allclose(sp.eigsh(k, window=(-100, 100)), sp.eigh(k))
+
+
+def test_eigsh_window_zero_mode():
+    # The slice midpoint is an eigenvalue (Dirac point at Gamma)
+    gr = _get().tile(3, 0).tile(3, 1)
+    sp = SparseOrbitalBZ(gr)
+    sp.construct([(0.1, 1.44), (0., -2.7)])
+    eig = sp.eigh()
+    assert np.abs(eig).min() < 1e-10
+    eig = eig[np.logical_and(-1 <= eig, eig <= 1)]
+    e = sp.eigsh(n=4, window=(-1, 1))
+    assert np.allclose(e, eig)
+
+
+@pytest.mark.parametrize("orthogonal", [True, False])
+@pytest.mark.parametrize("driver", [None, 'evd'])
+def test_eigh_buffer(orthogonal, driver):
+    gr = _get().tile(3, 0)
+    sp = SparseOrbitalBZ(gr, orthogonal=orthogonal)
+    sp.construct([(0.1, 1.44), ((0., 1.), (-2.7, 0.1))] if not orthogonal else
+                 [(0.1, 1.44), (0., -2.7)])
+    buffer = {}
+    k1, k2 = [0.1, 0.2, 0], [0.3, 0.1, 0]
+    opt = {} if driver is None else {'driver': driver}
+    e1, v1 = sp.eigh(k1, eigvals_only=False, buffer=buffer, **opt)
+    P = buffer['P']
+    assert ('S' in buffer) != orthogonal
+    e2, v2 = sp.eigh(k2, eigvals_only=False, buffer=buffer, **opt)
+    # The buffer is re-used and the returned eigenvectors are not overwritten
+    assert P is buffer['P']
+    assert np.allclose(e1, sp.eigh(k1))
+    assert np.allclose(sp.Pk(k1, format='array').dot(v1), sp.Sk(k1, format='array').dot(v1) * e1)
+    assert np.allclose(e2, sp.eigh(k2))
+    # Changing data-type re-allocates
+    assert sp.eigh(k1, dtype=np.complex64, buffer=buffer).dtype == np.float32
+    assert buffer['P'].dtype == np.complex64
+
+
+def test_eigh_dtype_subset():
+    gr = _get().tile(3, 0)
+    sp = SparseOrbitalBZ(gr, orthogonal=False)
+    sp.construct([(0.1, 1.44), ((0., 1.), (-2.7, 0.1))])
+    eig = sp.eigh()
+    e32 = sp.eigh(dtype=np.float32)
+    assert e32.dtype == np.float32
+    assert np.allclose(eig, e32, atol=1e-4)
+    e, v = sp.eigh([0.1, 0, 0], eigvals=(1, 3), eigvals_only=False, dtype=np.complex64)
+    assert v.dtype == np.complex64 and v.shape == (sp.no, 3)
+    assert np.allclose(e, sp.eigh([0.1, 0, 0])[1:4], atol=1e-4)
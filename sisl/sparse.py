@@ -592,22 +592,17 @@ class SparseCSR(object):
         if self.shape[:2] != other.shape[:2]:
             return False
 
-        sptr = self.ptr.view()
-        sncol = self.ncol.view()
-        scol = self.col.view()
-        optr = other.ptr.view()
-        oncol = other.ncol.view()
-        ocol = other.col.view()
-
         # Easy check for non-equal number of elements
-        if (sncol == oncol).sum() != self.shape[0]:
+        if not np.array_equal(self.ncol, other.ncol):
             return False
 
-        for r in range(self.shape[0]):
-            if len(intersect1d(scol[sptr[r]:sptr[r]+sncol[r]],
-                               ocol[optr[r]:optr[r]+oncol[r]])) != sncol[r]:
-                return False
-        return True
+        # Compare all non-zero elements at once, the sparse
+        # elements of a row may be in any order
+        skey = self._sp_keys()[1]
+        okey = other._sp_keys()[1]
+        skey.sort()
+        okey.sort()
+        return np.array_equal(skey, okey)
 
     def align(self, other):
         """ Aligns this sparse matrix with the sparse elements of the other sparse matrix
@@ -628,24 +623,47 @@ class SparseCSR(object):
         if self.shape[:2] != other.shape[:2]:
             raise ValueError('Aligning two sparse matrices requires same shapes')
 
-        lsetdiff1d = setdiff1d
-        sptr = self.ptr.view()
-        sncol = self.ncol.view()
-        scol = self.col.view()
-        optr = other.ptr.view()
-        oncol = other.ncol.view()
-        ocol = other.col.view()
-        for r in range(self.shape[0]):
-            # pointers
-            sp = sptr[r]
-            sn = sncol[r]
-            op = optr[r]
-            on = oncol[r]
-
-            adds = lsetdiff1d(ocol[op:op+on], scol[sp:sp+sn])
-            if len(adds) > 0:
-                # simply extend the elements
-                self._extend(r, adds)
+        sidx, skey = self._sp_keys()
+        adds = setdiff1d(other._sp_keys()[1], skey)
+        if len(adds) == 0:
+            return
+        del skey
+
+        # Now figure out the rows and columns of the added elements
+        # (adds is sorted, hence in the order of rows)
+        N = self.shape[1]
+        arow = adds // N
+        acol = (adds - arow * N).astype(np.int32)
+        del adds
+        nadd = np.bincount(arow, minlength=self.shape[0]).astype(np.int32)
+        del arow
+
+        # Create the new sparse pattern with a single allocation.
+        # Each row contains the original elements followed by the added
+        # elements.
+        ncol = self.ncol + nadd
+        ptr = _a.emptyi(self.shape[0] + 1)
+        ptr[0] = 0
+        _a.cumsumi(ncol, out=ptr[1:])
+        nnz = ptr[-1]
+
+        col = _a.emptyi(nnz)
+        D = zeros([nnz, self.shape[2]], self.dtype)
+
+        idx = array_arange(ptr[:-1], n=self.ncol)
+        col[idx] = self.col[sidx]
+        D[idx, :] = self._D[sidx, :]
+        del idx, sidx
+        col[array_arange(ptr[:-1] + self.ncol, n=nadd)] = acol
+
+        self.ptr = ptr
+        self.ncol = ncol
+        self.col = col
+        self._D = D
+        self._nnz = nnz
+        # The added elements are not sorted with respect to the
+        # existing ones
+        self._finalized = False
 
     def iter_nnz(self, row=None):
         """ Iterations of the non-zero elements, returns a tuple of row and column with non-zero elements
@@ -825,6 +843,54 @@ class SparseCSR(object):
 
         return indices(self.col[ptr:ptr+self.ncol[i]], j, ptr)
 
+    def _sp_keys(self):
+        """ Linear indices (``row * shape[1] + column``) of all non-zero elements
+
+        Returns
+        -------
+        index : numpy.ndarray
+           the indices of the non-zero elements in the data arrays (``self.col``/``self._D``)
+        key : numpy.ndarray
+           the linear index (`numpy.int64`) of the non-zero elements
+        """
+        index = array_arange(self.ptr[:-1], n=self.ncol)
+        key = _a.arangel(self.shape[0]).repeat(self.ncol) * self.shape[1]
+        key += self.col[index]
+        return index, key
+
+    def _get_sp(self, other):
+        """ Retrieves the data pointers in this matrix for all non-zero elements in `other`
+
+        This is the vectorized equivalent of looping all rows and calling `_get` with
+        the columns of `other`.
+
+        Parameters
+        ----------
+        other : SparseCSR
+           the sparse matrix with the elements to find in this matrix
+
+        Returns
+        -------
+        other_index : numpy.ndarray
+           indices of the non-zero elements in `other`
+        index : numpy.ndarray
+           indices of the corresponding elements in this matrix (``-1`` if non-existing)
+        """
+        sidx, skey = self._sp_keys()
+        oidx, okey = other._sp_keys()
+
+        if len(skey) == 0:
+            return oidx, _a.fulli(len(oidx), -1)
+
+        # Sort the keys to allow a binary search
+        srt = argsort(skey, kind='mergesort')
+        skey = skey[srt]
+        pos = skey.searchsorted(okey)
+        pos[pos == len(skey)] = 0
+        found = skey[pos] == okey
+        index = np.where(found, sidx[srt[pos]], -1).astype(np.int32, copy=False)
+        return oidx, index
+
     def __delitem__(self, key):
         """ Remove items from the sparse patterns """
         # Get indices of sparse data (-1 if non-existing)
@@ -1257,16 +1323,9 @@ class SparseCSR(object):
             # Ensure that a is aligned with b
             a.align(b)
 
-            # loop and add elements
-            for r in range(a.shape[0]):
-                # pointers
-                bptr = b.ptr[r]
-                bn = b.ncol[r]
-                sl = slice(bptr, bptr+bn, None)
-
-                # Get positions of b-elements in a:
-                in_a = a._get(r, b.col[sl])
-                a._D[in_a, :] += b._D[sl, :]
+            # Get positions of b-elements in a
+            in_b, in_a = a._get_sp(b)
+            a._D[in_a, :] += b._D[in_b, :]
 
         else:
             a._D += b
@@ -1292,16 +1351,9 @@ class SparseCSR(object):
             # Ensure that a is aligned with b
             a.align(b)
 
-            # loop and add elements
-            for r in range(a.shape[0]):
-                # pointers
-                bptr = b.ptr[r]
-                bn = b.ncol[r]
-                sl = slice(bptr, bptr+bn, None)
-
-                # Get positions of b-elements in a:
-                in_a = a._get(r, b.col[sl])
-                a._D[in_a, :] -= b._D[sl, :]
+            # Get positions of b-elements in a
+            in_b, in_a = a._get_sp(b)
+            a._D[in_a, :] -= b._D[in_b, :]
 
         else:
             a._D -= b
@@ -1323,27 +1375,19 @@ class SparseCSR(object):
             # 0 * float == 0
             # Hence aligning is superfluous
 
-            # loop and add elements
-            for r in range(a.shape[0]):
-                # pointers
-                aptr = a.ptr[r]
-                an = a.ncol[r]
-                bptr = b.ptr[r]
-                bn = b.ncol[r]
-
-                acol = a.col[aptr:aptr+an]
-                bcol = b.col[bptr:bptr+bn]
-
-                # Get positions of b-elements in a:
-                in_a = a._get(r, bcol)
-                # remove all -1's
-                in_a = in_a[in_a > -1]
-                # Everything else *must* be zeroes! :)
-                a._D[in_a, :] *= b._D[bptr:bptr+bn, :]
+            # Get positions of b-elements in a
+            in_b, in_a = a._get_sp(b)
+            # remove all -1's
+            idx = (in_a > -1).nonzero()[0]
+            in_a = in_a[idx]
+            # Everything else *must* be zeroes! :)
+            a._D[in_a, :] *= b._D[in_b[idx], :]
 
-                # Now set everything *not* in b but in a, to zero
-                not_in_b = in1d(acol, bcol, invert=True).nonzero()[0]
-                a._D[aptr+not_in_b, :] = 0
+            # Now set everything *not* in b but in a, to zero
+            not_in_b = np.ones(len(a.col), dtype=np.bool_)
+            not_in_b[in_a] = False
+            idx = array_arange(a.ptr[:-1], n=a.ncol)
+            a._D[idx[not_in_b[idx]], :] = 0
 
         else:
             a._D *= b
@@ -1367,15 +1411,9 @@ class SparseCSR(object):
             # Ensure that a is aligned with b
             a.align(b)
 
-            # loop and add elements
-            for r in range(a.shape[0]):
-                # pointers
-                bptr = b.ptr[r]
-                bn = b.ncol[r]
-
-                # Get positions of b-elements in a:
-                in_a = a._get(r, b.col[bptr:bptr+bn])
-                a._D[in_a, :] /= b._D[bptr:bptr+bn, :]
+            # Get positions of b-elements in a
+            in_b, in_a = a._get_sp(b)
+            a._D[in_a, :] /= b._D[in_b, :]
 
         else:
             a._D /= b
@@ -1393,15 +1431,9 @@ class SparseCSR(object):
             # Ensure that a is aligned with b
             a.align(b)
 
-            # loop and add elements
-            for r in range(a.shape[0]):
-                # pointers
-                bptr = b.ptr[r]
-                bn = b.ncol[r]
-
-                # Get positions of b-elements in a:
-                in_a = a._get(r, b.col[bptr:bptr+bn])
-                a._D[in_a, :] //= b._D[bptr:bptr+bn, :]
+            # Get positions of b-elements in a
+            in_b, in_a = a._get_sp(b)
+            a._D[in_a, :] //= b._D[in_b, :]
 
         else:
             a._D //= b
@@ -1419,15 +1451,9 @@ class SparseCSR(object):
             # Ensure that a is aligned with b
             a.align(b)
 
-            # loop and add elements
-            for r in range(a.shape[0]):
-                # pointers
-                bptr = b.ptr[r]
-                bn = b.ncol[r]
-
-                # Get positions of b-elements in a:
-                in_a = a._get(r, b.col[bptr:bptr+bn])
-                a._D[in_a, :].__itruediv__(b._D[bptr:bptr+bn, :])
+            # Get positions of b-elements in a
+            in_b, in_a = a._get_sp(b)
+            a._D[in_a, :] /= b._D[in_b, :]
 
         else:
             a._D /= b
@@ -1453,31 +1479,65 @@ class SparseCSR(object):
             # 0 ** float == 1.
             a.align(b)
 
-            # loop and add elements
-            for r in range(a.shape[0]):
-                # pointers
-                aptr = a.ptr[r]
-                an = a.ncol[r]
-                bptr = b.ptr[r]
-                bn = b.ncol[r]
-
-                acol = a.col[aptr:aptr+an]
-                bcol = b.col[bptr:bptr+bn]
-
-                # Get positions of b-elements in a:
-                in_a = a._get(r, bcol)
-                a._D[in_a, :] **= b._D[bptr:bptr+bn, :]
+            # Get positions of b-elements in a
+            in_b, in_a = a._get_sp(b)
+            a._D[in_a, :] **= b._D[in_b, :]
 
-                # Now set everything *not* in b but in a, to 1
-                #  float ** 0 == 1
-                not_in_b = in1d(acol, bcol, invert=True).nonzero()[0]
-                a._D[aptr+not_in_b, :] = 1
+            # Now set everything *not* in b but in a, to 1
+            #  float ** 0 == 1
+            not_in_b = np.ones(len(a.col), dtype=np.bool_)
+            not_in_b[in_a] = False
+            idx = array_arange(a.ptr[:-1], n=a.ncol)
+            a._D[idx[not_in_b[idx]], :] = 1
 
         else:
             a._D **= b
         return a
 
 
+def _sp_merge(sp, dtype=None):
+    """ Merge a list of `scipy.sparse` matrices (same shape) into a single sparsity pattern
+
+    Parameters
+    ----------
+    sp : list of scipy.sparse matrices
+       the matrices to be merged, they are converted to CSR format
+    dtype : numpy.dtype, optional
+       the data-type of the returned data, defaults to the data-type of the first matrix
+
+    Returns
+    -------
+    D : numpy.ndarray
+       data with shape ``(nnz, len(sp))`` for the union of the sparsity patterns
+    col : numpy.ndarray
+       column indices of the merged sparsity pattern
+    ptr : numpy.ndarray
+       row pointers of the merged sparsity pattern
+    """
+    sp = [s.tocsr() for s in sp]
+    if dtype is None:
+        dtype = sp[0].dtype
+    shape = sp[0].shape
+
+    # Union of the sparsity patterns (counts can not cancel)
+    pattern = csr_matrix(shape, dtype=np.int32)
+    for s in sp:
+        s.sum_duplicates()
+        pattern = pattern + csr_matrix((_a.onesi(s.nnz), s.indices, s.indptr), shape=shape)
+    pattern.sum_duplicates()
+    ptr = pattern.indptr
+    col = pattern.indices
+
+    # Place the data of each matrix at the merged positions
+    rows = _a.arangel(shape[0])
+    key = np.repeat(rows, diff(ptr)) * shape[1] + col
+    D = zeros([len(col), len(sp)], dtype=dtype)
+    for i, s in enumerate(sp):
+        idx = np.searchsorted(key, np.repeat(rows, diff(s.indptr)) * shape[1] + s.indices)
+        D[idx, i] = s.data
+    return D, col, ptr
+
+
 def ispmatrix(matrix, map_row=None, map_col=None):
     """ Iterator for iterating rows and columns for non-zero elements in a `scipy.sparse.*_matrix` (or `SparseCSR`)
 
@@ -1,15 +1,14 @@
 from __future__ import print_function, division
 
 import warnings
-import functools as ftool
 import numpy as np
 
 import sisl._array as _a
 from .messages import warn, SislError, tqdm_eta
 from ._help import get_dtype
-from ._help import _zip as zip, _range as range, _map as map
+from ._help import _zip as zip, _range as range
 from .utils.ranges import array_arange
-from .sparse import SparseCSR
+from .sparse import SparseCSR, _sp_merge
 
 __all__ = ['SparseAtom', 'SparseOrbital']
 
@@ -659,33 +658,17 @@ class _SparseGeometry(object):
 
         # Number of dimensions
         dim = len(sp)
-        nnzpr = 1
-        # Sort all indices for the passed sparse matrices
-        for i in range(dim):
-            sp[i] = sp[i].tocsr()
-            sp[i].sort_indices()
-            sp[i].sum_duplicates()
-
-            # Figure out the maximum connections per
-            # row to reduce number of re-allocations to 0
-            nnzpr = max(nnzpr, sp[i].nnz // sp[i].shape[0])
+        # Merge the sparsity patterns of all passed sparse matrices
+        D, col, ptr = _sp_merge(sp)
 
         # Create the sparse object
-        S = cls(geom, dim, sp[0].dtype, nnzpr)
+        S = cls(geom, dim, D.dtype, 1)
 
-        if S._size != sp[0].shape[0]:
+        if S._size != len(ptr) - 1:
             raise ValueError(cls.__name__ + '.fromsp cannot create a new class, the geometry ' + \
                              'and sparse matrices does not have coinciding dimensions size != sp.shape[0]')
 
-        for i in range(dim):
-            ptr = sp[i].indptr
-            col = sp[i].indices
-            D = sp[i].data
-
-            # loop and add elements
-            for r in range(S.shape[0]):
-                sl = slice(ptr[r], ptr[r+1], None)
-                S[r, col[sl], i] = D[sl]
+        S._csr = SparseCSR((D, col, ptr), shape=S._csr.shape[:2])
 
         return S
 
@@ -1091,32 +1074,24 @@ class SparseAtom(_SparseGeometry):
         na_n = S.na
         geom_n = S.geom
 
-        # First loop on axis tiling and local
-        # atoms in the geometry
-        sc_index = geom_n.sc_index
-
         # Create new indptr, indices and D
         ncol = np.tile(ncol, reps)
         # Now indptr is complete
         indptr = np.insert(_a.cumsumi(ncol), 0, 0)
         del ncol
-        indices = _a.emptyi([indptr[-1]])
-        indices.shape = (reps, -1)
 
         # Now we should fill the data
-        isc = geom.a2isc(col)
+        isc = list(geom.a2isc(col).T)
         # resulting atom in the new geometry (without wrapping
         # for correct supercell, that will happen below)
-        JA = col % na + na * isc[:, axis] - na
-
-        # Create repetitions
-        for rep in range(reps):
-            # Figure out the JA atoms
-            JA += na
-            # Correct the supercell information
-            isc[:, axis] = JA // na_n
+        # All repetitions are created at once, shape (reps, nnz)
+        JA = (col % na + na * isc[axis]).reshape(1, -1) + \
+             _a.arangei(reps).reshape(-1, 1) * na
+        # Correct the supercell information
+        isc[axis] = JA // na_n
 
-            indices[rep, :] = JA % na_n + sc_index(isc) * na_n
+        # Look-up the supercell indices for all repetitions
+        indices = JA % na_n + geom_n.sc.isc_off[isc[0], isc[1], isc[2]] * na_n
 
         # Clean-up
         del isc, JA
@@ -1170,47 +1145,38 @@ class SparseAtom(_SparseGeometry):
         na_n = S.na
         geom_n = S.geom
 
-        # First loop on axis tiling and local
-        # atoms in the geometry
-        sc_index = geom_n.sc_index
-
         # Create new indptr, indices and D
         ncol = np.repeat(ncol, reps)
         # Now indptr is complete
         indptr = np.insert(_a.cumsumi(ncol), 0, 0)
-        del ncol
-        indices = _a.emptyi([indptr[-1]])
+
+        # The new atoms are ordered as (atom, repetition), hence
+        # the elements of each new row is taken from the original atom
+        ptr = np.insert(_a.cumsumi(self._csr.ncol), 0, 0)
+        src = array_arange(np.repeat(ptr[:-1], reps), n=ncol)
+        # The repetition of each element
+        rep = np.repeat(np.tile(_a.arangei(reps), na), ncol)
+        del ptr, ncol
 
         # Now we should fill the data
-        isc = geom.a2isc(col)
-        # resulting atom in the new geometry (without wrapping
-        # for correct supercell, that will happen below)
-        JA = (col % na) * reps
+        col = col[src]
+        isc = list(geom.a2isc(col).T)
         # Get the offset atoms
-        A = isc[:, axis] - 1
-
-        for rep in range(reps):
+        A = isc[axis] + rep
+        del rep
+        # Correct supercell information
+        isc[axis] = A // reps
 
-            # Update the offset
-            A += 1
-            # Correct supercell information
-            isc[:, axis] = A // reps
-
-            # Create the indices for the repetition
-            idx = array_arange(indptr[rep:-1:reps], n=self._csr.ncol)
-            indices[idx] = JA + A % reps + sc_index(isc) * na_n
+        # resulting atom in the new geometry
+        indices = (col % na) * reps + A % reps + \
+                  geom_n.sc.isc_off[isc[0], isc[1], isc[2]] * na_n
 
         # Clean-up
-        del isc, JA, A, idx
+        del isc, A, col
 
         # In the repeat we have to tile individual atomic couplings
-        # So we should split the arrays and tile them individually
-        # Now D is made up of D values, per atom
-        if geom.na == 1:
-            D = np.tile(D, (reps, 1))
-        else:
-            ntile = ftool.partial(np.tile, reps=(reps, 1))
-            D = np.vstack(map(ntile, np.split(D, _a.cumsumi(self._csr.ncol[:-1]), axis=0)))
+        D = np.take(D, src, axis=0)
+        del src
 
         S._csr = SparseCSR((D, indices, indptr),
                            shape=(geom_n.na, geom_n.na_s))
@@ -1544,32 +1510,24 @@ class SparseOrbital(_SparseGeometry):
         no_n = S.no
         geom_n = S.geom
 
-        # First loop on axis tiling and local
-        # atoms in the geometry
-        sc_index = geom_n.sc_index
-
         # Create new indptr, indices and D
         ncol = np.tile(ncol, reps)
         # Now indptr is complete
         indptr = np.insert(_a.cumsumi(ncol), 0, 0)
         del ncol
-        indices = _a.emptyi([indptr[-1]])
-        indices.shape = (reps, -1)
 
         # Now we should fill the data
-        isc = geom.o2isc(col)
-        # resulting atom in the new geometry (without wrapping
+        isc = list(geom.o2isc(col).T)
+        # resulting orbital in the new geometry (without wrapping
         # for correct supercell, that will happen below)
-        JO = col % no + no * isc[:, axis] - no
+        # All repetitions are created at once, shape (reps, nnz)
+        JO = (col % no + no * isc[axis]).reshape(1, -1) + \
+             _a.arangei(reps).reshape(-1, 1) * no
+        # Correct the supercell information
+        isc[axis] = JO // no_n
 
-        # Create repetitions
-        for rep in range(reps):
-            # Figure out the JO orbitals
-            JO += no
-            # Correct the supercell information
-            isc[:, axis] = JO // no_n
-
-            indices[rep, :] = JO % no_n + sc_index(isc) * no_n
+        # Look-up the supercell indices for all repetitions
+        indices = JO % no_n + geom_n.sc.isc_off[isc[0], isc[1], isc[2]] * no_n
 
         # Clean-up
         del isc, JO
@@ -1623,73 +1581,57 @@ class SparseOrbital(_SparseGeometry):
         no_n = S.no
         geom_n = S.geom
 
-        # First loop on axis tiling and local
-        # orbitals in the geometry
-        sc_index = geom_n.sc_index
+        # The new orbitals are ordered as (atom, repetition, orbital).
+        # Figure out the originating orbital and repetition of each new orbital
+        o_n = _a.arangei(no_n)
+        a_n = _a.arangei(geom_n.na).repeat(geom_n.orbitals)
+        row = geom.firsto[a_n // reps] + o_n - geom_n.firsto[a_n]
+        rep = a_n % reps
+        del o_n, a_n
 
         # Create new indptr, indices and D
-        ncol = np.repeat(ncol, reps)
+        ncol = ncol[row]
         # Now indptr is complete
         indptr = np.insert(_a.cumsumi(ncol), 0, 0)
-        del ncol
-        indices = _a.emptyi([indptr[-1]])
+
+        # Now create the elements for all rows at once
+        ptr = np.insert(_a.cumsumi(self._csr.ncol), 0, 0)
+        src = array_arange(ptr[row], n=ncol)
+        rep = np.repeat(rep, ncol)
+        del ptr, row, ncol
 
         # Now we should fill the data
-        isc = geom.o2isc(col)
+        col = col[src]
+        isc = list(geom.o2isc(col).T)
         # resulting orbital in the new geometry (without wrapping
         # for correct supercell, that will happen below)
         JO = col % no
+        del col
         # Get number of orbitals per atom (lasto - firsto + 1)
         # This is faster than the direct call
-
-        ja = geom.o2a(JO)
+        ja = _a.arangei(geom.na).repeat(geom.orbitals)[JO]
         oJ = geom.firsto[ja]
-        oA = geom.lasto[ja] + 1 - oJ
+        oA = geom.orbitals[ja]
         # Shift the orbitals corresponding to the
         # repetitions of all previous atoms
         JO += oJ * (reps - 1)
-        # Get the offset orbitals
-        O = isc[:, axis] - 1
-        # We need to create and indexable atomic array
-        # This is required for multi-orbital cases where
-        # we should tile atomic orbitals, and repeat the atoms (only).
-        # 'A' is now the first (non-repeated) atom in the new structure
-        A = _a.arangei(geom.na) * reps
-        AO = geom_n.lasto[A] - geom_n.firsto[A] + 1
-        # subtract AO for first iteration in repetition loop
-        OA = geom_n.firsto[A] - AO
-
-        # Clean
-        del ja, oJ, A
-
-        # Get view of ncol
-        ncol = self._csr.ncol.view()
-
-        # Create repetitions
-        for _ in range(reps):
+        del ja, oJ
 
-            # Update atomic offset
-            OA += AO
-            # Update the offset
-            O += 1
-            # Correct supercell information
-            isc[:, axis] = O // reps
+        # Get the offset orbitals
+        O = isc[axis] + rep
+        del rep
+        # Correct supercell information
+        isc[axis] = O // reps
 
-            # Create the indices for the repetition
-            idx = array_arange(indptr[array_arange(OA, n=AO)], n=ncol)
-            indices[idx] = JO + oA * (O % reps) + sc_index(isc) * no_n
+        indices = JO + oA * (O % reps) + geom_n.sc.isc_off[isc[0], isc[1], isc[2]] * no_n
 
         # Clean-up
-        del isc, JO, O, OA, AO, idx
+        del isc, JO, O, oA
 
         # In the repeat we have to tile individual atomic couplings
-        # So we should split the arrays and tile them individually
-        # Now D is made up of D values, per atom
-        if geom.na == 1:
-            D = np.tile(D, (reps, 1))
-        else:
-            ntile = ftool.partial(np.tile, reps=(reps, 1))
-            D = np.vstack(map(ntile, np.split(D, _a.cumsumi(ncol)[geom.lasto[:geom.na-1]], axis=0)))
+        D = np.take(D, src, axis=0)
+        del src
+
         S._csr = SparseCSR((D, indices, indptr),
                            shape=(geom_n.no, geom_n.no_s))
 
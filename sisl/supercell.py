@@ -203,39 +203,30 @@ class SuperCell(object):
 
         # We might use this very often, hence we store it
         self.n_s = _a.prodi(self.nsc)
-        self._sc_off = _a.zerosi([self.n_s, 3])
         self._isc_off = _a.zerosi(self.nsc)
 
-        n = self.nsc
         # We define the following ones like this:
-
+        #  x runs fastest, then y and z.
+        # The primary unit-cell is always the first one.
         def ret_range(val):
             i = val // 2
-            return range(-i, i+1)
-        x = ret_range(n[0])
-        y = ret_range(n[1])
-        z = ret_range(n[2])
-        i = 0
-        for iz in z:
-            for iy in y:
-                for ix in x:
-                    if ix == 0 and iy == 0 and iz == 0:
-                        continue
-                    # Increment index
-                    i += 1
-                    # The offsets for the supercells in the
-                    # sparsity pattern
-                    self._sc_off[i, 0] = ix
-                    self._sc_off[i, 1] = iy
-                    self._sc_off[i, 2] = iz
+            return _a.arangei(-i, i+1)
+        z, y, x = np.meshgrid(ret_range(self.nsc[2]),
+                              ret_range(self.nsc[1]),
+                              ret_range(self.nsc[0]), indexing='ij')
+        sc_off = np.stack((x.ravel(), y.ravel(), z.ravel()), axis=1)
+        # Move the primary unit-cell to the front
+        idx = (self.n_s - 1) // 2
+        self._sc_off = _a.zerosi([self.n_s, 3])
+        self._sc_off[1:idx+1, :] = sc_off[:idx, :]
+        self._sc_off[idx+1:, :] = sc_off[idx+1:, :]
 
         self._update_isc_off()
 
     def _update_isc_off(self):
         """ Internal routine for updating the supercell indices """
-        for i in range(self.n_s):
-            d = self.sc_off[i, :]
-            self._isc_off[d[0], d[1], d[2]] = i
+        sc_off = self.sc_off
+        self._isc_off[sc_off[:, 0], sc_off[:, 1], sc_off[:, 2]] = _a.arangei(self.n_s)
 
     @property
     def sc_off(self):
@@ -541,25 +532,34 @@ class SuperCell(object):
     def sc_index(self, sc_off):
         """ Returns the integer index in the sc_off list that corresponds to `sc_off`
 
-        Returns the integer for the supercell
+        The index is looked up in a table of all supercell offsets, hence
+        any number of offsets may be queried at once.
+
+        Parameters
+        ----------
+        sc_off : array_like
+           the supercell offset(s), either a single offset ``[1, 0, 0]``, an array of offsets
+           with shape ``(..., 3)``, or an offset with ``None`` in which case all indices along
+           the ``None`` directions are returned.
+
+        Returns
+        -------
+        int or numpy.ndarray or list : the supercell index (indices) corresponding to `sc_off`,
+            a sorted list of indices for offsets with ``None``
         """
         def _assert(m, v):
-            if np.all(np.abs(v) > m):
+            if np.any(np.abs(v) > m):
                 raise ValueError("Requesting a non-existing supercell index")
         hsc = self.nsc // 2
 
-        if isinstance(sc_off[0], np.ndarray):
-            _assert(hsc[0], sc_off[:, 0])
-            _assert(hsc[1], sc_off[:, 1])
-            _assert(hsc[2], sc_off[:, 2])
-            return self._isc_off[sc_off[:, 0], sc_off[:, 1], sc_off[:, 2]]
-        elif isinstance(sc_off[0], (tuple, list)):
-            # We are dealing with a list of lists
-            sc_off = np.asarray(sc_off)
-            _assert(hsc[0], sc_off[:, 0])
-            _assert(hsc[1], sc_off[:, 1])
-            _assert(hsc[2], sc_off[:, 2])
-            return self._isc_off[sc_off[:, 0], sc_off[:, 1], sc_off[:, 2]]
+        if isinstance(sc_off, np.ndarray) and sc_off.ndim > 1 or \
+           isinstance(sc_off[0], (np.ndarray, tuple, list)):
+            # We are dealing with a list of offsets
+            sc_off = _a.asarrayi(sc_off)
+            _assert(hsc[0], sc_off[..., 0])
+            _assert(hsc[1], sc_off[..., 1])
+            _assert(hsc[2], sc_off[..., 2])
+            return self._isc_off[sc_off[..., 0], sc_off[..., 1], sc_off[..., 2]]
 
         # Fall back to the other routines
         sc_off = self._fill_sc(sc_off)
@@ -569,14 +569,15 @@ class SuperCell(object):
             _assert(hsc[2], sc_off[2])
             return self._isc_off[sc_off[0], sc_off[1], sc_off[2]]
 
-        # We build it because there are 'none'
+        # Return all indices along the directions with 'None'
         idx = []
-        for i in range(self.n_s):
-            if (sc_off[0] == self.sc_off[i, 0] or sc_off[0] is None) and \
-               (sc_off[1] == self.sc_off[i, 1] or sc_off[1] is None) and \
-               (sc_off[2] == self.sc_off[i, 2] or sc_off[2] is None):
-                idx.append(i)
-        return idx
+        for i in range(3):
+            if sc_off[i] is None:
+                idx.append(slice(None))
+            else:
+                _assert(hsc[i], sc_off[i])
+                idx.append(sc_off[i])
+        return np.sort(self._isc_off[tuple(idx)].ravel()).tolist()
 
     def scale(self, scale):
         """ Scale lattice vectors
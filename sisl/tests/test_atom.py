@@ -169,6 +169,22 @@ class TestAtoms(object):
         assert atom2 != atom4
         assert atom2.hassame(atom4)
 
+    def test_create_unique(self):
+        # Many atoms, and species should retain order of appearance
+        label = ['Au', 'C', 'H', 'C'] * 100
+        atom = Atoms(label)
+        assert len(atom.atom) == 3
+        assert atom.atom[0] == Atom('Au')
+        assert atom.atom[2] == Atom('H')
+        assert np.all(atom.specie[:4] == [0, 1, 2, 1])
+        assert atom == Atoms(np.array(label))
+        assert atom == Atoms([79, 6, 1, 6] * 100)
+        assert atom == Atoms([Atom(l) for l in label])
+        C = Atom('C')
+        atom = Atoms([C, Atom('C'), C, Atom('H')])
+        assert len(atom.atom) == 2
+        assert np.all(atom.specie == [0, 0, 0, 1])
+
     def test_create2(self):
         atom = Atoms(Atom(6, R=1.45), na=2)
         atom = Atoms(atom, na=4)
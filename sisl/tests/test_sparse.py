@@ -378,6 +378,27 @@ class TestSparseCSR(object):
         setup.s1.align(setup.s2)
         assert setup.s1.spsame(setup.s2)
 
+    def test_same2(self, setup):
+        s1 = SparseCSR((10, 100), dtype=np.float64)
+        s2 = SparseCSR((10, 100), dtype=np.float64)
+        for i in range(10):
+            s1[i, range(i, 40, 3)] = i + 1.
+            s2[i, range(38, i, -3)] = i + 2.
+        s1.finalize()
+        assert not s1.spsame(s2)
+        s = s1.copy()
+        s.align(s2)
+        # the original data must be retained
+        assert s.nnz > s1.nnz
+        assert s.nnz == s.ncol.sum()
+        for i in range(10):
+            assert np.allclose(s[i, range(i, 40, 3)], i + 1.)
+        s2.align(s1)
+        assert s.spsame(s2)
+        assert s2.spsame(s)
+        s.align(s2)
+        assert s.spsame(s2)
+
     def test_delete_col1(self, setup):
         s1 = setup.s1.copy()
         nc = s1.shape[1]
@@ -750,6 +771,28 @@ class TestSparseCSR(object):
         S = S1 - S2
         assert np.allclose(S._D, S1._D - S2._D)
 
+    def test_op_csr(self, setup):
+        # Different sparse patterns (also non-sorted) in different rows
+        S1 = SparseCSR((10, 100), dtype=np.float64)
+        S2 = SparseCSR((10, 100), dtype=np.float64)
+        for i in range(10):
+            S1[i, range(i, 40, 3)] = i + 1.
+            S2[i, range(38, i, -2)] = 2. + i
+        D1 = S1.tocsr().toarray()
+        D2 = S2.tocsr().toarray()
+
+        S = S1 + S2
+        assert np.allclose(S.tocsr().toarray(), D1 + D2)
+        S = S1 - S2
+        assert np.allclose(S.tocsr().toarray(), D1 - D2)
+        S = S1 * S2
+        assert np.allclose(S.tocsr().toarray(), D1 * D2)
+        S = S1 ** S2
+        assert np.allclose(S.tocsr().toarray()[D1 != 0], (D1 ** D2)[D1 != 0])
+        S = S2 / (S2 + S1)
+        idx = (D1 + D2) != 0
+        assert np.allclose(S.tocsr().toarray()[idx], (D2 / (D2 + D1))[idx])
+
     def test_sum1(self, setup):
         S1 = SparseCSR((10, 10, 2), dtype=np.int32)
         S1[0, 0] = [1, 2]
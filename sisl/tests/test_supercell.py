@@ -159,6 +159,9 @@ class TestSuperCell(object):
         assert sc_index == 0
         sc_index = setup.sc.sc_index([0, 0, None])
         assert len(sc_index) == setup.sc.nsc[2]
+        # A sorted list (as previously returned)
+        assert isinstance(sc_index, list)
+        assert sc_index == sorted(sc_index)
 
     def test_sc_index2(self, setup):
         sc_index = setup.sc.sc_index([[0, 0, 0],
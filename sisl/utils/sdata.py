@@ -60,6 +60,51 @@ def argparse_patch(parser):
     parser.register('action', 'parsers', MySubParsersAction)
 
 
+def sdata_batch(argv):
+    """ Batch mode of `sdata`, extract the same quantities from many TBtrans files
+
+    Parameters
+    ----------
+    argv : list of str
+       the arguments (without the ``--batch`` flag)
+    """
+    from sisl.io.tbtrans import tbt_batch
+
+    description = """
+Extract the same quantities from many TBtrans output files (e.g. bias or gate
+sweeps) using a pool of processes. The data is aggregated into a single
+table (one row per file) or a NetCDF file (if the output file ends with .nc).
+
+Each query is a method of the TBtrans file with optional keyword arguments:
+
+   --query transmission,elec_from=0,elec_to=1 --query current
+
+The dimensions of the data written to a NetCDF file may be named with dims
+(separated by :), the energy dimension is ne:
+
+   --query transmission,dims=ne
+    """
+
+    p = argparse.ArgumentParser("Extract data from many TBtrans files.",
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                description=description)
+    p.add_argument('files', nargs='+',
+                   help='TBtrans files (glob patterns are expanded)')
+    p.add_argument('--query', '-q', action='append', default=None,
+                   help='Quantity to extract (may be given multiple times)')
+    p.add_argument('--processes', '-n', type=int, default=None,
+                   help='Number of processes used (defaults to all processors)')
+    p.add_argument('--out', '-o', required=True,
+                   help='Output file for the aggregated data')
+
+    args = p.parse_args(argv)
+    if args.query is None:
+        args.query = ['transmission']
+    tbt_batch(args.files, args.query, processes=args.processes, out=args.out)
+
+    return 0
+
+
 def sdata(argv=None, sile=None):
 
     from . import cmd
@@ -74,6 +119,8 @@ def sdata(argv=None, sile=None):
     description = """
 This manipulation utility can handle nearly all files in the sisl code in
 changing ways. It handles files dependent on type AND content.
+
+Add --batch to extract the same data from many TBtrans files.
     """
 
     if argv is not None:
@@ -86,6 +133,12 @@ changing ways. It handles files dependent on type AND content.
     else:
         argv = sys.argv[1:]
 
+    if '--batch' in argv:
+        # Batch processing of many files
+        argv = list(argv)
+        argv.remove('--batch')
+        return sdata_batch(argv)
+
     # Ensure that the arguments have pre-pended spaces
     argv = cmd.argv_negative_fix(argv)
 